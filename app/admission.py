@@ -0,0 +1,240 @@
+"""
+Admission control for API requests.
+
+Two checks run before a request reaches its route. First, each client has
+a token bucket (RATE_LIMIT_PER_SECOND sustained, RATE_LIMIT_BURST at once).
+A client over its rate gets 429 with Retry-After set to when its next token
+arrives. Second, a process-wide limiter admits requests while they hold at
+most DB_CONCURRENCY pooled connections between them. A request counts as
+one, unless its route registered more with `admission.weigh()` (the
+dashboard reads its sections on separate sessions). Up to DB_QUEUE_SIZE
+more wait, in order, each for up to DB_QUEUE_TIMEOUT_SECONDS. Requests
+that find the queue full, or
+wait too long, get 503 with Retry-After. Without it, a burst checks out every
+pooled connection and the requests behind it stack up inside SQLAlchemy's
+pool timeout, so every client's latency collapses.
+
+There is one account for now, so "client" means the caller's address.
+Behind a reverse proxy listed in TRUSTED_PROXIES, that address comes from
+X-Forwarded-For, so clients don't all share the proxy's bucket.
+Probes, static files, the event stream and sensor ingestion skip both
+checks: probes must answer under load, streams hold their slot for hours,
+and ingestion has its own buffer that pushes back.
+"""
+import asyncio
+import ipaddress
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.config import settings
+
+EXEMPT_PREFIXES = ("/health", "/readyz", "/static", "/events", "/ingest", "/docs", "/redoc", "/openapi.json")
+MAX_IDLE_BUCKETS = 10000  # Tracked clients before refilled buckets are forgotten
+
+
+class TokenBuckets:
+    """One token bucket per client key, refilled lazily on each take"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, last refill)
+
+    def take(self, key: str) -> float:
+        """Spend a token; returns 0 if one was available, else seconds until one is"""
+        now = time.monotonic()
+        tokens, updated = self.buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            self.buckets[key] = (tokens - 1, now)
+            if len(self.buckets) > MAX_IDLE_BUCKETS:
+                self._forget_full(now)
+            return 0.0
+        self.buckets[key] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+    def _forget_full(self, now: float) -> None:
+        # A full bucket is the same as no bucket
+        self.buckets = {
+            key: (tokens, updated) for key, (tokens, updated) in self.buckets.items()
+            if tokens + (now - updated) * self.rate < self.burst
+        }
+
+
+class ConcurrencyLimiter:
+    """Connection slots shared by requests, with a bounded, timed FIFO wait in front of them"""
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self.in_use = 0  # Slots held by the requests in flight
+        self.queued = 0
+        self.peak_queued = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    async def acquire(self, weight: int = 1) -> Optional[str]:
+        """Take `weight` slots; returns None when admitted, else "shed" or "timed_out" """
+        weight = min(weight, self.limit)  # Heavier than the whole limit still runs, alone
+        # Strictly first come, first served, so heavy requests aren't starved by light ones
+        if not self._waiters and self.in_use + weight <= self.limit:
+            self._admit(weight)
+            return None
+        if self.queued >= self.queue_size:
+            return "shed"
+
+        waiter = (weight, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await asyncio.wait((waiter[1],), timeout=self.timeout)
+        except BaseException:
+            if waiter[1].done():
+                self.release(weight)  # Admitted just as the request was cancelled
+            raise
+        finally:
+            self.queued -= 1
+            if not waiter[1].done():
+                waiter[1].cancel()
+                self._waiters.remove(waiter)
+                self._wake()  # Whoever was behind it may fit now
+        return "timed_out" if waiter[1].cancelled() else None
+
+    def release(self, weight: int = 1) -> None:
+        self.in_flight -= 1
+        self.in_use -= min(weight, self.limit)
+        self._wake()
+
+    def _admit(self, weight: int) -> None:
+        self.in_flight += 1
+        self.in_use += weight
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use + self._waiters[0][0] <= self.limit:
+            weight, future = self._waiters.popleft()
+            self._admit(weight)
+            future.set_result(None)
+
+
+class AdmissionControl:
+    """The rate limit and the DB concurrency limit, with their counters"""
+
+    def __init__(self, rate: float, burst: int, concurrency: int, queue_size: int, timeout: float):
+        self.buckets = TokenBuckets(rate, burst)
+        self.limiter = ConcurrencyLimiter(concurrency, queue_size, timeout)
+        self.weights: Dict[str, int] = {}  # path -> pooled connections a request may hold
+        self.admitted = 0
+        self.rate_limited = 0
+        self.shed = 0
+        self.timed_out = 0
+
+    def weigh(self, path: str, connections: int) -> None:
+        """Count each request to `path` as holding `connections` pooled connections"""
+        self.weights[path] = connections
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.limiter.in_flight,
+            "connections": self.limiter.in_use,
+            "queued": self.limiter.queued,
+            "peak_queued": self.limiter.peak_queued,
+            "concurrency": self.limiter.limit,
+            "queue_size": self.limiter.queue_size,
+            "clients": len(self.buckets.buckets),
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware answering 429/503 for API requests that `admission` turns away"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        if admission.buckets.rate > 0:
+            wait = admission.buckets.take(client_key(scope))
+            if wait:
+                admission.rate_limited += 1
+                await _reject(send, 429, "Too many requests", wait)
+                return
+
+        weight = admission.weights.get(scope["path"], 1)
+        outcome = await admission.limiter.acquire(weight)
+        if outcome is not None:
+            setattr(admission, outcome, getattr(admission, outcome) + 1)
+            await _reject(send, 503, "Server busy, try again shortly", admission.limiter.timeout)
+            return
+        admission.admitted += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.limiter.release(weight)
+
+
+def _networks(spec: str) -> List:
+    return [ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(",") if part.strip()]
+
+
+TRUSTED_PROXIES = _networks(settings.TRUSTED_PROXIES)
+
+
+def _trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def client_key(scope) -> str:
+    """Who a request counts against; the client address until requests carry a user"""
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if not TRUSTED_PROXIES or not _trusted(address):
+        return address
+    # Behind our proxies: the nearest X-Forwarded-For hop they didn't add is the client
+    forwarded = b",".join(value for name, value in scope["headers"] if name == b"x-forwarded-for")
+    for hop in reversed(forwarded.decode("latin-1").split(",")):
+        hop = hop.strip()
+        if hop:
+            address = hop
+            if not _trusted(hop):
+                break
+    return address
+
+
+async def _reject(send, status: int, detail: str, retry_after: float) -> None:
+    body = orjson.dumps({"detail": detail})
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+admission = AdmissionControl(
+    settings.RATE_LIMIT_PER_SECOND,
+    settings.RATE_LIMIT_BURST,
+    settings.DB_CONCURRENCY or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+    settings.DB_QUEUE_SIZE,
+    settings.DB_QUEUE_TIMEOUT_SECONDS
+)
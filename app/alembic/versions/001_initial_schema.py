@@ -8,7 +8,6 @@ Create Date: 2025-01-09 12:00:00.000000
 from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
 # revision identifiers, used by Alembic.
@@ -20,20 +19,20 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # Users table
-    op.create_table(
+    users = op.create_table(
         'users',
-        sa.Column('id', UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+        sa.Column('id', sa.Uuid(), primary_key=True, default=uuid.uuid4),
         sa.Column('email', sa.String(), nullable=False, unique=True),
         sa.Column('hashed_password', sa.String(), nullable=False),
-        sa.Column('is_active', sa.Boolean(), nullable=False, server_default='true'),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()),
     )
     op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
     
     # Chemical Inventory table
     op.create_table(
         'chemical_inventory',
-        sa.Column('id', UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
-        sa.Column('user_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('id', sa.Uuid(), primary_key=True, default=uuid.uuid4),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('quantity_on_hand', sa.Float(), nullable=False),
         sa.Column('unit', sa.String(), nullable=False),
@@ -45,8 +44,8 @@ def upgrade() -> None:
     # Maintenance Tasks table
     op.create_table(
         'maintenance_tasks',
-        sa.Column('id', UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
-        sa.Column('user_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('id', sa.Uuid(), primary_key=True, default=uuid.uuid4),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('description', sa.Text(), nullable=True),
         sa.Column('frequency_days', sa.Integer(), nullable=False),
@@ -60,37 +59,37 @@ def upgrade() -> None:
     # Alerts table
     op.create_table(
         'alerts',
-        sa.Column('id', UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
-        sa.Column('user_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('id', sa.Uuid(), primary_key=True, default=uuid.uuid4),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('cadence', sa.String(), nullable=False),
         sa.Column('days_of_week', sa.String(), nullable=True),
         sa.Column('alert_time', sa.Time(), nullable=False),
-        sa.Column('alert_on_low_inventory', sa.Boolean(), nullable=False, server_default='false'),
-        sa.Column('alert_on_due_tasks', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('alert_on_low_inventory', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('alert_on_due_tasks', sa.Boolean(), nullable=False, server_default=sa.false()),
         sa.Column('last_sent', sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
     )
     
     # Reading Types table
-    op.create_table(
+    reading_types = op.create_table(
         'reading_types',
-        sa.Column('id', UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+        sa.Column('id', sa.Uuid(), primary_key=True, default=uuid.uuid4),
         sa.Column('slug', sa.String(), nullable=False, unique=True),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('unit', sa.String(), nullable=True),
         sa.Column('low', sa.Float(), nullable=True),
         sa.Column('high', sa.Float(), nullable=True),
-        sa.Column('is_active', sa.Boolean(), nullable=False, server_default='true'),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()),
     )
     op.create_index(op.f('ix_reading_types_slug'), 'reading_types', ['slug'], unique=True)
     
     # Readings table
     op.create_table(
         'readings',
-        sa.Column('id', UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
-        sa.Column('user_id', UUID(as_uuid=True), nullable=False),
-        sa.Column('reading_type_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('id', sa.Uuid(), primary_key=True, default=uuid.uuid4),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('reading_type_id', sa.Uuid(), nullable=False),
         sa.Column('reading_value', sa.Float(), nullable=False),
         sa.Column('reading_date', sa.Date(), nullable=False),
         sa.Column('notes', sa.Text(), nullable=True),
@@ -101,27 +100,30 @@ def upgrade() -> None:
     op.create_index(op.f('ix_readings_reading_date'), 'readings', ['reading_date'])
     
     # Seed default reading types
-    op.execute(f"""
-        INSERT INTO reading_types (id, slug, name, unit, low, high, is_active) VALUES
-        ('{uuid.uuid4()}', 'ph', 'pH', '', 6.8, 8.2, true),
-        ('{uuid.uuid4()}', 'fc', 'Free Chlorine', 'ppm', 0, 10, true),
-        ('{uuid.uuid4()}', 'cc', 'Combined Chlorine', 'ppm', 0, 1, true),
-        ('{uuid.uuid4()}', 'ta', 'Total Alkalinity', 'ppm', 50, 180, true),
-        ('{uuid.uuid4()}', 'ch', 'Calcium Hardness', 'ppm', 100, 1000, true),
-        ('{uuid.uuid4()}', 'cya', 'Stabilizer (CYA)', 'ppm', 0, 200, true),
-        ('{uuid.uuid4()}', 'salt', 'Salt', 'ppm', 0, 6000, true),
-        ('{uuid.uuid4()}', 'temp', 'Water Temperature', '°F', 30, 120, true)
-    """)
+    # bulk_insert binds ids through the Uuid type, so they are stored in the
+    # dialect's native format (uuid on PostgreSQL, hex string on SQLite)
+    op.bulk_insert(reading_types, [
+        {'id': uuid.uuid4(), 'slug': slug, 'name': name, 'unit': unit, 'low': low, 'high': high, 'is_active': True}
+        for slug, name, unit, low, high in [
+            ('ph', 'pH', '', 6.8, 8.2),
+            ('fc', 'Free Chlorine', 'ppm', 0, 10),
+            ('cc', 'Combined Chlorine', 'ppm', 0, 1),
+            ('ta', 'Total Alkalinity', 'ppm', 50, 180),
+            ('ch', 'Calcium Hardness', 'ppm', 100, 1000),
+            ('cya', 'Stabilizer (CYA)', 'ppm', 0, 200),
+            ('salt', 'Salt', 'ppm', 0, 6000),
+            ('temp', 'Water Temperature', '°F', 30, 120),
+        ]
+    ])
     
     # Create default admin user with pre-hashed password (admin123)
     # Hash generated with: from passlib.context import CryptContext; CryptContext(schemes=["bcrypt"]).hash("admin123")
     admin_id = uuid.uuid4()
     # This is bcrypt hash of "admin123"
     hashed_password = "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5GyYqRY7TRqOu"
-    op.execute(f"""
-        INSERT INTO users (id, email, hashed_password, is_active) 
-        VALUES ('{admin_id}', 'admin@example.com', '{hashed_password}', true)
-    """)
+    op.bulk_insert(users, [
+        {'id': admin_id, 'email': 'admin@example.com', 'hashed_password': hashed_password, 'is_active': True}
+    ])
 
 
 def downgrade() -> None:
@@ -19,17 +19,18 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     # Add unique constraint on (user_id, name) combination
     # This ensures each user can't have duplicate task names
-    op.create_unique_constraint(
-        'uq_maintenance_tasks_user_name',
-        'maintenance_tasks',
-        ['user_id', 'name']
-    )
+    # (batch mode recreates the table on SQLite, which can't ALTER constraints)
+    with op.batch_alter_table('maintenance_tasks') as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_maintenance_tasks_user_name',
+            ['user_id', 'name']
+        )
 
 
 def downgrade() -> None:
     # Remove the unique constraint
-    op.drop_constraint(
-        'uq_maintenance_tasks_user_name',
-        'maintenance_tasks',
-        type_='unique'
-    )
\ No newline at end of file
+    with op.batch_alter_table('maintenance_tasks') as batch_op:
+        batch_op.drop_constraint(
+            'uq_maintenance_tasks_user_name',
+            type_='unique'
+        )
\ No newline at end of file
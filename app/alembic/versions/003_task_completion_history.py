@@ -8,7 +8,6 @@ Create Date: 2025-11-01 12:00:00.000000
 from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import UUID
 
 # revision identifiers, used by Alembic.
 revision: str = '003_task_completion_history'
@@ -21,11 +20,11 @@ def upgrade() -> None:
     # Create task_completion_history table
     op.create_table(
         'task_completion_history',
-        sa.Column('id', UUID(as_uuid=True), primary_key=True),
-        sa.Column('task_id', UUID(as_uuid=True), sa.ForeignKey('maintenance_tasks.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('id', sa.Uuid(), primary_key=True),
+        sa.Column('task_id', sa.Uuid(), sa.ForeignKey('maintenance_tasks.id', ondelete='CASCADE'), nullable=False),
         sa.Column('completed_date', sa.Date(), nullable=False),
         sa.Column('notes', sa.Text(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
     )
 
     # Create index on task_id for faster queries
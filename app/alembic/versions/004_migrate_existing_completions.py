@@ -5,10 +5,11 @@ Revises: 003_task_completion_history
 Create Date: 2025-11-01 16:30:00.000000
 
 """
+import uuid
+from datetime import datetime, time, timezone
 from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import UUID
 
 # revision identifiers, used by Alembic.
 revision: str = '004_migrate_existing_completions'
@@ -16,6 +17,29 @@ down_revision: Union[str, None] = '003_task_completion_history'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Lightweight table definitions for the portable (non-PostgreSQL) path
+maintenance_tasks = sa.table(
+    'maintenance_tasks',
+    sa.column('id', sa.Uuid()),
+    sa.column('last_completed_date', sa.Date()),
+    sa.column('last_completion_notes', sa.Text()),
+)
+task_completion_history = sa.table(
+    'task_completion_history',
+    sa.column('id', sa.Uuid()),
+    sa.column('task_id', sa.Uuid()),
+    sa.column('completed_date', sa.Date()),
+    sa.column('notes', sa.Text()),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+)
+
+
+def _completed_tasks(bind):
+    return bind.execute(
+        sa.select(maintenance_tasks)
+        .where(maintenance_tasks.c.last_completed_date.isnot(None))
+    ).all()
+
 
 def upgrade() -> None:
     """
@@ -26,6 +50,32 @@ def upgrade() -> None:
 
     This migration is idempotent - it only inserts records that don't already exist.
     """
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # Portable path (e.g. SQLite): same logic evaluated in Python
+        existing = {
+            (row.task_id, row.completed_date, row.notes)
+            for row in bind.execute(sa.select(
+                task_completion_history.c.task_id,
+                task_completion_history.c.completed_date,
+                task_completion_history.c.notes,
+            ))
+        }
+        rows = [
+            {
+                'id': uuid.uuid4(),
+                'task_id': task.id,
+                'completed_date': task.last_completed_date,
+                'notes': task.last_completion_notes,
+                'created_at': datetime.combine(task.last_completed_date, time(12), tzinfo=timezone.utc),
+            }
+            for task in _completed_tasks(bind)
+            if (task.id, task.last_completed_date, task.last_completion_notes) not in existing
+        ]
+        if rows:
+            op.bulk_insert(task_completion_history, rows)
+        return
+
     # Use raw SQL to insert existing completion data into history table
     # Only insert if a matching record doesn't already exist (idempotent)
     op.execute("""
@@ -60,6 +110,22 @@ def downgrade() -> None:
     Note: If task completion data has changed since migration, some records may not
     be removed during downgrade. This is acceptable as it preserves user data.
     """
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        history = task_completion_history.c
+        for task in _completed_tasks(bind):
+            notes_match = (
+                history.notes.is_(None) if task.last_completion_notes is None
+                else history.notes == task.last_completion_notes
+            )
+            bind.execute(
+                task_completion_history.delete()
+                .where(history.task_id == task.id)
+                .where(history.completed_date == task.last_completed_date)
+                .where(notes_match)
+            )
+        return
+
     op.execute("""
         DELETE FROM task_completion_history tch
         USING maintenance_tasks mt
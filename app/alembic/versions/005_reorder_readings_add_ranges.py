@@ -5,9 +5,11 @@ Revises: 004_migrate_existing_completions
 Create Date: 2025-11-01 17:00:00.000000
 
 """
+import uuid
 from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
 
 # revision identifiers, used by Alembic.
 revision: str = '005_reorder_readings_add_ranges'
@@ -15,20 +17,40 @@ down_revision: Union[str, None] = '004_migrate_existing_completions'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+reading_types = sa.table(
+    'reading_types',
+    sa.column('id', sa.Uuid()),
+    sa.column('slug', sa.String()),
+    sa.column('name', sa.String()),
+    sa.column('unit', sa.String()),
+    sa.column('low', sa.Float()),
+    sa.column('high', sa.Float()),
+    sa.column('is_active', sa.Boolean()),
+    sa.column('display_order', sa.Integer()),
+)
+
 
 def upgrade() -> None:
     # Add display_order column
     op.add_column('reading_types', sa.Column('display_order', sa.Integer(), nullable=True))
 
-    # Add new reading types
-    op.execute("""
-        INSERT INTO reading_types (id, slug, name, unit, low, high, is_active, display_order)
-        VALUES
-            (gen_random_uuid(), 'th', 'Total Hardness', 'ppm', 250, 500, true, 1),
-            (gen_random_uuid(), 'bromine', 'Bromine', 'ppm', 2, 6, true, 3),
-            (gen_random_uuid(), 'tc', 'Total Chlorine', 'ppm', 1, 3, true, 4)
-        ON CONFLICT (slug) DO NOTHING;
-    """)
+    # Add new reading types (skipping slugs that already exist)
+    dialect_insert = postgresql.insert if op.get_context().dialect.name == 'postgresql' else sqlite.insert
+    op.execute(
+        dialect_insert(reading_types)
+        .values([
+            {
+                'id': uuid.uuid4(), 'slug': slug, 'name': name, 'unit': unit,
+                'low': low, 'high': high, 'is_active': True, 'display_order': order
+            }
+            for slug, name, unit, low, high, order in [
+                ('th', 'Total Hardness', 'ppm', 250, 500, 1),
+                ('bromine', 'Bromine', 'ppm', 2, 6, 3),
+                ('tc', 'Total Chlorine', 'ppm', 1, 3, 4),
+            ]
+        ])
+        .on_conflict_do_nothing(index_elements=['slug'])
+    )
 
     # Update existing reading types with new order and ranges
     op.execute("UPDATE reading_types SET display_order = 1, low = 250, high = 500 WHERE slug = 'th'")
@@ -51,19 +73,16 @@ def downgrade() -> None:
     # Drop index
     op.drop_index('ix_reading_types_display_order', 'reading_types')
 
-    # Restore old ranges
-    op.execute("""
-        UPDATE reading_types SET low = 0, high = 10 WHERE slug = 'fc';
-        UPDATE reading_types SET low = 0, high = 200 WHERE slug = 'cya';
-        UPDATE reading_types SET low = 50, high = 180 WHERE slug = 'ta';
-        UPDATE reading_types SET low = 6.8, high = 8.2 WHERE slug = 'ph';
-        UPDATE reading_types SET is_active = true WHERE slug IN ('cc', 'ch', 'temp');
-    """)
+    # Restore old ranges (one statement per call; SQLite can't run batches)
+    op.execute("UPDATE reading_types SET low = 0, high = 10 WHERE slug = 'fc'")
+    op.execute("UPDATE reading_types SET low = 0, high = 200 WHERE slug = 'cya'")
+    op.execute("UPDATE reading_types SET low = 50, high = 180 WHERE slug = 'ta'")
+    op.execute("UPDATE reading_types SET low = 6.8, high = 8.2 WHERE slug = 'ph'")
+    op.execute("UPDATE reading_types SET is_active = true WHERE slug IN ('cc', 'ch', 'temp')")
 
     # Remove new reading types
-    op.execute("""
-        DELETE FROM reading_types WHERE slug IN ('th', 'bromine', 'tc');
-    """)
+    op.execute("DELETE FROM reading_types WHERE slug IN ('th', 'bromine', 'tc')")
 
     # Drop display_order column
-    op.drop_column('reading_types', 'display_order')
+    with op.batch_alter_table('reading_types') as batch_op:
+        batch_op.drop_column('display_order')
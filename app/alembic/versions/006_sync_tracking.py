@@ -0,0 +1,141 @@
+"""track updated_at and deletes for delta sync
+
+Revision ID: 006_sync_tracking
+Revises: 005_reorder_readings_add_ranges
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_sync_tracking'
+down_revision: Union[str, None] = '005_reorder_readings_add_ranges'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables with a user_id column
+USER_TABLES = ['maintenance_tasks', 'chemical_inventory', 'alerts', 'readings']
+HISTORY_TABLE = 'task_completion_history'
+
+# SQLite timestamps with millisecond precision, in the format SQLAlchemy writes
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+def upgrade() -> None:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+    now = sa.text(f"({SQLITE_NOW})") if is_sqlite else sa.func.now()
+
+    # updated_at on every synced table (existing rows start at migration time)
+    for table in USER_TABLES + [HISTORY_TABLE]:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=now, nullable=False))
+
+    for table in USER_TABLES:
+        op.create_index(f'ix_{table}_user_id_updated_at', table, ['user_id', 'updated_at'])
+    op.create_index(f'ix_{HISTORY_TABLE}_updated_at', HISTORY_TABLE, ['updated_at'])
+
+    # Deleted rows, kept for SYNC_TOMBSTONE_DAYS
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), primary_key=True, autoincrement=True),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('row_id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=now, nullable=False),
+    )
+    op.create_index('ix_sync_tombstones_user_id_deleted_at', 'sync_tombstones', ['user_id', 'deleted_at'])
+
+    if is_sqlite:
+        _create_sqlite_triggers()
+    else:
+        _create_postgresql_triggers()
+
+
+def _create_postgresql_triggers() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO sync_tombstones (table_name, row_id, user_id, deleted_at)
+            VALUES (TG_TABLE_NAME, OLD.id, OLD.user_id, now());
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_history_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO sync_tombstones (table_name, row_id, user_id, deleted_at)
+            VALUES (TG_TABLE_NAME, OLD.id,
+                    (SELECT user_id FROM maintenance_tasks WHERE id = OLD.task_id), now());
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in USER_TABLES + [HISTORY_TABLE]:
+        op.execute(f"""
+            CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+        """)
+        function = 'record_history_tombstone' if table == HISTORY_TABLE else 'record_tombstone'
+        op.execute(f"""
+            CREATE TRIGGER {table}_record_tombstone AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {function}()
+        """)
+
+
+def _create_sqlite_triggers() -> None:
+    for table in USER_TABLES + [HISTORY_TABLE]:
+        # recursive_triggers is off, so the inner UPDATE doesn't fire this again
+        op.execute(f"""
+            CREATE TRIGGER {table}_set_updated_at AFTER UPDATE ON {table}
+            FOR EACH ROW BEGIN
+                UPDATE {table} SET updated_at = {SQLITE_NOW} WHERE id = NEW.id;
+            END
+        """)
+        owner = (
+            "(SELECT user_id FROM maintenance_tasks WHERE id = OLD.task_id)"
+            if table == HISTORY_TABLE else "OLD.user_id"
+        )
+        op.execute(f"""
+            CREATE TRIGGER {table}_record_tombstone AFTER DELETE ON {table}
+            FOR EACH ROW BEGIN
+                INSERT INTO sync_tombstones (table_name, row_id, user_id, deleted_at)
+                VALUES ('{table}', OLD.id, {owner}, {SQLITE_NOW});
+            END
+        """)
+
+
+def downgrade() -> None:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+
+    for table in USER_TABLES + [HISTORY_TABLE]:
+        if is_sqlite:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at")
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_record_tombstone")
+        else:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}")
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_record_tombstone ON {table}")
+    if not is_sqlite:
+        op.execute("DROP FUNCTION IF EXISTS record_history_tombstone()")
+        op.execute("DROP FUNCTION IF EXISTS record_tombstone()")
+        op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
+
+    op.drop_index('ix_sync_tombstones_user_id_deleted_at', 'sync_tombstones')
+    op.drop_table('sync_tombstones')
+
+    op.drop_index(f'ix_{HISTORY_TABLE}_updated_at', HISTORY_TABLE)
+    for table in USER_TABLES:
+        op.drop_index(f'ix_{table}_user_id_updated_at', table)
+    for table in USER_TABLES + [HISTORY_TABLE]:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
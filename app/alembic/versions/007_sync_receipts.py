@@ -0,0 +1,33 @@
+"""receipts for replayed offline writes
+
+Revision ID: 007_sync_receipts
+Revises: 006_sync_tracking
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_sync_receipts'
+down_revision: Union[str, None] = '006_sync_tracking'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per applied client operation, so a replayed batch isn't applied twice
+    op.create_table(
+        'sync_receipts',
+        sa.Column('op_id', sa.Uuid(), primary_key=True),
+        sa.Column('user_id', sa.Uuid(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('status', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_sync_receipts_created_at', 'sync_receipts', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_receipts_created_at', 'sync_receipts')
+    op.drop_table('sync_receipts')
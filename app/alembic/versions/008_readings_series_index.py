@@ -0,0 +1,28 @@
+"""index readings by user, type and date
+
+Revision ID: 008_readings_series_index
+Revises: 007_sync_receipts
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '008_readings_series_index'
+down_revision: Union[str, None] = '007_sync_receipts'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves chart and series queries (one user, a few types, a date range) as index range scans
+    op.create_index(
+        'ix_readings_user_id_reading_type_id_reading_date',
+        'readings',
+        ['user_id', 'reading_type_id', 'reading_date']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_readings_user_id_reading_type_id_reading_date', 'readings')
@@ -0,0 +1,51 @@
+"""classify readings against their type's range
+
+Revision ID: 009_reading_in_range
+Revises: 008_readings_series_index
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009_reading_in_range'
+down_revision: Union[str, None] = '008_readings_series_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same rule as app.services.ranges.classify (NULL when the type has no range)
+CLASSIFY = """
+    UPDATE readings SET in_range = (
+        SELECT CASE
+            WHEN rt.low IS NULL AND rt.high IS NULL THEN NULL
+            WHEN (rt.low IS NULL OR readings.reading_value >= rt.low)
+             AND (rt.high IS NULL OR readings.reading_value <= rt.high) THEN {true}
+            ELSE {false}
+        END
+        FROM reading_types rt WHERE rt.id = readings.reading_type_id
+    )
+"""
+
+
+def upgrade() -> None:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+    op.add_column('readings', sa.Column('in_range', sa.Boolean(), nullable=True))
+    op.execute(CLASSIFY.format(true='1' if is_sqlite else 'true', false='0' if is_sqlite else 'false'))
+
+    # Only out-of-range rows: small, and exactly what the range report reads
+    out_of_range = sa.column('in_range') == sa.false()
+    op.create_index(
+        'ix_readings_out_of_range',
+        'readings',
+        ['user_id', 'reading_type_id', 'reading_date'],
+        postgresql_where=out_of_range,
+        sqlite_where=out_of_range
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_readings_out_of_range', 'readings')
+    # Plain ALTER TABLE (SQLite 3.35+): a batch rebuild would drop the 006 triggers
+    op.drop_column('readings', 'in_range')
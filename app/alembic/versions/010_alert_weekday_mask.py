@@ -0,0 +1,46 @@
+"""store alert weekdays as a bitmask
+
+Revision ID: 010_alert_weekday_mask
+Revises: 009_reading_in_range
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '010_alert_weekday_mask'
+down_revision: Union[str, None] = '009_reading_in_range'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bit d set = weekday d (0=Sunday), replacing the "0,2,4" string
+    op.add_column('alerts', sa.Column('weekday_mask', sa.Integer(), server_default='0', nullable=False))
+    for day in range(7):
+        op.execute(
+            f"UPDATE alerts SET weekday_mask = weekday_mask | {1 << day} "
+            f"WHERE ',' || days_of_week || ',' LIKE '%,{day},%'"
+        )
+    # Plain ALTER TABLE (SQLite 3.35+): a batch rebuild would drop the 006 triggers
+    op.drop_column('alerts', 'days_of_week')
+
+    # The scheduler looks for alerts not sent today whose time has passed
+    op.create_index('ix_alerts_last_sent_alert_time', 'alerts', ['last_sent', 'alert_time'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_alerts_last_sent_alert_time', 'alerts')
+    op.add_column('alerts', sa.Column('days_of_week', sa.String(), nullable=True))
+
+    connection = op.get_bind()
+    alerts = connection.execute(sa.text("SELECT id, weekday_mask FROM alerts WHERE weekday_mask <> 0")).all()
+    for alert_id, mask in alerts:
+        days = ",".join(str(day) for day in range(7) if mask & (1 << day))
+        connection.execute(
+            sa.text("UPDATE alerts SET days_of_week = :days WHERE id = :id"),
+            {"days": days, "id": alert_id}
+        )
+    op.drop_column('alerts', 'weekday_mask')
@@ -0,0 +1,46 @@
+"""unique inventory item names per user
+
+Revision ID: 011_unique_inventory_names
+Revises: 010_alert_weekday_mask
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '011_unique_inventory_names'
+down_revision: Union[str, None] = '010_alert_weekday_mask'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing duplicates get a " (2)", " (3)"... suffix so nothing is lost
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT id, user_id, name FROM chemical_inventory ORDER BY user_id, name, id"
+    )).all()
+    taken = {(user_id, name) for _, user_id, name in rows}
+    seen = set()
+    for row_id, user_id, name in rows:
+        if (user_id, name) not in seen:
+            seen.add((user_id, name))
+            continue
+        n = 2
+        while (user_id, f"{name} ({n})") in taken:
+            n += 1
+        taken.add((user_id, f"{name} ({n})"))
+        connection.execute(
+            sa.text("UPDATE chemical_inventory SET name = :name WHERE id = :id"),
+            {"name": f"{name} ({n})", "id": row_id}
+        )
+
+    # A unique index rather than a constraint: no table rebuild on SQLite, and
+    # PUT /inventory/bulk upserts against it with ON CONFLICT (user_id, name)
+    op.create_index('uq_chemical_inventory_user_name', 'chemical_inventory', ['user_id', 'name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_chemical_inventory_user_name', 'chemical_inventory')
@@ -0,0 +1,107 @@
+"""inventory transaction ledger and snapshots
+
+Revision ID: 012_inventory_ledger
+Revises: 011_unique_inventory_names
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '012_inventory_ledger'
+down_revision: Union[str, None] = '011_unique_inventory_names'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite timestamps with millisecond precision, in the format SQLAlchemy writes
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+def upgrade() -> None:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+    now = sa.text(f"({SQLITE_NOW})") if is_sqlite else sa.func.now()
+    big_id = sa.BigInteger().with_variant(sa.Integer(), 'sqlite')
+
+    # Every change to quantity_on_hand, written by a trigger (append-only)
+    op.create_table(
+        'inventory_transactions',
+        sa.Column('id', big_id, primary_key=True, autoincrement=True),
+        sa.Column('item_id', sa.Uuid(), sa.ForeignKey('chemical_inventory.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('delta', sa.Float(), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=now, nullable=False),
+    )
+    op.create_index('ix_inventory_transactions_item_id_created_at', 'inventory_transactions', ['item_id', 'created_at'])
+
+    # Balance of each item at taken_at, so history needs only the ledger rows after it
+    op.create_table(
+        'inventory_snapshots',
+        sa.Column('id', big_id, primary_key=True, autoincrement=True),
+        sa.Column('item_id', sa.Uuid(), sa.ForeignKey('chemical_inventory.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('taken_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_inventory_snapshots_item_id_taken_at', 'inventory_snapshots', ['item_id', 'taken_at'])
+
+    # Existing stock opens the ledger
+    op.execute("""
+        INSERT INTO inventory_transactions (item_id, user_id, delta, quantity)
+        SELECT id, user_id, quantity_on_hand, quantity_on_hand FROM chemical_inventory
+    """)
+
+    if is_sqlite:
+        op.execute(f"""
+            CREATE TRIGGER chemical_inventory_ledger_insert AFTER INSERT ON chemical_inventory
+            FOR EACH ROW BEGIN
+                INSERT INTO inventory_transactions (item_id, user_id, delta, quantity, created_at)
+                VALUES (NEW.id, NEW.user_id, NEW.quantity_on_hand, NEW.quantity_on_hand, {SQLITE_NOW});
+            END
+        """)
+        op.execute(f"""
+            CREATE TRIGGER chemical_inventory_ledger_update AFTER UPDATE OF quantity_on_hand ON chemical_inventory
+            FOR EACH ROW WHEN NEW.quantity_on_hand <> OLD.quantity_on_hand BEGIN
+                INSERT INTO inventory_transactions (item_id, user_id, delta, quantity, created_at)
+                VALUES (NEW.id, NEW.user_id, NEW.quantity_on_hand - OLD.quantity_on_hand, NEW.quantity_on_hand, {SQLITE_NOW});
+            END
+        """)
+    else:
+        op.execute("""
+            CREATE OR REPLACE FUNCTION record_inventory_transaction() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO inventory_transactions (item_id, user_id, delta, quantity, created_at)
+                VALUES (NEW.id, NEW.user_id,
+                        NEW.quantity_on_hand - CASE WHEN TG_OP = 'UPDATE' THEN OLD.quantity_on_hand ELSE 0 END,
+                        NEW.quantity_on_hand, now());
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute("""
+            CREATE TRIGGER chemical_inventory_ledger_insert AFTER INSERT ON chemical_inventory
+            FOR EACH ROW EXECUTE FUNCTION record_inventory_transaction()
+        """)
+        op.execute("""
+            CREATE TRIGGER chemical_inventory_ledger_update AFTER UPDATE OF quantity_on_hand ON chemical_inventory
+            FOR EACH ROW WHEN (NEW.quantity_on_hand IS DISTINCT FROM OLD.quantity_on_hand)
+            EXECUTE FUNCTION record_inventory_transaction()
+        """)
+
+
+def downgrade() -> None:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+
+    if is_sqlite:
+        op.execute("DROP TRIGGER IF EXISTS chemical_inventory_ledger_insert")
+        op.execute("DROP TRIGGER IF EXISTS chemical_inventory_ledger_update")
+    else:
+        op.execute("DROP TRIGGER IF EXISTS chemical_inventory_ledger_insert ON chemical_inventory")
+        op.execute("DROP TRIGGER IF EXISTS chemical_inventory_ledger_update ON chemical_inventory")
+        op.execute("DROP FUNCTION IF EXISTS record_inventory_transaction()")
+
+    op.drop_index('ix_inventory_snapshots_item_id_taken_at', 'inventory_snapshots')
+    op.drop_table('inventory_snapshots')
+    op.drop_index('ix_inventory_transactions_item_id_created_at', 'inventory_transactions')
+    op.drop_table('inventory_transactions')
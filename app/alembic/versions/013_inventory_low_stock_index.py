@@ -0,0 +1,32 @@
+"""partial index on low-stock inventory items
+
+Revision ID: 013_inventory_low_stock_index
+Revises: 012_inventory_ledger
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '013_inventory_low_stock_index'
+down_revision: Union[str, None] = '012_inventory_ledger'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only items at or below their reorder threshold; must match ChemicalInventory.is_low_stock
+    low_stock = sa.column('quantity_on_hand') <= sa.column('reorder_threshold')
+    op.create_index(
+        'ix_chemical_inventory_low_stock',
+        'chemical_inventory',
+        ['user_id'],
+        postgresql_where=low_stock,
+        sqlite_where=low_stock
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chemical_inventory_low_stock', 'chemical_inventory')
@@ -0,0 +1,40 @@
+"""timestamped sensor samples
+
+Revision ID: 014_sensor_samples
+Revises: 013_inventory_low_stock_index
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '014_sensor_samples'
+down_revision: Union[str, None] = '013_inventory_low_stock_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Probe data at sub-day resolution; daily readings stay in `readings`.
+    # No triggers here: rows arrive in bulk and are never updated.
+    op.create_table(
+        'sensor_samples',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Uuid(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('reading_type_id', sa.Uuid(), sa.ForeignKey('reading_types.id'), nullable=False),
+        sa.Column('device', sa.String(), nullable=False),
+        sa.Column('measured_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+    )
+    op.create_index(
+        'ix_sensor_samples_user_id_reading_type_id_measured_at',
+        'sensor_samples',
+        ['user_id', 'reading_type_id', 'measured_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sensor_samples_user_id_reading_type_id_measured_at', 'sensor_samples')
+    op.drop_table('sensor_samples')
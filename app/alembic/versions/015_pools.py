@@ -0,0 +1,149 @@
+"""pools, with tasks, readings and alerts scoped to one
+
+Revision ID: 015_pools
+Revises: 014_sensor_samples
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import uuid
+
+# revision identifiers, used by Alembic.
+revision: str = '015_pools'
+down_revision: Union[str, None] = '014_sensor_samples'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POOL_TABLES = ['maintenance_tasks', 'readings', 'alerts']
+
+# Same as 006_sync_tracking; a batch rebuild on SQLite drops a table's triggers
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+# Reads maintenance_tasks, so SQLite won't rename the rebuilt table while it exists
+HISTORY_TRIGGER = 'task_completion_history_record_tombstone'
+
+
+def _drop_sqlite_triggers(table: str) -> None:
+    if table == 'maintenance_tasks':
+        op.execute(f"DROP TRIGGER IF EXISTS {HISTORY_TRIGGER}")
+
+
+def _create_sqlite_triggers(table: str) -> None:
+    if table == 'maintenance_tasks':
+        op.execute(f"""
+            CREATE TRIGGER {HISTORY_TRIGGER} AFTER DELETE ON task_completion_history
+            FOR EACH ROW BEGIN
+                INSERT INTO sync_tombstones (table_name, row_id, user_id, deleted_at)
+                VALUES ('task_completion_history', OLD.id,
+                        (SELECT user_id FROM maintenance_tasks WHERE id = OLD.task_id), {SQLITE_NOW});
+            END
+        """)
+    op.execute(f"""
+        CREATE TRIGGER {table}_set_updated_at AFTER UPDATE ON {table}
+        FOR EACH ROW BEGIN
+            UPDATE {table} SET updated_at = {SQLITE_NOW} WHERE id = NEW.id;
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER {table}_record_tombstone AFTER DELETE ON {table}
+        FOR EACH ROW BEGIN
+            INSERT INTO sync_tombstones (table_name, row_id, user_id, deleted_at)
+            VALUES ('{table}', OLD.id, OLD.user_id, {SQLITE_NOW});
+        END
+    """)
+
+
+def upgrade() -> None:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+
+    pools = op.create_table(
+        'pools',
+        sa.Column('id', sa.Uuid(), primary_key=True, default=uuid.uuid4),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+    op.create_index('uq_pools_user_name', 'pools', ['user_id', 'name'], unique=True)
+
+    # One pool per existing account; everything it owns moves into it
+    users = sa.table('users', sa.column('id', sa.Uuid()))
+    user_ids = op.get_bind().execute(sa.select(users.c.id)).scalars().all()
+    if user_ids:
+        op.bulk_insert(pools, [{'id': uuid.uuid4(), 'user_id': user_id, 'name': 'My Pool'} for user_id in user_ids])
+
+    # Replaced below by pool-led versions
+    op.drop_index('ix_readings_out_of_range', 'readings')
+    op.drop_index('ix_readings_user_id_reading_type_id_reading_date', 'readings')
+
+    for table in POOL_TABLES:
+        op.add_column(table, sa.Column('pool_id', sa.Uuid(), nullable=True))
+        op.execute(f"UPDATE {table} SET pool_id = (SELECT pools.id FROM pools WHERE pools.user_id = {table}.user_id)")
+        if is_sqlite:
+            _drop_sqlite_triggers(table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('pool_id', existing_type=sa.Uuid(), nullable=False)
+            batch_op.create_foreign_key(f'fk_{table}_pool_id_pools', 'pools', ['pool_id'], ['id'], ondelete='CASCADE')
+            if table == 'maintenance_tasks':
+                # Task names only need to be unique within a pool
+                batch_op.drop_constraint('uq_maintenance_tasks_user_name', type_='unique')
+                batch_op.create_unique_constraint('uq_maintenance_tasks_pool_name', ['pool_id', 'name'])
+        if is_sqlite:
+            _create_sqlite_triggers(table)
+
+    # Per-pool reads are index range scans however many pools the account has
+    op.create_index(
+        'ix_readings_pool_id_reading_type_id_reading_date',
+        'readings',
+        ['pool_id', 'reading_type_id', 'reading_date']
+    )
+    out_of_range = sa.column('in_range') == sa.false()
+    op.create_index(
+        'ix_readings_out_of_range',
+        'readings',
+        ['pool_id', 'reading_type_id', 'reading_date'],
+        postgresql_where=out_of_range,
+        sqlite_where=out_of_range
+    )
+    op.create_index('ix_maintenance_tasks_pool_id_next_due_date', 'maintenance_tasks', ['pool_id', 'next_due_date'])
+    op.create_index('ix_alerts_pool_id', 'alerts', ['pool_id'])
+
+
+def downgrade() -> None:
+    is_sqlite = op.get_context().dialect.name == 'sqlite'
+
+    op.drop_index('ix_alerts_pool_id', 'alerts')
+    op.drop_index('ix_maintenance_tasks_pool_id_next_due_date', 'maintenance_tasks')
+    op.drop_index('ix_readings_out_of_range', 'readings')
+    op.drop_index('ix_readings_pool_id_reading_type_id_reading_date', 'readings')
+
+    # Fails if an account reuses a task name across pools; rename those first
+    for table in POOL_TABLES:
+        if is_sqlite:
+            _drop_sqlite_triggers(table)
+        with op.batch_alter_table(table) as batch_op:
+            if table == 'maintenance_tasks':
+                batch_op.drop_constraint('uq_maintenance_tasks_pool_name', type_='unique')
+                batch_op.create_unique_constraint('uq_maintenance_tasks_user_name', ['user_id', 'name'])
+            batch_op.drop_constraint(f'fk_{table}_pool_id_pools', type_='foreignkey')
+            batch_op.drop_column('pool_id')
+        if is_sqlite:
+            _create_sqlite_triggers(table)
+
+    op.create_index(
+        'ix_readings_user_id_reading_type_id_reading_date',
+        'readings',
+        ['user_id', 'reading_type_id', 'reading_date']
+    )
+    out_of_range = sa.column('in_range') == sa.false()
+    op.create_index(
+        'ix_readings_out_of_range',
+        'readings',
+        ['user_id', 'reading_type_id', 'reading_date'],
+        postgresql_where=out_of_range,
+        sqlite_where=out_of_range
+    )
+
+    op.drop_index('uq_pools_user_name', 'pools')
+    op.drop_table('pools')
@@ -0,0 +1,50 @@
+"""background job queue
+
+Revision ID: 016_jobs
+Revises: 015_pools
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '016_jobs'
+down_revision: Union[str, None] = '015_pools'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Uuid(), primary_key=True),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('progress', sa.Float(), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+    # Workers claim the oldest queued job; the index holds only the queue, however long the history
+    queued = sa.column('status') == 'queued'
+    op.create_index('ix_jobs_queued', 'jobs', ['created_at'], postgresql_where=queued, sqlite_where=queued)
+    # Stale-worker recovery scans only running jobs
+    running = sa.column('status') == 'running'
+    op.create_index('ix_jobs_running', 'jobs', ['heartbeat_at'], postgresql_where=running, sqlite_where=running)
+    op.create_index('ix_jobs_user_id_created_at', 'jobs', ['user_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_user_id_created_at', 'jobs')
+    op.drop_index('ix_jobs_running', 'jobs')
+    op.drop_index('ix_jobs_queued', 'jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,52 @@
+"""delete task history before its task, so its tombstones keep their owner
+
+Revision ID: 017_task_history_tombstones
+Revises: 016_jobs
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '017_task_history_tombstones'
+down_revision: Union[str, None] = '016_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# History rows find their owner through their task. When a pool delete
+# cascades to its tasks, the cascade removes history after the task, so the
+# tombstones got no user_id and never reached a sync. Deleting history first
+# (ahead of the cascade) runs the history trigger while the task still exists.
+TRIGGER = 'maintenance_tasks_delete_history'
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == 'sqlite':
+        op.execute(f"""
+            CREATE TRIGGER {TRIGGER} BEFORE DELETE ON maintenance_tasks
+            FOR EACH ROW BEGIN
+                DELETE FROM task_completion_history WHERE task_id = OLD.id;
+            END
+        """)
+    else:
+        op.execute("""
+            CREATE OR REPLACE FUNCTION delete_task_history() RETURNS trigger AS $$
+            BEGIN
+                DELETE FROM task_completion_history WHERE task_id = OLD.id;
+                RETURN OLD;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {TRIGGER} BEFORE DELETE ON maintenance_tasks
+            FOR EACH ROW EXECUTE FUNCTION delete_task_history()
+        """)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'sqlite':
+        op.execute(f"DROP TRIGGER IF EXISTS {TRIGGER}")
+    else:
+        op.execute(f"DROP TRIGGER IF EXISTS {TRIGGER} ON maintenance_tasks")
+        op.execute("DROP FUNCTION IF EXISTS delete_task_history()")
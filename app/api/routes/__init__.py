@@ -1,13 +1,25 @@
 from app.api.routes.health import router as health_router
+from app.api.routes.pools import router as pools_router
 from app.api.routes.inventory import router as inventory_router
 from app.api.routes.tasks import router as tasks_router
 from app.api.routes.alerts import router as alerts_router
 from app.api.routes.readings import router as readings_router
+from app.api.routes.dashboard import router as dashboard_router
+from app.api.routes.events import router as events_router
+from app.api.routes.sync import router as sync_router
+from app.api.routes.ingest import router as ingest_router
+from app.api.routes.jobs import router as jobs_router
 
 __all__ = [
     "health_router",
+    "pools_router",
     "inventory_router",
     "tasks_router",
     "alerts_router",
     "readings_router",
+    "dashboard_router",
+    "events_router",
+    "sync_router",
+    "ingest_router",
+    "jobs_router",
 ]
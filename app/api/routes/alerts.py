@@ -4,37 +4,48 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import User, Alert
+from app.database import get_db, get_read_db
+from app.models import User, Pool, Alert
+from app.models.alert import mask_days
 from app.schemas import AlertCreate, AlertResponse
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_pool
+from app.cache import cached
+from app.rows import schema_columns, fetch_rows
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
 
 
 @router.get("/", response_model=List[AlertResponse])
+@cached("alerts")
 async def list_alerts(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_pool: Pool = Depends(get_current_pool),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all alerts for current user"""
-    result = await db.execute(
-        select(Alert).where(Alert.user_id == current_user.id)
+    """List all alerts for the pool"""
+    def with_days(row: dict) -> dict:
+        row["days_of_week"] = mask_days(row.pop("weekday_mask"))
+        return {field: row[field] for field in AlertResponse.model_fields}  # Same key order as the model
+
+    return await fetch_rows(
+        db,
+        select(*schema_columns(Alert, AlertResponse), Alert.weekday_mask).where(Alert.pool_id == current_pool.id),
+        with_days
     )
-    return result.scalars().all()
 
 
 @router.post("/", response_model=AlertResponse, status_code=201)
 async def create_alert(
     alert: AlertCreate,
     current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new alert"""
     alert_data = alert.model_dump()
     days_list = alert_data.pop("days_of_week", [])
     
-    db_alert = Alert(**alert_data, user_id=current_user.id)
+    db_alert = Alert(**alert_data, user_id=current_user.id, pool_id=current_pool.id)
     db_alert.days_of_week = days_list
     
     db.add(db_alert)
@@ -47,13 +58,14 @@ async def create_alert(
 async def delete_alert(
     alert_id: UUID,
     current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete an alert"""
     result = await db.execute(
         select(Alert)
         .where(Alert.id == alert_id)
-        .where(Alert.user_id == current_user.id)
+        .where(Alert.pool_id == current_pool.id)
     )
     alert = result.scalar_one_or_none()
     if not alert:
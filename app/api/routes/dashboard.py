@@ -0,0 +1,168 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select, func
+
+from app.admission import admission
+from app.database import read_session_factory
+from app.models import User, Pool, MaintenanceTask, ChemicalInventory, ReadingType, Reading, Alert
+from app.schemas import (
+    TaskResponse, InventoryResponse, ReadingTypeResponse,
+    LatestReading, AlertSummary, DashboardResponse
+)
+from app.dependencies import get_current_user, get_current_pool
+from app.cache import cached
+from app.services.archive import latest_archived
+from app.api.routes.tasks import get_today_in_timezone
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+async def _tasks(session_factory, user_id, pool_id):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(MaintenanceTask)
+            .where(MaintenanceTask.pool_id == pool_id)
+            .order_by(MaintenanceTask.next_due_date)
+        )
+        return [TaskResponse.model_validate(t) for t in result.scalars()]
+
+
+async def _due_tasks(session_factory, user_id, pool_id):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(MaintenanceTask)
+            .where(MaintenanceTask.pool_id == pool_id)
+            .where(MaintenanceTask.next_due_date <= get_today_in_timezone())
+            .order_by(MaintenanceTask.next_due_date)
+        )
+        return [TaskResponse.model_validate(t) for t in result.scalars()]
+
+
+async def _inventory(session_factory, user_id, pool_id):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(ChemicalInventory)
+            .where(ChemicalInventory.user_id == user_id)
+        )
+        return [InventoryResponse.model_validate(i) for i in result.scalars()]
+
+
+async def _low_inventory(session_factory, user_id, pool_id):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(ChemicalInventory)
+            .where(ChemicalInventory.user_id == user_id)
+            .where(ChemicalInventory.is_low_stock)
+        )
+        return [InventoryResponse.model_validate(i) for i in result.scalars()]
+
+
+async def _reading_types(session_factory, user_id, pool_id):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(ReadingType)
+            .where(ReadingType.is_active == True)
+            .order_by(ReadingType.display_order.asc().nullslast(), ReadingType.name)
+        )
+        return [ReadingTypeResponse.model_validate(t) for t in result.scalars()]
+
+
+async def _latest_readings(session_factory, user_id, pool_id):
+    """Most recent reading per active type, in a single windowed query (or from the archive)"""
+    ranked = (
+        select(
+            Reading.reading_type_id,
+            Reading.reading_value,
+            Reading.reading_date,
+            func.row_number().over(
+                partition_by=Reading.reading_type_id,
+                order_by=(Reading.reading_date.desc(), Reading.created_at.desc())
+            ).label("rn")
+        )
+        .where(Reading.pool_id == pool_id)
+        .subquery()
+    )
+    async with session_factory() as db:
+        result = await db.execute(
+            select(ReadingType.id, ReadingType.slug, ranked.c.reading_value, ranked.c.reading_date)
+            .outerjoin(ranked, (ranked.c.reading_type_id == ReadingType.id) & (ranked.c.rn == 1))
+            .where(ReadingType.is_active == True)
+        )
+        rows = result.all()
+
+    # Types whose readings are all archived, or whose newest is a back-dated one
+    archived = await latest_archived("readings", user_id, pool_id)
+    latest = []
+    for type_id, slug, reading_value, reading_date in rows:
+        row = archived.get(str(type_id))
+        if row is not None and (reading_date is None or row["reading_date"] > reading_date):
+            reading_value, reading_date = row["reading_value"], row["reading_date"]
+        if reading_date is not None:
+            latest.append(LatestReading(
+                reading_type_slug=slug,
+                reading_value=float(reading_value),
+                reading_date=reading_date
+            ))
+    return latest
+
+
+async def _alerts(session_factory, user_id, pool_id):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(
+                func.count(Alert.id).label("total"),
+                func.count(Alert.id).filter(Alert.cadence == "daily").label("daily"),
+                func.count(Alert.id).filter(Alert.cadence == "weekly").label("weekly"),
+                func.max(Alert.last_sent).label("last_sent"),
+            )
+            .where(Alert.pool_id == pool_id)
+        )
+        row = result.one()
+        return AlertSummary(
+            total=row.total,
+            daily=row.daily,
+            weekly=row.weekly,
+            last_sent=row.last_sent
+        )
+
+
+# Inventory belongs to the account; tasks, readings and alerts to the pool
+SECTIONS = {
+    "tasks": _tasks,
+    "due_tasks": _due_tasks,
+    "inventory": _inventory,
+    "low_inventory": _low_inventory,
+    "reading_types": _reading_types,
+    "latest_readings": _latest_readings,
+    "alerts": _alerts,
+}
+
+# Every section on its own session, plus the request's own for the user and pool
+admission.weigh("/dashboard/", len(SECTIONS) + 1)
+
+
+@router.get("/", response_model=DashboardResponse, response_model_exclude_unset=True)
+@cached("maintenance_tasks", "chemical_inventory", "reading_types", "readings", "alerts")
+async def get_dashboard(
+    request: Request,
+    fields: Optional[str] = Query(
+        None,
+        description=f"Comma-separated sections to include ({', '.join(SECTIONS)}). Defaults to all."
+    ),
+    current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool)
+):
+    """Assemble the requested dashboard sections in one round trip"""
+    if fields:
+        selected = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in selected if f not in SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown dashboard fields: {', '.join(unknown)}")
+    else:
+        selected = list(SECTIONS)
+
+    # Each section uses its own (read) session so the queries run concurrently
+    session_factory = read_session_factory(request)
+    results = await asyncio.gather(*(SECTIONS[name](session_factory, current_user.id, current_pool.id) for name in selected))
+    return DashboardResponse(**dict(zip(selected, results)))
@@ -0,0 +1,45 @@
+import asyncio
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+import orjson
+
+from app.models import User
+from app.dependencies import get_current_user
+from app.services.events import broker
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+HEARTBEAT_SECONDS = 15  # Keeps proxies from closing idle streams
+RETRY_MS = 3000  # Client reconnect delay
+
+
+def _format(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+@router.get("/")
+async def stream_events(
+    current_user: User = Depends(get_current_user)
+):
+    """Server-Sent Events stream of changes to the current user's data"""
+    queue = broker.subscribe(current_user.id)
+
+    async def stream():
+        try:
+            yield f"retry: {RETRY_MS}\n".encode() + _format("ready", {})
+            # Starlette cancels this generator when the client disconnects
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield _format(event, data)
+        finally:
+            broker.unsubscribe(current_user.id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
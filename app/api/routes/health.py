@@ -2,6 +2,12 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.admission import admission
+from app.cache import response_cache
+from app.changefeed import listener as changefeed_listener
+from app.services.events import broker
+from app.services.ingest import ingest_buffer
+from app.services.jobs import job_runner
 from app.database import get_db
 
 router = APIRouter(tags=["health"])
@@ -21,3 +27,31 @@ async def readiness_check(db: AsyncSession = Depends(get_db)):
         return {"status": "ready"}
     except Exception as e:
         return {"status": "not ready", "error": str(e)}
+
+
+@router.get("/health/cache")
+async def cache_stats():
+    """Response cache hit/miss/eviction counters and change feed state for this worker"""
+    return {
+        **response_cache.stats(),
+        "changefeed": changefeed_listener.stats(),
+        "events": broker.stats(),
+    }
+
+
+@router.get("/health/ingest")
+async def ingest_stats():
+    """Sensor sample buffer depth and write counters for this worker"""
+    return ingest_buffer.stats()
+
+
+@router.get("/health/jobs")
+async def job_stats():
+    """Background job workers and counters for this worker process"""
+    return job_runner.stats()
+
+
+@router.get("/health/admission")
+async def admission_stats():
+    """Requests in flight and queued, and how many were rate limited or shed, for this worker"""
+    return admission.stats()
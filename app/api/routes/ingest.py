@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import changefeed
+from app.config import settings
+from app.database import get_read_db
+from app.models import User, ReadingType, SensorSample
+from app.schemas import SensorSampleIn, IngestResult, SensorSampleResponse
+from app.dependencies import get_current_user
+from app.rows import schema_columns, fetch_rows
+from app.services.ingest import BufferFull, ingest_buffer
+
+router = APIRouter(prefix="/ingest", tags=["ingest"])
+
+MAX_LINE_BYTES = 4096
+MAX_ERRORS = 20  # Rejected lines reported back per request
+
+# slug -> id, resolved once per process and dropped when reading types change
+_type_ids: Optional[Dict[str, UUID]] = None
+
+
+def _forget_types(changes=()):
+    global _type_ids
+    if not changes or any(change.table == "reading_types" for change in changes):
+        _type_ids = None
+
+
+changefeed.register(_forget_types, _forget_types)
+
+
+async def _reading_type_ids(db: AsyncSession) -> Dict[str, UUID]:
+    global _type_ids
+    if _type_ids is None:
+        result = await db.execute(select(ReadingType.slug, ReadingType.id))
+        _type_ids = dict(result.all())
+    return _type_ids
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def _reason(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err["loc"] else err["msg"] for err in error.errors()
+        )
+    return str(error)
+
+
+@router.post("/samples", response_model=IngestResult, status_code=202)
+async def ingest_samples(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Accept NDJSON sensor samples, one {device, type, value, ts} object per line"""
+    type_ids = await _reading_type_ids(db)
+    result = IngestResult(accepted=0, rejected=0)
+    rows = []
+    line_number = 0
+
+    def parse(line: bytes) -> None:
+        nonlocal line_number
+        line_number += 1
+        if not line.strip():
+            return
+        try:
+            sample = SensorSampleIn.model_validate_json(line)
+            type_id = type_ids.get(sample.type)
+            if type_id is None:
+                raise ValueError(f"unknown reading type {sample.type!r}")
+        except ValueError as e:
+            result.rejected += 1
+            if len(result.errors) < MAX_ERRORS:
+                result.errors.append(f"line {line_number}: {_reason(e)}")
+            return
+        rows.append((current_user.id, type_id, sample.device, _utc(sample.ts), sample.value))
+
+    async def hand_off() -> None:
+        # Waiting here stops us reading the body, which pushes back on the sender
+        try:
+            await ingest_buffer.put_many(rows, settings.INGEST_WAIT_SECONDS)
+        except BufferFull:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Ingest buffer full; the first {result.accepted} samples were accepted",
+                headers={"Retry-After": "1"}
+            )
+        result.accepted += len(rows)
+        rows.clear()
+
+    tail = b""
+    async for chunk in request.stream():
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        if len(tail) > MAX_LINE_BYTES:
+            raise HTTPException(status_code=413, detail=f"Line {line_number + 1} is longer than {MAX_LINE_BYTES} bytes")
+        for line in lines:
+            parse(line)
+        if len(rows) >= settings.INGEST_BATCH_ROWS:
+            await hand_off()
+    parse(tail)
+    await hand_off()
+    return result
+
+
+@router.get("/samples", response_model=List[SensorSampleResponse])
+async def list_samples(
+    slug: str,
+    start: Optional[datetime] = Query(None, description="Defaults to 24 hours before end; UTC if no offset"),
+    end: Optional[datetime] = Query(None, description="Defaults to now; UTC if no offset"),
+    device: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Sensor samples of one reading type in a time range, oldest first"""
+    type_id = (await _reading_type_ids(db)).get(slug)
+    if type_id is None:
+        raise HTTPException(status_code=404, detail=f"Reading type not found: {slug}")
+    end = _utc(end) if end else datetime.now(timezone.utc)
+    start = _utc(start) if start else end - timedelta(hours=24)
+
+    query = (
+        select(*schema_columns(SensorSample, SensorSampleResponse))
+        .where(SensorSample.user_id == current_user.id)
+        .where(SensorSample.reading_type_id == type_id)
+        .where(SensorSample.measured_at >= start)
+        .where(SensorSample.measured_at <= end)
+        .order_by(SensorSample.measured_at)
+        .limit(limit)
+    )
+    if device:
+        query = query.where(SensorSample.device == device)
+    return await fetch_rows(db, query)
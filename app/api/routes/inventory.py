@@ -1,28 +1,53 @@
-from typing import List
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+from zoneinfo import ZoneInfo
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app import changefeed
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.models import User, ChemicalInventory
-from app.schemas import InventoryCreate, InventoryUpdate, InventoryResponse
+from app.schemas import (
+    InventoryCreate, InventoryUpdate, InventoryResponse, InventoryAdjust, InventoryBulkUpsert,
+    InventoryForecast, InventoryBalance
+)
 from app.dependencies import get_current_user
+from app.cache import cached
+from app.rows import schema_columns, fetch_rows
+from app.services.ledger import balances_at, forecast
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
 
+async def _commit_unique_name(db: AsyncSession) -> None:
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="An item with this name already exists")
+
+
 @router.get("/", response_model=List[InventoryResponse])
+@cached("chemical_inventory")
 async def list_inventory(
+    low_stock: bool = Query(False, description="Only items at or below their reorder threshold"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all inventory items for current user"""
-    result = await db.execute(
-        select(ChemicalInventory)
+    query = (
+        select(*schema_columns(ChemicalInventory, InventoryResponse))
         .where(ChemicalInventory.user_id == current_user.id)
     )
-    return result.scalars().all()
+    if low_stock:
+        query = query.where(ChemicalInventory.is_low_stock)  # Served by the low-stock partial index
+    return await fetch_rows(db, query)
 
 
 @router.post("/", response_model=InventoryResponse, status_code=201)
@@ -34,16 +59,76 @@ async def create_inventory_item(
     """Create a new inventory item"""
     db_item = ChemicalInventory(**item.model_dump(), user_id=current_user.id)
     db.add(db_item)
-    await db.commit()
+    await _commit_unique_name(db)
     await db.refresh(db_item)
     return db_item
 
 
+@router.put("/bulk", response_model=List[InventoryResponse])
+async def upsert_inventory_items(
+    bulk: InventoryBulkUpsert,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create or update many items by name in one statement (e.g. a restock delivery)"""
+    # ON CONFLICT can't touch the same row twice in one statement; the last entry for a name wins
+    items = {item.name: item for item in bulk.items}
+    if not items:
+        return []
+
+    dialect_insert = sqlite.insert if db.get_bind().dialect.name == "sqlite" else postgresql.insert
+    statement = dialect_insert(ChemicalInventory).values([
+        {**item.model_dump(), "id": uuid.uuid4(), "user_id": current_user.id}
+        for item in items.values()
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[ChemicalInventory.user_id, ChemicalInventory.name],
+        set_={
+            "quantity_on_hand": statement.excluded.quantity_on_hand,
+            "unit": statement.excluded.unit,
+            "reorder_threshold": statement.excluded.reorder_threshold,
+        }
+    ).returning(ChemicalInventory)
+
+    result = await db.scalars(statement, execution_options={"populate_existing": True})
+    upserted = result.all()
+    for db_item in upserted:
+        changefeed.record_change(db, ChemicalInventory.__tablename__, db_item.user_id, db_item.id)
+    await db.commit()
+    return sorted(upserted, key=lambda db_item: db_item.name)
+
+
+@router.get("/forecast", response_model=List[InventoryForecast])
+@cached("chemical_inventory")
+async def forecast_inventory(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Usage rate and days until empty for every item, soonest first"""
+    result = await db.execute(
+        select(ChemicalInventory)
+        .where(ChemicalInventory.user_id == current_user.id)
+    )
+    items = result.scalars().all()
+    forecasts = await forecast(db, ChemicalInventory.user_id == current_user.id)
+
+    rows = [
+        InventoryForecast(
+            **InventoryResponse.model_validate(item).model_dump(),
+            daily_usage=forecasts[item.id].daily_usage,
+            days_until_empty=forecasts[item.id].days_until_empty
+        )
+        for item in items if item.id in forecasts
+    ]
+    rows.sort(key=lambda row: (row.days_until_empty is None, row.days_until_empty or 0, row.name))
+    return rows
+
+
 @router.get("/{item_id}", response_model=InventoryResponse)
 async def get_inventory_item(
     item_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific inventory item"""
     result = await db.execute(
@@ -57,6 +142,25 @@ async def get_inventory_item(
     return item
 
 
+@router.get("/{item_id}/balance", response_model=InventoryBalance)
+async def get_inventory_balance(
+    item_id: UUID,
+    at: Optional[datetime] = Query(None, description="Moment to report; defaults to now, local TIMEZONE if no offset"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Quantity on hand at a past moment, from the latest snapshot plus later ledger rows"""
+    at = at or datetime.now(timezone.utc)
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=ZoneInfo(settings.TIMEZONE))
+    balances = await balances_at(
+        db, at, ChemicalInventory.id == item_id, ChemicalInventory.user_id == current_user.id
+    )
+    if item_id not in balances:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return InventoryBalance(item_id=item_id, at=at, quantity_on_hand=balances[item_id])
+
+
 @router.put("/{item_id}", response_model=InventoryResponse)
 async def update_inventory_item(
     item_id: UUID,
@@ -77,11 +181,45 @@ async def update_inventory_item(
     for key, value in item_update.model_dump().items():
         setattr(db_item, key, value)
     
-    await db.commit()
+    await _commit_unique_name(db)
     await db.refresh(db_item)
     return db_item
 
 
+@router.post("/{item_id}/adjust", response_model=InventoryResponse)
+async def adjust_inventory_item(
+    item_id: UUID,
+    adjustment: InventoryAdjust,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add a signed delta to quantity_on_hand in a single UPDATE"""
+    # The database does the arithmetic, so concurrent adjustments never overwrite each other
+    result = await db.scalars(
+        update(ChemicalInventory)
+        .where(ChemicalInventory.id == item_id)
+        .where(ChemicalInventory.user_id == current_user.id)
+        .where(ChemicalInventory.quantity_on_hand + adjustment.delta >= 0)
+        .values(quantity_on_hand=ChemicalInventory.quantity_on_hand + adjustment.delta)
+        .returning(ChemicalInventory),
+        execution_options={"populate_existing": True}
+    )
+    db_item = result.one_or_none()
+    if db_item is None:
+        exists = await db.scalar(
+            select(ChemicalInventory.id)
+            .where(ChemicalInventory.id == item_id)
+            .where(ChemicalInventory.user_id == current_user.id)
+        )
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        raise HTTPException(status_code=409, detail="Not enough stock on hand")
+
+    changefeed.record_change(db, ChemicalInventory.__tablename__, db_item.user_id, db_item.id)
+    await db.commit()
+    return db_item
+
+
 @router.delete("/{item_id}", status_code=204)
 async def delete_inventory_item(
     item_id: UUID,
@@ -101,3 +239,4 @@ async def delete_inventory_item(
     await db.delete(item)
     await db.commit()
     return None
+
@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import ValidationError
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_db, get_read_db
+from app.models import User, Job
+from app.schemas import JobCreate, JobResponse
+from app.dependencies import get_current_user
+from app.services.jobs import HANDLERS, UNFINISHED
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("/", response_model=JobResponse, status_code=202)
+async def submit_job(
+    job: JobCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue a background job; poll GET /jobs/{id} for progress and the result"""
+    spec = HANDLERS.get(job.kind)
+    if spec is None:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {job.kind}. Available: {', '.join(sorted(HANDLERS))}")
+    if spec.params is not None:
+        try:
+            params = spec.params.model_validate(job.params).model_dump(mode="json")
+        except ValidationError as e:
+            detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            raise HTTPException(status_code=422, detail=detail)
+    elif job.params:
+        raise HTTPException(status_code=400, detail=f"{job.kind} takes no params")
+    else:
+        params = {}
+
+    unfinished = await db.scalar(
+        select(func.count(Job.id))
+        .where(Job.user_id == current_user.id)
+        .where(Job.status.in_(UNFINISHED))
+    )
+    if unfinished >= settings.JOB_MAX_QUEUED:
+        raise HTTPException(
+            status_code=429,
+            detail=f"{unfinished} jobs still unfinished; wait for some to complete",
+            headers={"Retry-After": str(max(1, round(settings.JOB_POLL_SECONDS * 5)))}
+        )
+
+    db_job = Job(
+        user_id=current_user.id,
+        kind=job.kind,
+        params=params,
+        created_at=datetime.now(timezone.utc)
+    )
+    db.add(db_job)
+    await db.commit()
+    return db_job
+
+
+@router.get("/", response_model=List[JobResponse])
+async def list_jobs(
+    status: Optional[str] = Query(None, description="queued, running, succeeded or failed"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """The current user's most recent jobs, newest first"""
+    query = (
+        select(Job)
+        .where(Job.user_id == current_user.id)
+        .order_by(Job.created_at.desc())
+        .limit(limit)
+    )
+    if status:
+        query = query.where(Job.status == status)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Status, progress and (once finished) result or error of a job"""
+    result = await db.execute(
+        select(Job)
+        .where(Job.id == job_id)
+        .where(Job.user_id == current_user.id)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,101 @@
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.changefeed import record_change
+from app.database import get_db, get_read_db
+from app.models import User, Pool
+from app.schemas import PoolCreate, PoolUpdate, PoolResponse
+from app.dependencies import get_current_user
+from app.cache import cached
+from app.services.archive import drop_archive
+
+router = APIRouter(prefix="/pools", tags=["pools"])
+
+
+async def _commit_unique_name(db: AsyncSession) -> None:
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="A pool with this name already exists")
+
+
+async def _get_pool(db: AsyncSession, pool_id: UUID, user: User) -> Pool:
+    result = await db.execute(
+        select(Pool)
+        .where(Pool.id == pool_id)
+        .where(Pool.user_id == user.id)
+    )
+    pool = result.scalar_one_or_none()
+    if not pool:
+        raise HTTPException(status_code=404, detail="Pool not found")
+    return pool
+
+
+@router.get("/", response_model=List[PoolResponse])
+@cached("pools")
+async def list_pools(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List the current user's pools, oldest (the default) first"""
+    result = await db.execute(
+        select(Pool)
+        .where(Pool.user_id == current_user.id)
+        .order_by(Pool.created_at, Pool.id)
+    )
+    return result.scalars().all()
+
+
+@router.post("/", response_model=PoolResponse, status_code=201)
+async def create_pool(
+    pool: PoolCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add a pool; pass its id as ?pool_id= to the task, reading and alert routes"""
+    db_pool = Pool(**pool.model_dump(), user_id=current_user.id)
+    db.add(db_pool)
+    await _commit_unique_name(db)
+    await db.refresh(db_pool)
+    return db_pool
+
+
+@router.put("/{pool_id}", response_model=PoolResponse)
+async def update_pool(
+    pool_id: UUID,
+    pool_update: PoolUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Rename a pool"""
+    db_pool = await _get_pool(db, pool_id, current_user)
+    db_pool.name = pool_update.name
+    await _commit_unique_name(db)
+    await db.refresh(db_pool)
+    return db_pool
+
+
+@router.delete("/{pool_id}", status_code=204)
+async def delete_pool(
+    pool_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a pool with its tasks, readings and alerts"""
+    pool = await _get_pool(db, pool_id, current_user)
+    count = await db.scalar(select(func.count(Pool.id)).where(Pool.user_id == current_user.id))
+    if count <= 1:
+        raise HTTPException(status_code=400, detail="Can't delete the only pool")
+
+    # The database cascades to the pool's rows; the ORM never sees them
+    await db.delete(pool)
+    for table in ("maintenance_tasks", "task_completion_history", "readings", "alerts"):
+        record_change(db, table, current_user.id)
+    await db.commit()
+    await drop_archive(current_user.id, pool_id)
+    return None
@@ -1,25 +1,44 @@
-from datetime import date, timedelta
-from typing import List
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, and_, or_, func, case, false
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import User, ReadingType, Reading
+from app.database import get_db, get_read_db
+from app.changefeed import record_change
+from app.models import User, Pool, ReadingType, Reading, SyncTombstone
 from app.schemas import (
     ReadingTypeCreate, ReadingTypeResponse,
-    ReadingCreate, ReadingResponse, ReadingChartPoint
+    ReadingCreate, ReadingResponse, ReadingChartPoint,
+    ReadingSeries, ReadingSeriesResponse,
+    ReadingStreak, ReadingRangeSummary, ReadingRangeReport
 )
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_pool
+from app.cache import cached
+from app.rows import RowsResponse, fetch_rows, select_rows
+from app.api.routes.tasks import get_today_in_timezone
+from app.services.ranges import classify
+from app.services.archive import delete_archived, load_archived, merge_archived
 
 router = APIRouter(prefix="/readings", tags=["readings"])
 
+MAX_SERIES = 20  # Slugs per /readings/series and /readings/report request
+
+
+def _parse_slugs(slugs: str) -> List[str]:
+    requested = list(dict.fromkeys(slug.strip() for slug in slugs.split(",") if slug.strip()))
+    if not requested:
+        raise HTTPException(status_code=400, detail="No reading types requested")
+    if len(requested) > MAX_SERIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SERIES} reading types per request")
+    return requested
+
 
 # Reading Types
 @router.get("/types", response_model=List[ReadingTypeResponse])
 async def list_reading_types(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all active reading types ordered by display_order"""
     result = await db.execute(
@@ -56,6 +75,7 @@ async def create_reading_type(
 async def create_reading(
     reading: ReadingCreate,
     current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new reading"""
@@ -71,10 +91,12 @@ async def create_reading(
     # Create reading
     db_reading = Reading(
         user_id=current_user.id,
+        pool_id=current_pool.id,
         reading_type_id=reading_type.id,
         reading_value=reading.reading_value,
         reading_date=reading.reading_date,
-        notes=reading.notes
+        notes=reading.notes,
+        in_range=classify(reading.reading_value, reading_type.low, reading_type.high)
     )
     db.add(db_reading)
     await db.commit()
@@ -83,70 +105,322 @@ async def create_reading(
     # Return with type info for frontend
     return ReadingResponse(
         id=db_reading.id,
+        pool_id=db_reading.pool_id,
         reading_value=db_reading.reading_value,
         reading_date=db_reading.reading_date,
         notes=db_reading.notes,
         reading_type_slug=reading_type.slug,
         reading_type_name=reading_type.name,
         unit=reading_type.unit,
+        in_range=db_reading.in_range,
         created_at=db_reading.created_at
     )
 
 
 @router.get("/", response_model=List[ReadingChartPoint])
+@cached("readings", "reading_types")
 async def list_readings(
     slug: str,
     days: int = 90,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_pool: Pool = Depends(get_current_pool),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get readings for a specific type within date range"""
     # Find reading type
     result = await db.execute(
-        select(ReadingType).where(ReadingType.slug == slug)
+        select(ReadingType.id).where(ReadingType.slug == slug)
     )
-    reading_type = result.scalar_one_or_none()
+    reading_type_id = result.scalar_one_or_none()
     
-    if not reading_type:
+    if not reading_type_id:
         raise HTTPException(status_code=404, detail=f"Reading type not found: {slug}")
     
-    # Get readings
+    # Get readings (dates encode as ISO strings, as ReadingChartPoint has them)
     cutoff_date = date.today() - timedelta(days=days)
-    result = await db.execute(
-        select(Reading)
-        .where(Reading.user_id == current_user.id)
-        .where(Reading.reading_type_id == reading_type.id)
+    query = (
+        select(Reading.id, Reading.reading_date, Reading.reading_value)
+        .where(Reading.pool_id == current_pool.id)
+        .where(Reading.reading_type_id == reading_type_id)
         .where(Reading.reading_date >= cutoff_date)
         .order_by(Reading.reading_date.asc())
     )
-    readings = result.scalars().all()
-    
-    return [
-        ReadingChartPoint(
-            reading_date=r.reading_date.isoformat(),
-            reading_value=float(r.reading_value)
+    archived = await load_archived("readings", current_pool.user_id, current_pool.id, reading_type_id, cutoff_date)
+    if not archived:
+        return await fetch_rows(db, query)
+
+    rows = merge_archived(archived, await select_rows(db, query))
+    rows.sort(key=lambda row: row["reading_date"])
+    return RowsResponse([
+        {"id": row["id"], "reading_date": row["reading_date"], "reading_value": row["reading_value"]}
+        for row in rows
+    ])
+
+
+@router.get("/series", response_model=ReadingSeriesResponse)
+@cached("readings", "reading_types")
+async def get_reading_series(
+    slugs: str = Query(..., description="Comma-separated reading type slugs, e.g. ph,ta,fc"),
+    start: Optional[date] = Query(None, description="First day (inclusive); defaults to 90 days before end"),
+    end: Optional[date] = Query(None, description="Last day (inclusive); defaults to today"),
+    current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Several reading series over an explicit date range, in one query"""
+    requested = _parse_slugs(slugs)
+    end = end or get_today_in_timezone()
+    start = start or end - timedelta(days=90)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    # Outer join so requested types without readings in the range still come back
+    result = await db.execute(
+        select(ReadingType, Reading.id, Reading.reading_date, Reading.reading_value)
+        .outerjoin(Reading, and_(
+            Reading.reading_type_id == ReadingType.id,
+            Reading.pool_id == current_pool.id,
+            Reading.reading_date >= start,
+            Reading.reading_date <= end
+        ))
+        .where(ReadingType.slug.in_(requested))
+        .order_by(ReadingType.slug, Reading.reading_date, Reading.created_at)
+    )
+
+    # Rows arrive grouped by type; build every series in one pass
+    series = {}
+    type_ids = {}
+    for reading_type, reading_id, reading_date, reading_value in result:
+        current = series.get(reading_type.slug)
+        if current is None:
+            type_ids[reading_type.slug] = reading_type.id
+            current = series[reading_type.slug] = ReadingSeries(
+                slug=reading_type.slug,
+                name=reading_type.name,
+                unit=reading_type.unit,
+                low=reading_type.low,
+                high=reading_type.high,
+                points=[]
+            )
+        if reading_id is not None:
+            current.points.append(ReadingChartPoint(
+                id=reading_id,
+                reading_date=reading_date.isoformat(),
+                reading_value=float(reading_value)
+            ))
+
+    unknown = [slug for slug in requested if slug not in series]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Reading type not found: {', '.join(unknown)}")
+
+    # Months moved out of the database come from the archive
+    for slug, current in series.items():
+        archived = await load_archived("readings", current_pool.user_id, current_pool.id, type_ids[slug], start, end)
+        if archived:
+            hot_ids = {point.id for point in current.points}
+            current.points = sorted([
+                ReadingChartPoint(
+                    id=row["id"],
+                    reading_date=row["reading_date"].isoformat(),
+                    reading_value=float(row["reading_value"])
+                )
+                for row in archived if row["id"] not in hot_ids
+            ] + current.points, key=lambda point: point.reading_date)
+
+    return ReadingSeriesResponse(start=start, end=end, series=[series[slug] for slug in requested])
+
+
+def _streaks(days: List[date]) -> List[ReadingStreak]:
+    """Runs of consecutive days, from sorted distinct dates"""
+    streaks = []
+    for day in days:
+        if streaks and day - streaks[-1].end == timedelta(days=1):
+            streaks[-1].end = day
+            streaks[-1].days += 1
+        else:
+            streaks.append(ReadingStreak(start=day, end=day, days=1))
+    return streaks
+
+
+@router.get("/report", response_model=ReadingRangeReport)
+@cached("readings", "reading_types")
+async def get_range_report(
+    slugs: Optional[str] = Query(None, description="Comma-separated reading type slugs; defaults to every active type with a range"),
+    start: Optional[date] = Query(None, description="First day (inclusive); defaults to January 1 of end's year"),
+    end: Optional[date] = Query(None, description="Last day (inclusive); defaults to today"),
+    limit: int = Query(10, ge=0, le=100, description="How many of the latest violations to return"),
+    current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Out-of-range counts, streaks and latest violations per reading type"""
+    end = end or get_today_in_timezone()
+    start = start or end.replace(month=1, day=1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    in_window = and_(
+        Reading.pool_id == current_pool.id,
+        Reading.reading_date >= start,
+        Reading.reading_date <= end
+    )
+    violation = Reading.in_range == false()  # Literal, so the partial index applies
+
+    # Totals per type (the series index); outer join keeps types without readings
+    query = (
+        select(
+            ReadingType,
+            func.count(Reading.id),
+            func.count(case((violation, 1))),
+            func.count(case((and_(violation, Reading.reading_value < ReadingType.low), 1))),
+            func.max(Reading.reading_date)
         )
-        for r in readings
-    ]
+        .outerjoin(Reading, and_(Reading.reading_type_id == ReadingType.id, in_window))
+        .group_by(ReadingType.id)
+        .order_by(ReadingType.display_order.asc().nullslast(), ReadingType.name)
+    )
+    if slugs:
+        requested = _parse_slugs(slugs)
+        query = query.where(ReadingType.slug.in_(requested))
+    else:
+        requested = None
+        query = query.where(ReadingType.is_active == True).where(or_(ReadingType.low != None, ReadingType.high != None))
+    totals = (await db.execute(query)).all()
+
+    if requested:
+        found = {reading_type.slug for reading_type, *_ in totals}
+        unknown = [slug for slug in requested if slug not in found]
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Reading type not found: {', '.join(unknown)}")
+    type_ids = [reading_type.id for reading_type, *_ in totals]
+
+    # Violation days and latest violations both read only the out-of-range index
+    result = await db.execute(
+        select(Reading.reading_type_id, Reading.reading_date)
+        .where(in_window, violation, Reading.reading_type_id.in_(type_ids))
+        .distinct()
+        .order_by(Reading.reading_type_id, Reading.reading_date)
+    )
+    violation_days = {}
+    for reading_type_id, reading_date in result:
+        violation_days.setdefault(reading_type_id, []).append(reading_date)
+
+    latest = []
+    if limit:
+        result = await db.execute(
+            select(Reading, ReadingType)
+            .join(ReadingType, Reading.reading_type_id == ReadingType.id)
+            .where(in_window, violation, Reading.reading_type_id.in_(type_ids))
+            .order_by(Reading.reading_date.desc(), Reading.created_at.desc())
+            .limit(limit)
+        )
+        latest = [
+            ReadingResponse(
+                id=reading.id,
+                pool_id=reading.pool_id,
+                reading_value=reading.reading_value,
+                reading_date=reading.reading_date,
+                notes=reading.notes,
+                reading_type_slug=reading_type.slug,
+                reading_type_name=reading_type.name,
+                unit=reading_type.unit,
+                in_range=reading.in_range,
+                created_at=reading.created_at
+            )
+            for reading, reading_type in result
+        ]
+
+    # Archived months, classified against the current ranges like the hourly reclassify does
+    latest_ids = {reading.id for reading in latest}
+    archived_violations = []
+    counted = []
+    for reading_type, readings, violations, below, last_date in totals:
+        archived = await load_archived("readings", current_pool.user_id, current_pool.id, reading_type.id, start, end)
+        days = set(violation_days.get(reading_type.id, []))
+        for row in archived:
+            readings += 1
+            last_date = max(last_date or row["reading_date"], row["reading_date"])
+            if classify(row["reading_value"], reading_type.low, reading_type.high) is not False:
+                continue
+            violations += 1
+            if reading_type.low is not None and row["reading_value"] < reading_type.low:
+                below += 1
+            days.add(row["reading_date"])
+            if limit and row["id"] not in latest_ids:
+                archived_violations.append(ReadingResponse(
+                    id=row["id"],
+                    pool_id=row["pool_id"],
+                    reading_value=row["reading_value"],
+                    reading_date=row["reading_date"],
+                    notes=row["notes"],
+                    reading_type_slug=reading_type.slug,
+                    reading_type_name=reading_type.name,
+                    unit=reading_type.unit,
+                    in_range=False,
+                    created_at=row["created_at"]
+                ))
+        counted.append((reading_type, readings, violations, below, last_date, sorted(days)))
+    if archived_violations:
+        latest = sorted(
+            latest + archived_violations,
+            key=lambda reading: (reading.reading_date, reading.created_at),
+            reverse=True
+        )[:limit]
+
+    summaries = []
+    for reading_type, readings, violations, below, last_date, days in counted:
+        streaks = _streaks(days)
+        summaries.append(ReadingRangeSummary(
+            slug=reading_type.slug,
+            name=reading_type.name,
+            unit=reading_type.unit,
+            low=reading_type.low,
+            high=reading_type.high,
+            readings=readings,
+            violations=violations,
+            below=below,
+            above=violations - below,
+            violation_days=len(days),
+            longest_streak=max(streaks, key=lambda s: s.days, default=None),
+            current_streak=streaks[-1] if streaks and streaks[-1].end == last_date else None
+        ))
+    if requested:
+        summaries.sort(key=lambda s: requested.index(s.slug))
+
+    return ReadingRangeReport(start=start, end=end, types=summaries, latest=latest)
 
 
 @router.delete("/{reading_id}", status_code=204)
 async def delete_reading(
     reading_id: UUID,
     current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a reading"""
     result = await db.execute(
         select(Reading)
         .where(Reading.id == reading_id)
-        .where(Reading.user_id == current_user.id)
+        .where(Reading.pool_id == current_pool.id)
     )
     reading = result.scalar_one_or_none()
     
     if not reading:
-        raise HTTPException(status_code=404, detail="Reading not found")
+        # Older readings may have moved to the archive
+        if not await delete_archived("readings", current_pool.user_id, current_pool.id, reading_id):
+            raise HTTPException(status_code=404, detail="Reading not found")
+        # No trigger saw this delete; tell sync clients holding the row ourselves
+        db.add(SyncTombstone(
+            table_name="readings", row_id=reading_id, user_id=current_user.id, deleted_at=datetime.now(timezone.utc)
+        ))
+        record_change(db, "readings", current_user.id, reading_id)
+        await db.commit()
+        return None
     
     await db.delete(reading)
     await db.commit()
+    # Archived meanwhile, it would come back from its month file
+    await delete_archived(
+        "readings", current_pool.user_id, current_pool.id, reading_id, reading.reading_type_id, reading.reading_date
+    )
     return None
@@ -0,0 +1,287 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, NamedTuple, Optional, Type
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select, literal, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal, get_db
+from app.models import (
+    User, MaintenanceTask, TaskCompletionHistory, ChemicalInventory, Alert, ReadingType, Reading,
+    SyncTombstone, SyncReceipt
+)
+from app.schemas import (
+    TaskCreate, TaskUpdate, TaskComplete, TaskResponse, TaskCompletionHistoryResponse,
+    InventoryCreate, InventoryUpdate, InventoryAdjust, InventoryResponse, AlertResponse, ReadingCreate, ReadingResponse,
+    SyncDeleted, SyncResponse, SyncOperation, SyncPush, SyncResult, SyncPushResponse
+)
+from app.dependencies import get_current_user, get_current_pool
+from app.api.routes.tasks import create_task, update_task, complete_task, delete_task
+from app.api.routes.inventory import (
+    create_inventory_item, update_inventory_item, adjust_inventory_item, delete_inventory_item
+)
+from app.api.routes.readings import create_reading, delete_reading
+from app.services.archive import load_user_archive
+from app.services.ranges import classify
+from app.services.jobs import JobContext, handler
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+LOAD_BATCH = 500  # Ids per IN (...) when loading changed rows
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# table -> (entity name in `deleted`, SyncResponse field)
+SYNCED = {
+    "maintenance_tasks": ("task", "tasks"),
+    "task_completion_history": ("task_history", "task_history"),
+    "chemical_inventory": ("inventory", "inventory"),
+    "alerts": ("alert", "alerts"),
+    "readings": ("reading", "readings"),
+}
+
+
+def _encode_token(moment: datetime) -> str:
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def _decode_token(token: str) -> datetime:
+    try:
+        return EPOCH + timedelta(microseconds=int(token))
+    except (ValueError, OverflowError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+def _changes_query(user_id, since: Optional[datetime]):
+    """(table, id, deleted) for every row changed or deleted since `since`, in one UNION ALL"""
+    def changed(table, model, *where):
+        query = select(literal(table).label("table_name"), model.id.label("row_id"), literal(False).label("deleted"))
+        if since is not None:
+            query = query.where(model.updated_at > since)
+        return query.where(*where)
+
+    parts = [
+        changed("maintenance_tasks", MaintenanceTask, MaintenanceTask.user_id == user_id),
+        changed("chemical_inventory", ChemicalInventory, ChemicalInventory.user_id == user_id),
+        changed("alerts", Alert, Alert.user_id == user_id),
+        changed("readings", Reading, Reading.user_id == user_id),
+        changed(
+            "task_completion_history", TaskCompletionHistory,
+            TaskCompletionHistory.task_id.in_(select(MaintenanceTask.id).where(MaintenanceTask.user_id == user_id))
+        ),
+    ]
+    if since is not None:
+        parts.append(
+            select(SyncTombstone.table_name, SyncTombstone.row_id, literal(True))
+            .where(SyncTombstone.user_id == user_id)
+            .where(SyncTombstone.deleted_at > since)
+        )
+    return union_all(*parts)
+
+
+async def _load(db: AsyncSession, table: str, ids: list) -> list:
+    """Serialize rows with the same schemas the REST routes use"""
+    rows = []
+    for start in range(0, len(ids), LOAD_BATCH):
+        batch = ids[start:start + LOAD_BATCH]
+        if table == "readings":
+            result = await db.execute(
+                select(Reading, ReadingType)
+                .join(ReadingType, Reading.reading_type_id == ReadingType.id)
+                .where(Reading.id.in_(batch))
+            )
+            rows.extend(
+                ReadingResponse(
+                    id=reading.id,
+                    pool_id=reading.pool_id,
+                    reading_value=reading.reading_value,
+                    reading_date=reading.reading_date,
+                    notes=reading.notes,
+                    reading_type_slug=reading_type.slug,
+                    reading_type_name=reading_type.name,
+                    unit=reading_type.unit,
+                    in_range=reading.in_range,
+                    created_at=reading.created_at
+                )
+                for reading, reading_type in result
+            )
+            continue
+        model, schema = {
+            "maintenance_tasks": (MaintenanceTask, TaskResponse),
+            "task_completion_history": (TaskCompletionHistory, TaskCompletionHistoryResponse),
+            "chemical_inventory": (ChemicalInventory, InventoryResponse),
+            "alerts": (Alert, AlertResponse),
+        }[table]
+        result = await db.execute(select(model).where(model.id.in_(batch)))
+        rows.extend(schema.model_validate(row) for row in result.scalars())
+    return rows
+
+
+async def _add_archived(db: AsyncSession, user_id, response: SyncResponse) -> None:
+    """Fold archived task history and readings into a full snapshot (a row in both counts once)"""
+    history = await load_user_archive("history", user_id)
+    if history:
+        hot = {row.id for row in response.task_history}
+        response.task_history = [
+            TaskCompletionHistoryResponse.model_validate(row) for row in history if row["id"] not in hot
+        ] + response.task_history
+
+    readings = await load_user_archive("readings", user_id)
+    if readings:
+        hot = {row.id for row in response.readings}
+        types = {t.id: t for t in (await db.execute(select(ReadingType))).scalars()}
+        archived = []
+        for row in readings:
+            reading_type = types.get(row["reading_type_id"])
+            if row["id"] in hot or reading_type is None:
+                continue
+            archived.append(ReadingResponse(
+                id=row["id"],
+                pool_id=row["pool_id"],
+                reading_value=row["reading_value"],
+                reading_date=row["reading_date"],
+                notes=row["notes"],
+                reading_type_slug=reading_type.slug,
+                reading_type_name=reading_type.name,
+                unit=reading_type.unit,
+                in_range=classify(row["reading_value"], reading_type.low, reading_type.high),
+                created_at=row["created_at"]
+            ))
+        response.readings = archived + response.readings
+
+
+async def _snapshot(db: AsyncSession, user_id, since: Optional[str], progress=None) -> SyncResponse:
+    """Rows changed and deleted since a token (all of them without one), as a SyncResponse"""
+    now = datetime.now(timezone.utc)
+    since_at = _decode_token(since) if since else None
+    if since_at is not None and since_at < now - timedelta(days=settings.SYNC_TOMBSTONE_DAYS):
+        since_at = None  # Tombstones this old are pruned; start over
+
+    result = await db.execute(_changes_query(user_id, since_at))
+    changed = {table: [] for table in SYNCED}
+    deleted = []
+    for table_name, row_id, is_deleted in result:
+        if table_name not in SYNCED:
+            continue
+        if is_deleted:
+            deleted.append(SyncDeleted(entity=SYNCED[table_name][0], id=row_id))
+        else:
+            changed[table_name].append(row_id)
+
+    # The token trails the clock so transactions still in flight (or a skewed
+    # database clock) are picked up next time; clients upsert idempotently.
+    response = SyncResponse(
+        token=_encode_token(now - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)),
+        full=since_at is None
+    )
+    for done, (table, ids) in enumerate(changed.items(), 1):
+        if ids:
+            setattr(response, SYNCED[table][1], await _load(db, table, ids))
+        if progress is not None:
+            await progress(done / len(changed))
+    if since_at is None:
+        # Clients replace their data with a full snapshot, so it must include the archive
+        await _add_archived(db, user_id, response)
+    if deleted:
+        response.deleted = deleted
+    return response
+
+
+@router.get("/", response_model=SyncResponse, response_model_exclude_unset=True)
+async def sync(
+    since: Optional[str] = Query(None, description="Token from the previous sync; omit for a full snapshot"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Rows changed and deleted since the last sync, across all of the user's data"""
+    # Always the primary: a lagging replica could skip rows that commit behind the token.
+    response = await _snapshot(db, current_user.id, since)
+    # Encoded by the model in one pass; returned as is, FastAPI would re-validate it and build dicts for orjson
+    return Response(response.model_dump_json(exclude_unset=True), media_type="application/json")
+
+
+@handler("export")
+async def export(ctx: JobContext) -> dict:
+    """Everything the user owns, as a full sync snapshot (too slow to build inside a request)"""
+    async with AsyncSessionLocal() as db:
+        response = await _snapshot(db, ctx.user_id, None, ctx.progress)
+    return response.model_dump(mode="json", exclude_unset=True)
+
+
+class Operation(NamedTuple):
+    handler: Callable  # The REST route, called directly
+    status: int  # Its success status code
+    body_arg: Optional[str] = None
+    body_schema: Optional[Type[BaseModel]] = None
+    target_arg: Optional[str] = None
+    response: Optional[Type[BaseModel]] = None
+    pooled: bool = False  # Scoped to the operation's pool_id
+
+
+# Writes an offline client can queue, by name
+OPERATIONS = {
+    "task.create": Operation(create_task, 201, "task", TaskCreate, response=TaskResponse, pooled=True),
+    "task.update": Operation(update_task, 200, "task_update", TaskUpdate, "task_id", TaskResponse, pooled=True),
+    "task.complete": Operation(complete_task, 200, "completion", TaskComplete, "task_id", TaskResponse, pooled=True),
+    "task.delete": Operation(delete_task, 204, target_arg="task_id", pooled=True),
+    "inventory.create": Operation(create_inventory_item, 201, "item", InventoryCreate, response=InventoryResponse),
+    "inventory.update": Operation(update_inventory_item, 200, "item_update", InventoryUpdate, "item_id", InventoryResponse),
+    "inventory.adjust": Operation(adjust_inventory_item, 200, "adjustment", InventoryAdjust, "item_id", InventoryResponse),
+    "inventory.delete": Operation(delete_inventory_item, 204, target_arg="item_id"),
+    "reading.create": Operation(create_reading, 201, "reading", ReadingCreate, response=ReadingResponse, pooled=True),
+    "reading.delete": Operation(delete_reading, 204, target_arg="reading_id", pooled=True),
+}
+
+
+async def _apply(db: AsyncSession, user: User, operation: SyncOperation) -> SyncResult:
+    """Run one queued write through its REST route; the receipt commits with it"""
+    spec = OPERATIONS.get(operation.op)
+    if spec is None:
+        return SyncResult(id=operation.id, status=400, detail=f"Unknown operation: {operation.op}")
+
+    receipt = await db.get(SyncReceipt, operation.id)
+    if receipt is not None:
+        return SyncResult(id=operation.id, status=receipt.status, detail="Already applied")
+
+    kwargs: dict[str, Any] = {"current_user": user, "db": db}
+    try:
+        if spec.pooled:
+            kwargs["current_pool"] = await get_current_pool(pool_id=operation.pool_id, current_user=user, db=db)
+        if spec.target_arg:
+            if operation.target is None:
+                raise HTTPException(status_code=400, detail="Operation needs a target id")
+            kwargs[spec.target_arg] = operation.target
+        if spec.body_arg:
+            kwargs[spec.body_arg] = spec.body_schema.model_validate(operation.data)
+        db.add(SyncReceipt(op_id=operation.id, user_id=user.id, status=spec.status))
+        result = await spec.handler(**kwargs)
+    except HTTPException as e:
+        await db.rollback()
+        return SyncResult(id=operation.id, status=e.status_code, detail=str(e.detail))
+    except ValidationError as e:
+        await db.rollback()
+        detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+        return SyncResult(id=operation.id, status=422, detail=detail)
+    except IntegrityError:
+        # Most likely the same batch replayed concurrently (e.g. from two tabs)
+        await db.rollback()
+        if await db.get(SyncReceipt, operation.id) is not None:
+            return SyncResult(id=operation.id, status=spec.status, detail="Already applied")
+        return SyncResult(id=operation.id, status=409, detail="Conflicts with existing data")
+
+    row = None
+    if spec.response is not None and result is not None:
+        row = spec.response.model_validate(result).model_dump(mode="json")
+    return SyncResult(id=operation.id, status=spec.status, row=row)
+
+
+@router.post("/", response_model=SyncPushResponse)
+async def push(
+    batch: SyncPush,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply writes queued by an offline client, in order, each in its own transaction"""
+    results = [await _apply(db, current_user, operation) for operation in batch.operations]
+    return SyncPushResponse(results=results)
@@ -7,13 +7,16 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from math import ceil
 
-from app.database import get_db
-from app.models import User, MaintenanceTask, TaskCompletionHistory
+from app.database import get_db, get_read_db
+from app.models import User, Pool, MaintenanceTask, TaskCompletionHistory
 from app.schemas import (
     TaskCreate, TaskUpdate, TaskComplete, TaskResponse,
-    PaginatedTaskCompletionHistoryResponse
+    TaskCompletionHistoryResponse, PaginatedTaskCompletionHistoryResponse
 )
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_pool
+from app.cache import cached
+from app.rows import schema_columns, fetch_rows, select_rows
+from app.services.archive import load_archived, merge_archived, drop_archive
 from app.config import settings
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -26,23 +29,26 @@ def get_today_in_timezone() -> date:
 
 
 @router.get("/", response_model=List[TaskResponse])
+@cached("maintenance_tasks")
 async def list_tasks(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_pool: Pool = Depends(get_current_pool),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all tasks for current user"""
-    result = await db.execute(
-        select(MaintenanceTask)
-        .where(MaintenanceTask.user_id == current_user.id)
+    """List all tasks in the pool"""
+    return await fetch_rows(
+        db,
+        select(*schema_columns(MaintenanceTask, TaskResponse))
+        .where(MaintenanceTask.pool_id == current_pool.id)
         .order_by(MaintenanceTask.next_due_date)
     )
-    return result.scalars().all()
 
 
 @router.post("/", response_model=TaskResponse, status_code=201)
 async def create_task(
     task: TaskCreate,
     current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new maintenance task"""
@@ -52,7 +58,8 @@ async def create_task(
     db_task = MaintenanceTask(
         **task.model_dump(exclude={"next_due_date"}),
         next_due_date=next_due,
-        user_id=current_user.id
+        user_id=current_user.id,
+        pool_id=current_pool.id
     )
     db.add(db_task)
     await db.commit()
@@ -64,13 +71,14 @@ async def create_task(
 async def get_task(
     task_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_pool: Pool = Depends(get_current_pool),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific task"""
     result = await db.execute(
         select(MaintenanceTask)
         .where(MaintenanceTask.id == task_id)
-        .where(MaintenanceTask.user_id == current_user.id)
+        .where(MaintenanceTask.pool_id == current_pool.id)
     )
     task = result.scalar_one_or_none()
     if not task:
@@ -83,13 +91,14 @@ async def update_task(
     task_id: UUID,
     task_update: TaskUpdate,
     current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
     db: AsyncSession = Depends(get_db)
 ):
     """Update a task"""
     result = await db.execute(
         select(MaintenanceTask)
         .where(MaintenanceTask.id == task_id)
-        .where(MaintenanceTask.user_id == current_user.id)
+        .where(MaintenanceTask.pool_id == current_pool.id)
     )
     db_task = result.scalar_one_or_none()
     if not db_task:
@@ -108,28 +117,29 @@ async def complete_task(
     task_id: UUID,
     completion: TaskComplete,
     current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark a task as complete"""
     result = await db.execute(
         select(MaintenanceTask)
         .where(MaintenanceTask.id == task_id)
-        .where(MaintenanceTask.user_id == current_user.id)
+        .where(MaintenanceTask.pool_id == current_pool.id)
     )
     db_task = result.scalar_one_or_none()
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
 
     # Update completion info using configured timezone
-    today = get_today_in_timezone()
-    db_task.last_completed_date = today
+    completed = completion.completed_date or get_today_in_timezone()
+    db_task.last_completed_date = completed
     db_task.last_completion_notes = completion.notes
-    db_task.next_due_date = today + timedelta(days=db_task.frequency_days)
+    db_task.next_due_date = completed + timedelta(days=db_task.frequency_days)
 
     # Create completion history record
     history_entry = TaskCompletionHistory(
         task_id=task_id,
-        completed_date=today,
+        completed_date=completed,
         notes=completion.notes
     )
     db.add(history_entry)
@@ -140,24 +150,45 @@ async def complete_task(
 
 
 @router.get("/{task_id}/history", response_model=PaginatedTaskCompletionHistoryResponse)
+@cached("maintenance_tasks", "task_completion_history")
 async def get_task_completion_history(
     task_id: UUID,
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(15, ge=1, le=100, description="Items per page"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_pool: Pool = Depends(get_current_pool),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get paginated completion history for a task"""
-    # Verify task exists and belongs to current user
+    # Verify task exists and belongs to the pool
     result = await db.execute(
         select(MaintenanceTask)
         .where(MaintenanceTask.id == task_id)
-        .where(MaintenanceTask.user_id == current_user.id)
+        .where(MaintenanceTask.pool_id == current_pool.id)
     )
     task = result.scalar_one_or_none()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
+    # Older months may have moved to the archive; page through both together
+    archived = await load_archived("history", task.user_id, task.pool_id, task_id)
+    if archived:
+        hot = await select_rows(
+            db,
+            select(*schema_columns(TaskCompletionHistory, TaskCompletionHistoryResponse))
+            .where(TaskCompletionHistory.task_id == task_id)
+        )
+        entries = merge_archived(archived, hot)
+        entries.sort(key=lambda entry: entry["completed_date"], reverse=True)
+        offset = (page - 1) * page_size
+        return PaginatedTaskCompletionHistoryResponse(
+            items=entries[offset:offset + page_size],
+            total=len(entries),
+            page=page,
+            page_size=page_size,
+            total_pages=ceil(len(entries) / page_size)
+        )
+
     # Get total count
     count_result = await db.execute(
         select(func.count(TaskCompletionHistory.id))
@@ -192,13 +223,14 @@ async def get_task_completion_history(
 async def delete_task(
     task_id: UUID,
     current_user: User = Depends(get_current_user),
+    current_pool: Pool = Depends(get_current_pool),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a task"""
     result = await db.execute(
         select(MaintenanceTask)
         .where(MaintenanceTask.id == task_id)
-        .where(MaintenanceTask.user_id == current_user.id)
+        .where(MaintenanceTask.pool_id == current_pool.id)
     )
     task = result.scalar_one_or_none()
     if not task:
@@ -206,4 +238,5 @@ async def delete_task(
     
     await db.delete(task)
     await db.commit()
+    await drop_archive(task.user_id, task.pool_id, "history", task.id)
     return None
@@ -0,0 +1,153 @@
+"""
+Static asset pipeline.
+
+`python -m app.assets` minifies and content-hashes the frontend assets into
+STATIC_BUILD_DIR, rewrites index.html to the fingerprinted names and writes
+.br/.gz variants next to every text file. PrecompressedStaticFiles serves
+that directory, picking the best precompressed variant for the client and
+marking fingerprinted files as immutable.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+from pathlib import Path
+
+import brotli
+import rcssmin
+import rjsmin
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from app.config import settings
+
+SOURCE_DIR = Path("static")
+
+# Fingerprinted assets and their minifier (None = copy as-is)
+ASSETS = {
+    "js/app.js": rjsmin.jsmin,
+    "css/styles.css": rcssmin.cssmin,
+    "pool-icon.png": None,
+}
+
+# Minified but keep their name (the service worker URL must be stable)
+UNHASHED_ASSETS = {
+    "sw.js": rjsmin.jsmin,
+}
+
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".css", ".json", ".svg"}
+
+# Matches the ".<hash>." segment written by build_assets
+FINGERPRINT = re.compile(r"\.[0-9a-f]{10}\.\w+$")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def _fingerprint(rel_path: str, data: bytes) -> str:
+    path = Path(rel_path)
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+
+def _precompress(path: Path) -> None:
+    data = path.read_bytes()
+    path.with_name(path.name + ".br").write_bytes(brotli.compress(data, quality=11))
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def build_assets(source: Path = SOURCE_DIR, output: Path = None) -> dict:
+    """Build fingerprinted, precompressed assets; returns the source -> hashed manifest"""
+    output = Path(output or settings.STATIC_BUILD_DIR)
+    if output.exists():
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+
+    manifest = {}
+    for rel_path, minify in ASSETS.items():
+        data = (source / rel_path).read_bytes()
+        if minify:
+            data = minify(data.decode("utf-8")).encode("utf-8")
+        hashed = _fingerprint(rel_path, data)
+        (output / hashed).parent.mkdir(parents=True, exist_ok=True)
+        (output / hashed).write_bytes(data)
+        manifest[rel_path] = hashed
+
+    for rel_path, minify in UNHASHED_ASSETS.items():
+        data = minify((source / rel_path).read_text(encoding="utf-8"))
+        (output / rel_path).write_text(data, encoding="utf-8")
+
+    # Point index.html at the hashed names (dropping any ?v= cache busters)
+    html = (source / "index.html").read_text(encoding="utf-8")
+    for rel_path, hashed in manifest.items():
+        html = re.sub(
+            rf"(['\"]\./){re.escape(rel_path)}(\?[^'\"]*)?(['\"])",
+            rf"\g<1>{hashed}\g<3>",
+            html
+        )
+    (output / "index.html").write_text(html, encoding="utf-8")
+    (output / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    for path in output.rglob("*"):
+        if path.is_file() and path.suffix in COMPRESSIBLE_SUFFIXES:
+            _precompress(path)
+
+    return manifest
+
+
+def static_directory() -> str:
+    """Serve the built assets when present, otherwise the raw sources"""
+    if os.path.isfile(os.path.join(settings.STATIC_BUILD_DIR, "index.html")):
+        return settings.STATIC_BUILD_DIR
+    return str(SOURCE_DIR)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves .br/.gz variants and caches fingerprinted files forever"""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        accepted = {
+            token.split(";")[0].strip()
+            for token in request_headers.get("accept-encoding", "").split(",")
+        }
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+
+        response = None
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            response = FileResponse(
+                f"{full_path}{suffix}",
+                status_code=status_code,
+                stat_result=variant_stat,
+                media_type=media_type
+            )
+            response.headers["Content-Encoding"] = encoding
+            break
+
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+
+        response.headers["Vary"] = "Accept-Encoding"
+        if FINGERPRINT.search(str(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+if __name__ == "__main__":
+    for source_path, hashed_path in build_assets().items():
+        print(f"✓ {source_path} -> {hashed_path}")
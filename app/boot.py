@@ -0,0 +1,103 @@
+"""
+Container boot helpers.
+
+`python -m app.boot` waits for the database, compares the stored
+alembic_version with the script head in a single query and only runs
+`alembic upgrade head` when they differ. It deliberately avoids importing
+the models so the already-at-head path stays fast.
+"""
+import asyncio
+import os
+import sys
+import time
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import pool, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database import database_url  # noqa: F401 (creates the SQLite data directory)
+
+# Set by entrypoint.sh; falls back to interpreter start for local runs
+BOOT_STARTED_AT = float(os.environ.get("BOOT_STARTED_AT") or time.time())
+
+
+def seconds_since_boot() -> float:
+    return time.time() - BOOT_STARTED_AT
+
+
+async def fetch_current_revision(timeout: float) -> Optional[str]:
+    """Wait for the database and return its alembic revision (None if unversioned)"""
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    try:
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    try:
+                        result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+                        return result.scalar_one_or_none()
+                    except DBAPIError:
+                        # No alembic_version table yet: fresh database
+                        return None
+            except (DBAPIError, OSError) as e:
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"Database not reachable after {timeout:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 1.0)
+    finally:
+        await engine.dispose()
+
+
+def migrate_if_needed(config_path: str = "alembic.ini") -> bool:
+    """Run migrations only when the database is behind; returns True if they ran"""
+    config = Config(config_path)
+    head = ScriptDirectory.from_config(config).get_current_head()
+    current = asyncio.run(fetch_current_revision(settings.DB_WAIT_TIMEOUT))
+    print(f"✓ Database reachable after {seconds_since_boot():.2f}s")
+
+    if current == head:
+        print(f"✓ Schema already at head ({head}), skipping migrations")
+        return False
+
+    print(f"Running database migrations ({current or 'empty'} -> {head})...")
+    command.upgrade(config, "head")
+    return True
+
+
+class ColdStartTimer:
+    """ASGI middleware reporting the time from container boot to the first successful response"""
+
+    def __init__(self, app):
+        self.app = app
+        self.reported = False
+
+    async def __call__(self, scope, receive, send):
+        if self.reported or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if (
+                not self.reported
+                and message["type"] == "http.response.start"
+                and message["status"] < 400
+            ):
+                self.reported = True
+                print(f"✓ First successful request served {seconds_since_boot():.2f}s after boot")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+if __name__ == "__main__":
+    try:
+        migrate_if_needed()
+    except RuntimeError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
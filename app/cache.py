@@ -0,0 +1,346 @@
+"""
+Per-user response cache for read routes.
+
+`@cached("maintenance_tasks", ...)` stores the serialized JSON of a GET route
+keyed by (user, route, path/query params, local date) and tags the entry
+with the tables it was built from. Committed writes reported by the change
+feed (app.changefeed) drop every entry tagged with the touched tables for
+that user (or for everyone, for tables without a user_id), so mutation
+routes invalidate without any extra calls, in every worker.
+
+Entries live in an in-process LRU; with CACHE_REDIS_URL set they are also
+shared through Redis so workers can serve each other's fills. Fills read
+from a replica aren't stored for REPLICA_STICKY_SECONDS after one of their
+tags is invalidated, so a lagging replica can't put pre-write data back
+in front of the writer.
+"""
+import asyncio
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, FrozenSet, Iterable, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlencode
+from zoneinfo import ZoneInfo
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app import changefeed
+from app.changefeed import COMMITTED_CHANGES, Change
+from app.config import settings
+from app.rows import RowsResponse
+
+class MemoryBackend:
+    """Bounded LRU of serialized responses with a tag -> keys index"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()  # key -> (expires_at, tags, body)
+        self.tag_index: Dict[str, Set[str]] = {}
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._drop(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry[2]
+
+    def set(self, key: str, body: bytes, tags: Iterable[str], ttl: int) -> None:
+        self._drop(key)
+        tags = tuple(tags)
+        self.entries[key] = (time.monotonic() + ttl, tags, body)
+        for tag in tags:
+            self.tag_index.setdefault(tag, set()).add(key)
+        while len(self.entries) > self.max_entries:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        dropped = 0
+        for tag in tags:
+            for key in self.tag_index.pop(tag, ()):
+                dropped += self._drop(key)
+        return dropped
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.tag_index.clear()
+
+    def _drop(self, key: str) -> int:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return 0
+        for tag in entry[1]:
+            keys = self.tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_index[tag]
+        return 1
+
+
+class RedisBackend:
+    """Shared cache in Redis; tags are sets of keys, entries expire by TTL"""
+
+    def __init__(self, url: str, prefix: str = "pm:cache:"):
+        import redis.asyncio as redis  # Only needed when CACHE_REDIS_URL is set
+
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, body: bytes, tags: Iterable[str], ttl: int) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self.prefix + key, body, ex=ttl)
+            for tag in tags:
+                pipe.sadd(f"{self.prefix}tag:{tag}", key)
+                pipe.expire(f"{self.prefix}tag:{tag}", ttl)
+            await pipe.execute()
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            keys = await self.client.smembers(tag_key)
+            await self.client.delete(tag_key, *(self.prefix + k.decode() for k in keys))
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(key)
+
+
+class Flight(NamedTuple):
+    future: asyncio.Future
+    tags: FrozenSet[str]
+
+
+class ResponseCache:
+    """In-process LRU in front of an optional shared backend, with hit/miss counters"""
+
+    def __init__(self, max_entries: int, ttl: int, shared: Optional[RedisBackend] = None, replica_lag: float = 0):
+        self.local = MemoryBackend(max_entries)
+        self.shared = shared
+        self.ttl = ttl
+        self.replica_lag = replica_lag  # How far behind the primary a replica read may be
+        self.inflight: Dict[Tuple[str, bool], Flight] = {}  # (key, from replica) -> flight
+        self.invalidated_at: Dict[str, float] = {}  # tag -> when it was last invalidated
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        body = self.local.get(key)
+        if body is None and self.shared is not None:
+            # Not copied into the local LRU: its tags live in Redis only
+            body = await self.shared.get(key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    async def set(self, key: str, body: bytes, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        self.local.set(key, body, tags, self.ttl)
+        if self.shared is not None:
+            await self.shared.set(key, body, tags, self.ttl)
+
+    async def fill(self, key: str, tags: Iterable[str], compute: Callable[[], Awaitable[bytes]], replica: bool = False):
+        """
+        Compute a missing entry once for every concurrent caller (single flight).
+        Returns (body, coalesced). A flight whose tags are invalidated while it
+        runs is detached: later callers start a fresh one and its result isn't stored.
+        A body read from the replica isn't stored either while one of its tags was
+        invalidated within the replica lag: it may predate that write.
+        """
+        flight_key = (key, replica)  # Primary readers never wait on a replica read
+        flight = self.inflight.get(flight_key)
+        if flight is not None:
+            try:
+                body = await asyncio.shield(flight.future)
+            except asyncio.CancelledError:
+                if not flight.future.cancelled():
+                    raise
+                # The leading request was cancelled (client went away); take over
+                return await self.fill(key, tags, compute, replica)
+            self.coalesced += 1
+            return body, True
+
+        flight = Flight(asyncio.get_running_loop().create_future(), frozenset(tags))
+        # Exceptions are re-raised by the leader; don't warn when nobody else awaited them
+        flight.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.inflight[flight_key] = flight
+        try:
+            body = await compute()
+        except Exception as e:
+            flight.future.set_exception(e)
+            raise
+        except BaseException:
+            flight.future.cancel()
+            raise
+        finally:
+            if self.inflight.get(flight_key) is flight:
+                del self.inflight[flight_key]
+                current = True
+            else:
+                current = False
+
+        flight.future.set_result(body)
+        if current and isinstance(body, bytes) and not (replica and self._recently_invalidated(flight.tags)):
+            await self.set(key, body, flight.tags)
+        return body, False
+
+    def _recently_invalidated(self, tags: Iterable[str]) -> bool:
+        cutoff = time.monotonic() - self.replica_lag
+        return any(self.invalidated_at.get(tag, cutoff) > cutoff for tag in tags)
+
+    def invalidate_local(self, tags: Iterable[str]) -> None:
+        tags = set(tags)
+        self.invalidations += self.local.invalidate(tags)
+        for key, flight in list(self.inflight.items()):
+            if flight.tags & tags:
+                del self.inflight[key]
+        if self.replica_lag > 0:
+            now = time.monotonic()
+            if len(self.invalidated_at) > self.local.max_entries:
+                self.invalidated_at = {
+                    tag: at for tag, at in self.invalidated_at.items() if at > now - self.replica_lag
+                }
+            self.invalidated_at.update(dict.fromkeys(tags, now))
+
+    def clear_local(self) -> None:
+        self.local.clear()
+        self.inflight.clear()
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        self.invalidate_local(tags)
+        if self.shared is not None:
+            await self.shared.invalidate(tags)
+
+    async def clear(self) -> None:
+        self.clear_local()
+        if self.shared is not None:
+            await self.shared.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.CACHE_ENABLED,
+            "backend": "memory+redis" if self.shared is not None else "memory",
+            "entries": len(self.local.entries),
+            "max_entries": self.local.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self.inflight),
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.local.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+response_cache = ResponseCache(
+    settings.CACHE_MAX_ENTRIES,
+    settings.CACHE_TTL_SECONDS,
+    RedisBackend(settings.CACHE_REDIS_URL) if settings.CACHE_REDIS_URL else None,
+    settings.REPLICA_STICKY_SECONDS if settings.DATABASE_REPLICA_URL else 0
+)
+
+
+def user_tag(user_id, table: str) -> str:
+    return f"{user_id}:{table}"
+
+
+def _tag_for(change: Change) -> str:
+    return user_tag(change.user_id, change.table) if change.user_id is not None else change.table
+
+
+def _invalidate_changes(changes: Iterable[Change]) -> None:
+    response_cache.invalidate_local({_tag_for(change) for change in changes})
+
+
+changefeed.register(_invalidate_changes, response_cache.clear_local)
+
+
+async def publish_invalidations(session) -> None:
+    """Clear committed changes from the shared backend (call after commit)"""
+    changes = session.info.pop(COMMITTED_CHANGES, None)
+    if changes and response_cache.shared is not None:
+        await response_cache.shared.invalidate({_tag_for(change) for change in changes})
+
+
+def _cache_key(request: Request, user_id) -> str:
+    route = request.scope["route"]
+    params = sorted({**request.path_params, **request.query_params}.items())
+    # Date-relative routes (due tasks, "last N days") roll over at local midnight
+    today = datetime.now(ZoneInfo(settings.TIMEZONE)).date()
+    return f"{user_id}:{route.path}?{urlencode(params)}@{today.isoformat()}"
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def cached(*tables: str):
+    """
+    Cache a GET route per user, tagged by the tables it reads.
+    The route must depend on `current_user`; `request` is injected if not declared.
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+        inject_request = "request" not in signature.parameters
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            request = kwargs.pop("request") if inject_request else kwargs["request"]
+
+            async def compute():
+                result = await endpoint(**kwargs)
+                if isinstance(result, RowsResponse):
+                    return result.body  # Already the response model's JSON
+                if isinstance(result, Response):
+                    return result
+                route = request.scope["route"]
+                adapter = _adapter(route.response_model)
+                return adapter.dump_json(
+                    adapter.validate_python(result, from_attributes=True),
+                    exclude_unset=route.response_model_exclude_unset
+                )
+
+            if not settings.CACHE_ENABLED:
+                # Encoded the same way as a fill, skipping FastAPI's response_model pass
+                body = await compute()
+                return body if isinstance(body, Response) else Response(body, media_type="application/json")
+
+            user_id = kwargs["current_user"].id
+            key = _cache_key(request, user_id)
+            body = await response_cache.get(key)
+            if body is not None:
+                return Response(body, media_type="application/json", headers={"X-Cache": "hit"})
+
+            # Identical concurrent misses share one computation
+            from app.database import reads_from_replica  # app.database imports this module
+            tags = [user_tag(user_id, t) for t in tables] + list(tables)
+            body, coalesced = await response_cache.fill(key, tags, compute, reads_from_replica(request))
+            if isinstance(body, Response):
+                return body
+            status = "coalesced" if coalesced else "miss"
+            return Response(body, media_type="application/json", headers={"X-Cache": status})
+
+        if inject_request:
+            wrapper.__signature__ = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ])
+        return wrapper
+
+    return decorator
@@ -0,0 +1,194 @@
+"""
+Change feed shared by every worker.
+
+Session events record (table, user_id, id) for each row a transaction
+writes. Local handlers (response cache, user lookup) are called as soon as
+the transaction commits. On PostgreSQL the same changes are also sent with
+pg_notify inside the transaction, so they are delivered exactly when it
+commits and dropped on rollback. Each worker holds one asyncpg LISTEN
+connection (ChangeListener, started in lifespan) that forwards other
+workers' changes to the same handlers. If that connection drops, the
+listener reconnects with backoff and flushes every local cache, because
+notifications sent while it was away are lost.
+"""
+import asyncio
+import json
+import uuid
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+CHANNEL = "pool_changes"
+ORIGIN = uuid.uuid4().hex  # Identifies this worker's own notifications
+NOTIFY_BATCH = 50  # Changes per notification (payloads are capped at 8000 bytes)
+
+PENDING_CHANGES = "changefeed_pending"  # session.info key: changes flushed in the open transaction
+COMMITTED_CHANGES = "changefeed_committed"  # session.info key: changes committed, for async follow-up
+
+
+class Change(NamedTuple):
+    table: str
+    user_id: Optional[str] = None
+    id: Optional[str] = None
+
+
+_change_handlers: List[Callable[[Iterable[Change]], None]] = []
+_flush_handlers: List[Callable[[], None]] = []
+
+
+def register(on_change: Callable[[Iterable[Change]], None], on_flush: Callable[[], None]) -> None:
+    """Register a local cache: `on_change` gets committed changes, `on_flush` drops everything"""
+    _change_handlers.append(on_change)
+    _flush_handlers.append(on_flush)
+
+
+def dispatch(changes: Iterable[Change]) -> None:
+    changes = list(changes)
+    for handler in _change_handlers:
+        handler(changes)
+
+
+def flush_all() -> None:
+    for handler in _flush_handlers:
+        handler()
+
+
+def record_change(session: Session, table: str, user_id=None, id=None) -> None:
+    """Record a write the ORM can't see (Core UPDATE/INSERT statements)"""
+    session.info.setdefault(PENDING_CHANGES, set()).add(
+        Change(table, str(user_id) if user_id is not None else None, str(id) if id is not None else None)
+    )
+
+
+def _change_for(instance) -> Optional[Change]:
+    table = getattr(instance, "__tablename__", None)
+    if table is None:
+        return None
+    user_id = getattr(instance, "user_id", None)
+    row_id = getattr(instance, "id", None)
+    return Change(table, str(user_id) if user_id is not None else None, str(row_id) if row_id is not None else None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    pending = session.info.setdefault(PENDING_CHANGES, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        change = _change_for(instance)
+        if change is not None:
+            pending.add(change)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_changes(session):
+    # Flush now so the final flush's changes are included in the notification
+    session.flush()
+    changes = session.info.get(PENDING_CHANGES)
+    if not changes or session.get_bind().dialect.name != "postgresql":
+        return
+    connection = session.connection()
+    changes = sorted(changes, key=lambda c: (c.table, c.user_id or "", c.id or ""))
+    for start in range(0, len(changes), NOTIFY_BATCH):
+        payload = json.dumps({"origin": ORIGIN, "changes": changes[start:start + NOTIFY_BATCH]})
+        connection.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed(session):
+    changes = session.info.pop(PENDING_CHANGES, None)
+    if not changes:
+        return
+    # Local caches go immediately so the next request in this worker can't see stale data
+    dispatch(changes)
+    session.info.setdefault(COMMITTED_CHANGES, set()).update(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(PENDING_CHANGES, None)
+
+
+class ChangeListener:
+    """One LISTEN connection per worker, reconnecting with backoff"""
+
+    keepalive_seconds = 30
+
+    def __init__(self, database_url: str = None):
+        url = make_url(database_url or settings.DATABASE_URL)
+        # asyncpg takes a plain libpq-style DSN
+        self.dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self.connected = False
+        self.received = 0
+        self.reconnects = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+            if message.get("origin") == ORIGIN:
+                return
+            changes = [Change(*change) for change in message["changes"]]
+        except (ValueError, KeyError, TypeError):
+            print(f"⚠ Ignoring malformed change notification: {payload[:200]}")
+            flush_all()
+            return
+        self.received += 1
+        dispatch(changes)
+
+    async def _run(self):
+        import asyncpg
+
+        delay = 1.0
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                if self.reconnects:
+                    print("✓ Change feed reconnected")
+                self.connected = True
+                # Anything published while we weren't listening is lost
+                flush_all()
+                delay = 1.0
+                while not closed.is_set():
+                    try:
+                        await asyncio.wait_for(closed.wait(), timeout=self.keepalive_seconds)
+                    except asyncio.TimeoutError:
+                        await asyncio.wait_for(connection.fetchval("SELECT 1"), timeout=5)
+                raise ConnectionResetError("closed by server")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠ Change feed connection lost ({e}); retrying in {delay:.0f}s")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+
+            flush_all()
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    def stats(self) -> dict:
+        return {"connected": self.connected, "received": self.received, "reconnects": self.reconnects}
+
+
+listener = ChangeListener()
@@ -8,6 +8,16 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = "poolpass"
     DB_NAME: str = "pooldb"
     DATABASE_URL: str = "postgresql+asyncpg://pooluser:poolpass@db:5432/pooldb"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_WARM_SIZE: int = 2  # Connections opened and primed at startup
+    DB_WAIT_TIMEOUT: int = 60  # Seconds to wait for the database at boot
+    DATABASE_REPLICA_URL: str = ""  # Optional read replica for GET routes
+    REPLICA_STICKY_SECONDS: int = 5  # Read from the primary this long after a write (0 = off)
+
+    # SQLite mode (DATABASE_URL=sqlite+aiosqlite:///./data/pool.db)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 8192
     
     # Application
     SECRET_KEY: str = "change-this-to-a-random-secret-key"
@@ -25,6 +35,55 @@ class Settings(BaseSettings):
     # Scheduler
     SCHEDULER_ENABLED: bool = True
 
+    # Response compression
+    COMPRESSION_MINIMUM_SIZE: int = 500  # Bytes; smaller responses are sent as-is
+    COMPRESSION_QUALITY: int = 4  # Brotli quality (0-11)
+
+    # Response cache (per-user, invalidated on commit)
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 1024  # In-process LRU size per worker
+    CACHE_TTL_SECONDS: int = 300  # Upper bound on staleness from writes outside the app
+    CACHE_REDIS_URL: str = ""  # Optional shared backend, e.g. redis://redis:6379/0
+    CHANGEFEED_ENABLED: bool = True  # LISTEN/NOTIFY invalidation across workers (PostgreSQL only)
+
+    # Delta sync (GET /sync/)
+    SYNC_OVERLAP_SECONDS: int = 10  # Tokens trail the clock by this much to catch in-flight commits
+    SYNC_TOMBSTONE_DAYS: int = 90  # Deleted-row records kept; older tokens get a full snapshot
+
+    # Inventory forecasting
+    INVENTORY_USAGE_DAYS: int = 30  # Usage window for the daily rate behind "runs out in N days"
+
+    # Sensor ingestion (POST /ingest/samples)
+    INGEST_BUFFER_ROWS: int = 200000  # Samples held per worker before senders are made to wait
+    INGEST_BATCH_ROWS: int = 5000  # Rows per multi-row INSERT (COPY on PostgreSQL)
+    INGEST_FLUSH_MS: int = 250  # A partial batch is written after this long
+    INGEST_WAIT_SECONDS: float = 5.0  # How long a full buffer holds a request before answering 503
+
+    # Background jobs (POST /jobs/)
+    JOB_WORKERS: int = 2  # Jobs run concurrently per process (0 = don't run jobs here)
+    JOB_POLL_SECONDS: float = 2.0  # How often idle workers look for queued jobs
+    JOB_TIMEOUT_SECONDS: int = 900  # A job running longer than this fails
+    JOB_STALE_SECONDS: int = 120  # A running job without a heartbeat this long lost its worker and is requeued
+    JOB_MAX_ATTEMPTS: int = 3  # Requeues after lost workers before a job fails
+    JOB_MAX_QUEUED: int = 20  # Unfinished jobs per user before submissions get 429
+    JOB_RETENTION_DAYS: int = 7  # Finished jobs are kept this long
+
+    # Admission control (API requests other than probes, static files, /events and /ingest)
+    RATE_LIMIT_PER_SECOND: float = 20.0  # Sustained requests per client (0 = no rate limit)
+    RATE_LIMIT_BURST: int = 60  # Requests a client can make back to back before it is limited
+    TRUSTED_PROXIES: str = ""  # Comma-separated proxy addresses/CIDRs whose X-Forwarded-For names the client
+    DB_CONCURRENCY: int = 0  # Pooled connections admitted requests may hold per process (0 = DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    DB_QUEUE_SIZE: int = 100  # Requests waiting for a slot before new ones get 503
+    DB_QUEUE_TIMEOUT_SECONDS: float = 10.0  # Longest wait for a slot before answering 503
+
+    # Retention (readings and task history older than this move to archive files)
+    ARCHIVE_AFTER_DAYS: int = 0  # Whole months older than this are archived (0 = keep everything in the database)
+    ARCHIVE_DIR: str = "data/archive"  # Shared by every worker
+    ARCHIVE_BATCH_ROWS: int = 5000  # Rows deleted per transaction when archiving
+
+    # Static assets (built by `python -m app.assets`)
+    STATIC_BUILD_DIR: str = "build/static"
+
     # Timezone
     TIMEZONE: str = "America/New_York"  # Default to Eastern Time
 
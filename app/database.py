@@ -1,29 +1,140 @@
+import asyncio
+import os
+import time
+from contextlib import nullcontext
+from fastapi import Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
+from app.cache import publish_invalidations
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True
-)
+def _create_engine(url: str):
+    # aiosqlite defaults to NullPool; keep connections and their page cache around instead
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    created = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        future=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        **({"poolclass": AsyncAdaptedQueuePool} if is_sqlite else {})
+    )
+    if is_sqlite:
+        event.listen(created.sync_engine, "connect", _configure_sqlite)
+    return created
 
-# Create session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Per-connection pragmas tuned for a small single-node deployment"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, far fewer fsyncs
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+# SQLite allows a single writer; queue writers in-process instead of
+# letting them collide on the database lock
+_sqlite_writer_lock = asyncio.Lock()
+
+
+def writer_lock():
+    """Async context manager serializing writes on SQLite (no-op elsewhere)"""
+    return _sqlite_writer_lock if IS_SQLITE else nullcontext()
+
+# Session factories; bound to the engines by configure_engines below
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+ReplicaSessionLocal = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+engine = None
+replica_engine = None  # Optional read replica for GET traffic
+
+
+def configure_engines(url: str, replica_url: str = "") -> None:
+    """Create the engines and bind the session factories to them (tests rebind per backend)"""
+    global database_url, IS_SQLITE, engine, replica_engine
+    database_url = make_url(url)
+    IS_SQLITE = database_url.get_backend_name() == "sqlite"
+    if IS_SQLITE and database_url.database and database_url.database != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(database_url.database)), exist_ok=True)
+
+    engine = _create_engine(url)
+    replica_engine = _create_engine(replica_url) if replica_url else None
+    AsyncSessionLocal.configure(bind=engine)
+    ReplicaSessionLocal.configure(bind=replica_engine or engine)
+
+
+configure_engines(settings.DATABASE_URL, settings.DATABASE_REPLICA_URL)
+
+# Cookie pinning a client to the primary for a short window after it writes
+PRIMARY_STICKY_COOKIE = "pm_primary_until"
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
 
 # Base class for models
 Base = declarative_base()
 
 
+def read_session_factory(request: Request):
+    """Session factory for reads: the replica unless the caller needs its own writes"""
+    if replica_engine is None or request.method not in READ_METHODS:
+        return AsyncSessionLocal
+    try:
+        sticky_until = float(request.cookies.get(PRIMARY_STICKY_COOKIE, 0))
+    except ValueError:
+        sticky_until = 0
+    return AsyncSessionLocal if sticky_until > time.time() else ReplicaSessionLocal
+
+
+def reads_from_replica(request: Request) -> bool:
+    return read_session_factory(request) is ReplicaSessionLocal
+
+
 # Dependency for routes
-async def get_db():
-    async with AsyncSessionLocal() as session:
+async def get_db(request: Request, response: Response):
+    if request.method in READ_METHODS:
+        lock = nullcontext()
+    else:
+        # Mutating requests wait their turn for the SQLite writer, and pin
+        # the caller's next reads to the primary (read-your-writes)
+        lock = writer_lock()
+        if replica_engine is not None and settings.REPLICA_STICKY_SECONDS > 0:
+            response.set_cookie(
+                PRIMARY_STICKY_COOKIE,
+                str(time.time() + settings.REPLICA_STICKY_SECONDS),
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="lax"
+            )
+    async with lock:
+        async with AsyncSessionLocal() as session:
+            try:
+                yield session
+            finally:
+                await publish_invalidations(session)
+                await session.close()
+
+
+# Dependency for read-only routes
+async def get_read_db(request: Request):
+    async with read_session_factory(request)() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def warm_pool(size: int, statements=()) -> None:
+    """Open `size` pooled connections up front and run hot statements on each"""
+    async def _prime():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            for statement in statements:
+                await conn.execute(statement)
+
+    # Connect concurrently so each task checks out a distinct connection
+    await asyncio.gather(*(_prime() for _ in range(min(size, settings.DB_POOL_SIZE))))
@@ -1,18 +1,44 @@
-from fastapi import Depends, HTTPException
+from typing import Dict, Optional
+from uuid import UUID
+from fastapi import Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import User
+from app import changefeed
+from app.database import get_read_db
+from app.models import User, Pool
 from app.config import settings
 
+# Resolved once per process so cached responses can be served without a query
+_current_user = None
+_pools: Dict[UUID, Dict[UUID, Pool]] = {}  # user id -> {pool id: pool}, oldest first
 
-async def get_current_user(db: AsyncSession = Depends(get_db)) -> User:
+
+def _forget_user(changes=()):
+    global _current_user
+    if not changes or any(change.table == "users" for change in changes):
+        _current_user = None
+
+
+def _forget_pools(changes=()):
+    if not changes or any(change.table in ("users", "pools") for change in changes):
+        _pools.clear()
+
+
+changefeed.register(_forget_user, _forget_user)
+changefeed.register(_forget_pools, _forget_pools)
+
+
+async def get_current_user(db: AsyncSession = Depends(get_read_db)) -> User:
     """
     Get the current user. 
     For now, returns the default user from settings.
     In production, this would validate a JWT token.
     """
+    global _current_user
+    if _current_user is not None:
+        return _current_user
+
     result = await db.execute(
         select(User).where(User.email == settings.DEFAULT_USER_EMAIL)
     )
@@ -24,4 +50,33 @@ async def get_current_user(db: AsyncSession = Depends(get_db)) -> User:
             detail=f"Default user {settings.DEFAULT_USER_EMAIL} not found. Please run migrations."
         )
     
-    return user
\ No newline at end of file
+    _current_user = user
+    return user
+
+
+async def get_current_pool(
+    pool_id: Optional[UUID] = Query(None, description="Pool to work on; defaults to the account's first pool"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> Pool:
+    """The pool a request is scoped to, checked against the current user's pools"""
+    pools = _pools.get(current_user.id)
+    if pools is None:
+        result = await db.execute(
+            select(Pool)
+            .where(Pool.user_id == current_user.id)
+            .order_by(Pool.created_at, Pool.id)
+        )
+        pools = {pool.id: pool for pool in result.scalars()}
+        for pool in pools.values():
+            db.expunge(pool)  # Shared across requests; a rollback in this session mustn't expire them
+        _pools[current_user.id] = pools
+
+    if pool_id is None:
+        if not pools:
+            raise HTTPException(status_code=404, detail="No pools yet. Create one with POST /pools/.")
+        return next(iter(pools.values()))
+    pool = pools.get(pool_id)
+    if pool is None:
+        raise HTTPException(status_code=404, detail="Pool not found")
+    return pool
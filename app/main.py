@@ -1,26 +1,72 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from brotli_asgi import BrotliMiddleware
+from sqlalchemy import select
 
 from app.config import settings
+from app.admission import AdmissionMiddleware
+from app.assets import PrecompressedStaticFiles, static_directory
+from app.boot import ColdStartTimer, seconds_since_boot
+from app.changefeed import listener as changefeed_listener
+from app.database import IS_SQLITE, warm_pool
+from app.models import User, ReadingType
 from app.api.routes import (
     health_router,
+    pools_router,
     inventory_router,
     tasks_router,
     alerts_router,
-    readings_router
+    readings_router,
+    dashboard_router,
+    events_router,
+    sync_router,
+    ingest_router,
+    jobs_router
 )
+from app.services.ingest import ingest_buffer
+from app.services.jobs import job_runner
 from app.services.scheduler import scheduler
 
 
+def hot_statements():
+    """Statements nearly every request runs; primed on each warmed connection"""
+    return [
+        select(User).where(User.email == settings.DEFAULT_USER_EMAIL),
+        select(ReadingType)
+        .where(ReadingType.is_active == True)
+        .order_by(ReadingType.display_order.asc().nullslast(), ReadingType.name),
+    ]
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events"""
     # Startup
+    if settings.DB_POOL_WARM_SIZE > 0:
+        try:
+            await warm_pool(settings.DB_POOL_WARM_SIZE, hot_statements())
+            print(f"✓ Warmed {settings.DB_POOL_WARM_SIZE} database connections")
+        except Exception as e:
+            print(f"⚠ Connection pool warm-up failed: {e}")
+
+    # SQLite runs a single worker, so there is nobody to notify
+    if settings.CHANGEFEED_ENABLED and not IS_SQLITE:
+        changefeed_listener.start()
+        print("✓ Change feed listener started")
+
+    ingest_buffer.start()
+
     if settings.SCHEDULER_ENABLED:
         scheduler.start()
         print("✓ Scheduler started")
+
+    if settings.JOB_WORKERS > 0:
+        job_runner.start()
+        print(f"✓ Job runner started ({settings.JOB_WORKERS} workers)")
+
+    print(f"✓ Startup complete {seconds_since_boot():.2f}s after boot")
     
     yield
     
@@ -29,15 +75,28 @@ async def lifespan(app: FastAPI):
         scheduler.shutdown()
         print("✓ Scheduler stopped")
 
+    # Jobs still running go back on the queue
+    await job_runner.stop()
+
+    await changefeed_listener.stop()
+
+    # Write any sensor samples still buffered
+    await ingest_buffer.stop()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Pool Manager API",
     description="Comprehensive pool maintenance management system",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Admission control: rate limit and DB concurrency limit. Added first, so it
+# runs innermost: CORS answers preflights before it and decorates its 429/503.
+app.add_middleware(AdmissionMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -47,15 +106,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression middleware (brotli when accepted, gzip fallback).
+# Static files are precompressed at build time, and the event stream must
+# be flushed event by event, so both are skipped here.
+app.add_middleware(
+    BrotliMiddleware,
+    quality=settings.COMPRESSION_QUALITY,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_fallback=True,
+    excluded_handlers=[r"^/static/", r"^/events"]
+)
+
+# Report cold-start time on the first successful response
+app.add_middleware(ColdStartTimer)
+
 # Include routers
 app.include_router(health_router)
+app.include_router(pools_router)
 app.include_router(inventory_router)
 app.include_router(tasks_router)
 app.include_router(alerts_router)
 app.include_router(readings_router)
+app.include_router(dashboard_router)
+app.include_router(events_router)
+app.include_router(sync_router)
+app.include_router(ingest_router)
+app.include_router(jobs_router)
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Mount static files (fingerprinted build when available)
+app.mount("/static", PrecompressedStaticFiles(directory=static_directory()), name="static")
 
 
 @app.get("/")
@@ -1,16 +1,27 @@
 from app.models.user import User
-from app.models.inventory import ChemicalInventory
+from app.models.pool import Pool
+from app.models.inventory import ChemicalInventory, InventoryTransaction, InventorySnapshot
 from app.models.task import MaintenanceTask
 from app.models.task_completion_history import TaskCompletionHistory
 from app.models.alert import Alert
 from app.models.reading import ReadingType, Reading
+from app.models.sync import SyncTombstone, SyncReceipt
+from app.models.sensor import SensorSample
+from app.models.job import Job
 
 __all__ = [
     "User",
+    "Pool",
     "ChemicalInventory",
+    "InventoryTransaction",
+    "InventorySnapshot",
     "MaintenanceTask",
     "TaskCompletionHistory",
     "Alert",
     "ReadingType",
     "Reading",
+    "SyncTombstone",
+    "SyncReceipt",
+    "SensorSample",
+    "Job",
 ]
\ No newline at end of file
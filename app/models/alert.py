@@ -1,39 +1,40 @@
 import uuid
-from sqlalchemy import Column, String, Time, Boolean, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+import sqlalchemy as sa
+from sqlalchemy import Column, String, Integer, Time, Boolean, DateTime, ForeignKey, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.ext.hybrid import hybrid_property
 from app.database import Base
 
 
+def mask_days(mask):
+    """Weekdays set in a weekday_mask as a sorted list (0=Sunday)"""
+    return [day for day in range(7) if (mask or 0) & (1 << day)]
+
+
 class Alert(Base):
     __tablename__ = "alerts"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
+    pool_id = Column(Uuid, ForeignKey("pools.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
     cadence = Column(String, nullable=False)  # 'daily' or 'weekly'
-    _days_of_week = Column('days_of_week', String, nullable=True)  # Comma-separated: "0,2,4"
+    weekday_mask = Column(Integer, default=0, server_default="0", nullable=False)  # Bit d set = weekday d (0=Sunday)
     alert_time = Column(Time, nullable=False)
     alert_on_low_inventory = Column(Boolean, default=False, nullable=False)
     alert_on_due_tasks = Column(Boolean, default=False, nullable=False)
     last_sent = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=sa.func.now())  # Maintained by a database trigger
     
     # Relationships
+    pool = relationship("Pool", back_populates="alerts")
     user = relationship("User", back_populates="alerts")
     
-    @hybrid_property
+    @property
     def days_of_week(self):
-        """Convert comma-separated string to list of integers"""
-        if self._days_of_week:
-            return [int(d) for d in self._days_of_week.split(',')]
-        return []
-    
+        """Weekdays in the mask as a sorted list (0=Sunday)"""
+        return mask_days(self.weekday_mask)
+
     @days_of_week.setter
     def days_of_week(self, days_list):
-        """Convert list of integers to comma-separated string"""
-        if days_list:
-            unique_days = sorted(list(set(int(d) for d in days_list)))
-            self._days_of_week = ",".join(map(str, unique_days))
-        else:
-            self._days_of_week = None
+        """Set the mask from a list of weekdays"""
+        self.weekday_mask = sum(1 << day for day in set(int(d) for d in days_list or []))
@@ -1,19 +1,48 @@
 import uuid
-from sqlalchemy import Column, String, Float, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+import sqlalchemy as sa
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Uuid
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from app.database import Base
 
 
 class ChemicalInventory(Base):
     __tablename__ = "chemical_inventory"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False, index=True)
     quantity_on_hand = Column(Float, nullable=False)
     unit = Column(String, nullable=False)
     reorder_threshold = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=sa.func.now())  # Maintained by a database trigger
     
     # Relationships
     user = relationship("User", back_populates="inventory_items")
+
+    @hybrid_property
+    def is_low_stock(self):
+        """At or below the reorder threshold; in SQL, the predicate of ix_chemical_inventory_low_stock"""
+        return self.quantity_on_hand <= self.reorder_threshold
+
+
+class InventoryTransaction(Base):
+    """A change to an item's quantity_on_hand, written by a database trigger"""
+    __tablename__ = "inventory_transactions"
+
+    id = Column(sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True)
+    item_id = Column(Uuid, ForeignKey("chemical_inventory.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Uuid, nullable=False)
+    delta = Column(Float, nullable=False)  # Signed change; the item's creation is its first (positive) delta
+    quantity = Column(Float, nullable=False)  # Balance after the change
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+
+
+class InventorySnapshot(Base):
+    """An item's balance at taken_at, taken daily from the ledger"""
+    __tablename__ = "inventory_snapshots"
+
+    id = Column(sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True)
+    item_id = Column(Uuid, ForeignKey("chemical_inventory.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Float, nullable=False)
+    taken_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,23 @@
+import uuid
+import sqlalchemy as sa
+from sqlalchemy import Column, String, Float, Integer, Text, DateTime, ForeignKey, JSON, Uuid
+from app.database import Base
+
+
+class Job(Base):
+    """A queued unit of background work, claimed and run by app.services.jobs"""
+    __tablename__ = "jobs"
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False)  # A registered handler name, e.g. "export"
+    params = Column(JSON, nullable=False, default=dict)
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded or failed
+    progress = Column(Float, nullable=False, default=0.0)  # 0 to 1, reported by the handler
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Refreshed while running; stale means the worker died
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,21 @@
+import uuid
+import sqlalchemy as sa
+from sqlalchemy import Column, String, DateTime, ForeignKey, Uuid
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class Pool(Base):
+    """A body of water an account maintains; tasks, readings and alerts belong to one"""
+    __tablename__ = "pools"
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+
+    # Relationships (rows go with the pool through ON DELETE CASCADE, without loading them)
+    user = relationship("User", back_populates="pools")
+    tasks = relationship("MaintenanceTask", back_populates="pool", passive_deletes=True)
+    alerts = relationship("Alert", back_populates="pool", passive_deletes=True)
+    readings = relationship("Reading", back_populates="pool", passive_deletes=True)
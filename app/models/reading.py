@@ -1,7 +1,6 @@
 import uuid
 import sqlalchemy as sa
-from sqlalchemy import Column, String, Float, Date, Text, Boolean, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, Date, Text, Boolean, DateTime, ForeignKey, Uuid
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -9,7 +8,7 @@ from app.database import Base
 class ReadingType(Base):
     __tablename__ = "reading_types"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     slug = Column(String, unique=True, nullable=False, index=True)
     name = Column(String, nullable=False)
     unit = Column(String, nullable=True)
@@ -25,14 +24,18 @@ class ReadingType(Base):
 class Reading(Base):
     __tablename__ = "readings"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    reading_type_id = Column(UUID(as_uuid=True), ForeignKey("reading_types.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
+    pool_id = Column(Uuid, ForeignKey("pools.id", ondelete="CASCADE"), nullable=False)
+    reading_type_id = Column(Uuid, ForeignKey("reading_types.id"), nullable=False)
     reading_value = Column(Float, nullable=False)
     reading_date = Column(Date, nullable=False, index=True)
     notes = Column(Text, nullable=True)
+    in_range = Column(Boolean, nullable=True)  # Against the type's low/high (see app.services.ranges); NULL if it has none
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=sa.func.now())  # Maintained by a database trigger
     
     # Relationships
+    pool = relationship("Pool", back_populates="readings")
     user = relationship("User", back_populates="readings")
     reading_type = relationship("ReadingType", back_populates="readings")
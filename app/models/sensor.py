@@ -0,0 +1,15 @@
+import sqlalchemy as sa
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Uuid
+from app.database import Base
+
+
+class SensorSample(Base):
+    """A timestamped probe measurement, written in batches by app.services.ingest"""
+    __tablename__ = "sensor_samples"
+
+    id = Column(sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
+    reading_type_id = Column(Uuid, ForeignKey("reading_types.id"), nullable=False)
+    device = Column(String, nullable=False)  # Probe identifier sent by the client
+    measured_at = Column(DateTime(timezone=True), nullable=False)  # UTC
+    value = Column(Float, nullable=False)
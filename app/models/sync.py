@@ -0,0 +1,24 @@
+import sqlalchemy as sa
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Uuid
+from app.database import Base
+
+
+class SyncTombstone(Base):
+    """A deleted row, written by a database trigger and pruned after SYNC_TOMBSTONE_DAYS"""
+    __tablename__ = "sync_tombstones"
+
+    id = Column(sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True)
+    table_name = Column(String, nullable=False)
+    row_id = Column(Uuid, nullable=False)
+    user_id = Column(Uuid, nullable=True)  # Owner at delete time (the task's owner for history rows)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+
+
+class SyncReceipt(Base):
+    """An applied offline operation, so replaying the same op_id is a no-op"""
+    __tablename__ = "sync_receipts"
+
+    op_id = Column(Uuid, primary_key=True)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
+    status = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=sa.func.now(), index=True)
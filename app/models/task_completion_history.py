@@ -1,7 +1,7 @@
 import uuid
+import sqlalchemy as sa
 from datetime import datetime
-from sqlalchemy import Column, Date, Text, ForeignKey, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Date, Text, ForeignKey, DateTime, Uuid
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -9,11 +9,12 @@ from app.database import Base
 class TaskCompletionHistory(Base):
     __tablename__ = "task_completion_history"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    task_id = Column(UUID(as_uuid=True), ForeignKey("maintenance_tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    task_id = Column(Uuid, ForeignKey("maintenance_tasks.id", ondelete="CASCADE"), nullable=False, index=True)
     completed_date = Column(Date, nullable=False, index=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=sa.func.now())  # Maintained by a database trigger
 
     # Relationships
     task = relationship("MaintenanceTask", back_populates="completion_history")
@@ -1,6 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, Uuid
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -8,12 +7,13 @@ from app.database import Base
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     email = Column(String, unique=True, nullable=False, index=True)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     
     # Relationships
+    pools = relationship("Pool", back_populates="user", cascade="all, delete-orphan", order_by="Pool.created_at")
     inventory_items = relationship("ChemicalInventory", back_populates="user", cascade="all, delete-orphan")
     tasks = relationship("MaintenanceTask", back_populates="user", cascade="all, delete-orphan")
     alerts = relationship("Alert", back_populates="user", cascade="all, delete-orphan")
@@ -0,0 +1,56 @@
+"""
+Column-only reads for list routes.
+
+Loading ORM instances for a read-only list is mostly overhead. Each row
+builds an instance, registers it in the session's identity map and sets
+up its attribute state. The response model then reads every attribute
+back through from_attributes. List routes instead select just the columns
+their response model returns (`schema_columns`). `fetch_rows` runs that
+query as plain Core on the session's connection, bypassing the ORM execution
+layer too, and encodes the rows with orjson in one call. The JSON is the same
+as the response model would produce, and `@cached` stores it as it is.
+"""
+from typing import Iterable, List
+from uuid import UUID
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def schema_columns(model, schema: type[BaseModel]) -> List:
+    """Columns of `model`'s table that `schema` returns, in the schema's field order"""
+    columns = model.__table__.c
+    return [columns[name] for name in schema.model_fields if name in columns]
+
+
+def json_default(value):
+    """orjson `default`: asyncpg returns its own UUID subclass; orjson only encodes uuid.UUID itself"""
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError
+
+
+class RowsResponse(Response):
+    """A JSON array of plain dicts, encoded without building response models"""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        # Pydantic writes UTC datetimes with a Z suffix; match it
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_UTC_Z)
+
+
+async def select_rows(db: AsyncSession, query) -> List[dict]:
+    """Run a column select on the session's connection, as plain dicts"""
+    result = await (await db.connection()).execute(query)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+async def fetch_rows(db: AsyncSession, query, transform=None) -> RowsResponse:
+    """`select_rows`, encoded; `transform(dict)` may reshape each row first"""
+    rows: Iterable[dict] = await select_rows(db, query)
+    if transform is not None:
+        rows = map(transform, rows)
+    return RowsResponse(list(rows))
@@ -1,5 +1,9 @@
 from app.schemas.user import UserCreate, UserResponse
-from app.schemas.inventory import InventoryCreate, InventoryUpdate, InventoryResponse
+from app.schemas.pool import PoolCreate, PoolUpdate, PoolResponse
+from app.schemas.inventory import (
+    InventoryCreate, InventoryUpdate, InventoryResponse, InventoryAdjust, InventoryBulkUpsert,
+    InventoryForecast, InventoryBalance
+)
 from app.schemas.task import TaskCreate, TaskUpdate, TaskComplete, TaskResponse
 from app.schemas.task_completion_history import (
     TaskCompletionHistoryResponse,
@@ -8,15 +12,31 @@ from app.schemas.task_completion_history import (
 from app.schemas.alert import AlertCreate, AlertUpdate, AlertResponse
 from app.schemas.reading import (
     ReadingTypeCreate, ReadingTypeResponse,
-    ReadingCreate, ReadingUpdate, ReadingResponse, ReadingChartPoint
+    ReadingCreate, ReadingUpdate, ReadingResponse, ReadingChartPoint,
+    ReadingSeries, ReadingSeriesResponse,
+    ReadingStreak, ReadingRangeSummary, ReadingRangeReport
+)
+from app.schemas.dashboard import LatestReading, AlertSummary, DashboardResponse
+from app.schemas.sensor import SensorSampleIn, IngestResult, SensorSampleResponse
+from app.schemas.job import JobCreate, JobResponse
+from app.schemas.sync import (
+    SyncDeleted, SyncResponse, SyncOperation, SyncPush, SyncResult, SyncPushResponse
 )
 
 __all__ = [
     "UserCreate", "UserResponse",
-    "InventoryCreate", "InventoryUpdate", "InventoryResponse",
+    "PoolCreate", "PoolUpdate", "PoolResponse",
+    "InventoryCreate", "InventoryUpdate", "InventoryResponse", "InventoryAdjust", "InventoryBulkUpsert",
+    "InventoryForecast", "InventoryBalance",
     "TaskCreate", "TaskUpdate", "TaskComplete", "TaskResponse",
     "TaskCompletionHistoryResponse", "PaginatedTaskCompletionHistoryResponse",
     "AlertCreate", "AlertUpdate", "AlertResponse",
     "ReadingTypeCreate", "ReadingTypeResponse",
     "ReadingCreate", "ReadingUpdate", "ReadingResponse", "ReadingChartPoint",
+    "ReadingSeries", "ReadingSeriesResponse",
+    "ReadingStreak", "ReadingRangeSummary", "ReadingRangeReport",
+    "LatestReading", "AlertSummary", "DashboardResponse",
+    "SensorSampleIn", "IngestResult", "SensorSampleResponse",
+    "JobCreate", "JobResponse",
+    "SyncDeleted", "SyncResponse", "SyncOperation", "SyncPush", "SyncResult", "SyncPushResponse",
 ]
\ No newline at end of file
@@ -1,14 +1,14 @@
 from datetime import time, datetime
-from typing import Optional, List
+from typing import Annotated, Optional, List
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AlertBase(BaseModel):
     name: str
     cadence: str  # 'daily' or 'weekly'
     alert_time: time
-    days_of_week: List[int] = []  # 0=Sunday, 6=Saturday
+    days_of_week: List[Annotated[int, Field(ge=0, le=6)]] = []  # 0=Sunday, 6=Saturday
     alert_on_low_inventory: bool = False
     alert_on_due_tasks: bool = False
 
@@ -24,6 +24,7 @@ class AlertUpdate(AlertBase):
 class AlertResponse(AlertBase):
     id: UUID
     user_id: UUID
+    pool_id: UUID
     last_sent: Optional[datetime] = None
     
     model_config = ConfigDict(from_attributes=True)
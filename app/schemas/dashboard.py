@@ -0,0 +1,30 @@
+from datetime import date, datetime
+from typing import Optional, List
+from pydantic import BaseModel
+
+from app.schemas.task import TaskResponse
+from app.schemas.inventory import InventoryResponse
+from app.schemas.reading import ReadingTypeResponse
+
+
+class LatestReading(BaseModel):
+    reading_type_slug: str
+    reading_value: float
+    reading_date: date
+
+
+class AlertSummary(BaseModel):
+    total: int
+    daily: int
+    weekly: int
+    last_sent: Optional[datetime] = None
+
+
+class DashboardResponse(BaseModel):
+    tasks: Optional[List[TaskResponse]] = None
+    due_tasks: Optional[List[TaskResponse]] = None
+    inventory: Optional[List[InventoryResponse]] = None
+    low_inventory: Optional[List[InventoryResponse]] = None
+    reading_types: Optional[List[ReadingTypeResponse]] = None
+    latest_readings: Optional[List[LatestReading]] = None
+    alerts: Optional[AlertSummary] = None
@@ -1,5 +1,7 @@
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class InventoryBase(BaseModel):
@@ -22,3 +24,22 @@ class InventoryResponse(InventoryBase):
     user_id: UUID
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class InventoryAdjust(BaseModel):
+    delta: float  # Added to quantity_on_hand; negative to use stock
+
+
+class InventoryBulkUpsert(BaseModel):
+    items: List[InventoryCreate] = Field(max_length=500)  # Matched to existing items by name
+
+
+class InventoryForecast(InventoryResponse):
+    daily_usage: float  # Average use per day over INVENTORY_USAGE_DAYS
+    days_until_empty: Optional[float] = None  # None when nothing was used
+
+
+class InventoryBalance(BaseModel):
+    item_id: UUID
+    at: datetime
+    quantity_on_hand: float
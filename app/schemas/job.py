@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+
+
+class JobCreate(BaseModel):
+    kind: str  # e.g. "export", "reclassify_ranges"
+    params: Dict[str, Any] = {}
+
+
+class JobResponse(BaseModel):
+    id: UUID
+    kind: str
+    params: Dict[str, Any]
+    status: str  # queued, running, succeeded or failed
+    progress: float
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,22 @@
+from datetime import datetime
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class PoolBase(BaseModel):
+    name: str = Field(min_length=1, max_length=100)
+
+
+class PoolCreate(PoolBase):
+    pass
+
+
+class PoolUpdate(PoolBase):
+    pass
+
+
+class PoolResponse(PoolBase):
+    id: UUID
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
@@ -44,9 +44,11 @@ class ReadingUpdate(BaseModel):
 
 class ReadingResponse(ReadingBase):
     id: UUID
+    pool_id: UUID
     reading_type_slug: str
     reading_type_name: str
     unit: Optional[str] = None
+    in_range: Optional[bool] = None  # None when the type has no range
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
@@ -54,5 +56,50 @@ class ReadingResponse(ReadingBase):
 
 # For chart data
 class ReadingChartPoint(BaseModel):
+    id: UUID  # Lets clients merge live updates without duplicating points
     reading_date: str  # ISO format
     reading_value: float
+
+
+class ReadingSeries(BaseModel):
+    slug: str
+    name: str
+    unit: Optional[str] = None
+    low: Optional[float] = None
+    high: Optional[float] = None
+    points: List[ReadingChartPoint]
+
+
+class ReadingSeriesResponse(BaseModel):
+    start: date
+    end: date
+    series: List[ReadingSeries]
+
+
+# Range report
+class ReadingStreak(BaseModel):
+    start: date
+    end: date
+    days: int
+
+
+class ReadingRangeSummary(BaseModel):
+    slug: str
+    name: str
+    unit: Optional[str] = None
+    low: Optional[float] = None
+    high: Optional[float] = None
+    readings: int
+    violations: int
+    below: int
+    above: int
+    violation_days: int
+    longest_streak: Optional[ReadingStreak] = None  # Consecutive days with a violation
+    current_streak: Optional[ReadingStreak] = None  # Streak ending on the latest reading, if that one was out of range
+
+
+class ReadingRangeReport(BaseModel):
+    start: date
+    end: date
+    types: List[ReadingRangeSummary]
+    latest: List[ReadingResponse]  # Most recent violations first
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SensorSampleIn(BaseModel):
+    """One NDJSON line of POST /ingest/samples"""
+    device: str = Field(min_length=1, max_length=64)
+    type: str  # Reading type slug, e.g. "ph"
+    value: float
+    ts: datetime  # Without an offset, taken as UTC
+
+
+class IngestResult(BaseModel):
+    accepted: int  # Buffered for writing
+    rejected: int  # Lines that failed validation
+    errors: List[str] = []  # The first few rejections, as "line N: reason"
+
+
+class SensorSampleResponse(BaseModel):
+    device: str
+    measured_at: datetime
+    value: float
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,48 @@
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+from app.schemas.task import TaskResponse
+from app.schemas.task_completion_history import TaskCompletionHistoryResponse
+from app.schemas.inventory import InventoryResponse
+from app.schemas.alert import AlertResponse
+from app.schemas.reading import ReadingResponse
+
+
+class SyncDeleted(BaseModel):
+    entity: str  # task, task_history, inventory, alert or reading
+    id: UUID
+
+
+class SyncResponse(BaseModel):
+    token: str  # Pass back as ?since= on the next sync
+    full: bool  # True when this is a complete snapshot (replace local data)
+    tasks: List[TaskResponse] = []
+    task_history: List[TaskCompletionHistoryResponse] = []
+    inventory: List[InventoryResponse] = []
+    alerts: List[AlertResponse] = []
+    readings: List[ReadingResponse] = []
+    deleted: List[SyncDeleted] = []
+
+
+class SyncOperation(BaseModel):
+    id: UUID  # Client-generated; replaying the same id is a no-op
+    op: str  # e.g. "reading.create", "task.complete", "inventory.update"
+    target: Optional[UUID] = None  # Row the operation applies to (update/complete/delete)
+    pool_id: Optional[UUID] = None  # Pool for task and reading operations; defaults to the account's first
+    data: Dict[str, Any] = {}  # Request body of the equivalent REST call
+
+
+class SyncPush(BaseModel):
+    operations: List[SyncOperation] = Field(max_length=100)
+
+
+class SyncResult(BaseModel):
+    id: UUID
+    status: int  # HTTP status the equivalent REST call would have returned
+    row: Optional[Dict[str, Any]] = None
+    detail: Optional[str] = None
+
+
+class SyncPushResponse(BaseModel):
+    results: List[SyncResult]
@@ -20,11 +20,13 @@ class TaskUpdate(TaskBase):
 
 class TaskComplete(BaseModel):
     notes: Optional[str] = None
+    completed_date: Optional[date] = None  # Defaults to today; set by offline clients replaying later
 
 
 class TaskResponse(TaskBase):
     id: UUID
     user_id: UUID
+    pool_id: UUID
     next_due_date: date
     last_completed_date: Optional[date] = None
     last_completion_notes: Optional[str] = None
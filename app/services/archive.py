@@ -0,0 +1,361 @@
+"""
+Tiered retention for readings and task completion history.
+
+Rows older than ARCHIVE_AFTER_DAYS move out of the database into archive
+files under ARCHIVE_DIR, whole months at a time. There is one
+gzip-compressed file per pool, series and month:
+
+    {ARCHIVE_DIR}/{user_id}/{pool_id}/readings/{reading_type_id}/2024-05.json.gz
+    {ARCHIVE_DIR}/{user_id}/{pool_id}/history/{task_id}/2024-05.json.gz
+
+Each file is columnar JSON: one array per column. A run merges each month's
+rows with that month's existing file, so back-dated rows that arrive later
+are picked up on the next run. It writes the file atomically, then deletes
+the rows in batches of ARCHIVE_BATCH_ROWS. The delete also removes the sync
+tombstones its triggers wrote: clients keep the rows they have; archived
+rows just leave the hot tables. Until the batch commits, a reader can see a
+row in both places, so readers merge by id.
+
+Routes read the archive through `load_archived`, which lists a series' directory to
+find the months a date range touches. Decoded months are cached by file
+version. Only one process archives at a time (a lock file in ARCHIVE_DIR),
+so every worker must share ARCHIVE_DIR. Deleting an archived reading
+rewrites its month file under a per-series lock that archive runs also take.
+"""
+import asyncio
+import fcntl
+import functools
+import gzip
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+import orjson
+from sqlalchemy import delete, func, select
+
+from app.cache import publish_invalidations
+from app.changefeed import record_change
+from app.config import settings
+from app.database import AsyncSessionLocal, writer_lock
+from app.models import MaintenanceTask, Reading, SyncTombstone, TaskCompletionHistory
+from app.rows import json_default, select_rows
+
+SUFFIX = ".json.gz"
+
+
+class Tier(NamedTuple):
+    kind: str  # Directory under the pool
+    model: Any
+    series: Any  # Column splitting the pool's rows into series (reading type, task)
+    day: Any  # Date column the months are taken from
+    columns: Tuple  # Stored per row; pool and series come from the path
+    owner: Any  # Model carrying user_id and pool_id (the row's, or its task's)
+
+
+TIERS = {
+    "readings": Tier(
+        "readings", Reading, Reading.reading_type_id, Reading.reading_date,
+        (Reading.id, Reading.reading_date, Reading.reading_value, Reading.notes, Reading.created_at),
+        Reading
+    ),
+    "history": Tier(
+        "history", TaskCompletionHistory, TaskCompletionHistory.task_id, TaskCompletionHistory.completed_date,
+        (TaskCompletionHistory.id, TaskCompletionHistory.completed_date, TaskCompletionHistory.notes,
+         TaskCompletionHistory.created_at),
+        MaintenanceTask
+    ),
+}
+
+# Column python type -> decoder for its JSON form
+DECODERS = {UUID: UUID, date: date.fromisoformat, datetime: datetime.fromisoformat}
+
+
+def _directory(user_id, pool_id, kind: Optional[str] = None, series=None) -> str:
+    parts = [settings.ARCHIVE_DIR, str(user_id), str(pool_id)]
+    if kind is not None:
+        parts.append(kind)
+    if series is not None:
+        parts.append(str(series))
+    return os.path.join(*parts)
+
+
+def _month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def _encode(tier: Tier, rows: List[dict]) -> bytes:
+    columns = {column.name: [row[column.name] for row in rows] for column in tier.columns}
+    return gzip.compress(orjson.dumps(columns, default=json_default, option=orjson.OPT_UTC_Z), compresslevel=6)
+
+
+@functools.lru_cache(maxsize=256)
+def _decode(kind: str, path: str, version: Tuple[int, int]) -> Tuple[dict, ...]:
+    """A month's rows, cached per file version (mtime, size); callers must not change them"""
+    with open(path, "rb") as f:
+        columns = orjson.loads(gzip.decompress(f.read()))
+    names, values = [], []
+    for column in TIERS[kind].columns:
+        decode = DECODERS.get(column.type.python_type)
+        names.append(column.name)
+        values.append([decode(v) if decode and v is not None else v for v in columns[column.name]])
+    return tuple(dict(zip(names, row)) for row in zip(*values))
+
+
+def _read(kind: str, path: str) -> Tuple[dict, ...]:
+    stat = os.stat(path)
+    return _decode(kind, path, (stat.st_mtime_ns, stat.st_size))
+
+
+def _write(path: str, body: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)  # Readers see the old month or the new one, never half of it
+
+
+@contextmanager
+def _series_lock(directory: str):
+    """Serialize rewrites of one series' month files (archive runs and deletes)"""
+    with open(os.path.join(directory, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def _months(directory: str, start: Optional[date], end: Optional[date]) -> List[str]:
+    """Archive files in a series directory for months overlapping [start, end]"""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    paths = []
+    for name in sorted(names):
+        if not name.endswith(SUFFIX):
+            continue
+        month = date.fromisoformat(name[:-len(SUFFIX)] + "-01")
+        if (start is None or _next_month(month) > start) and (end is None or month <= end):
+            paths.append(os.path.join(directory, name))
+    return paths
+
+
+async def load_archived(kind: str, user_id, pool_id, series, start: Optional[date] = None, end: Optional[date] = None) -> List[dict]:
+    """Archived rows of one series with `day` in [start, end], oldest month first"""
+    tier = TIERS[kind]
+    paths = _months(_directory(user_id, pool_id, kind, series), start, end)
+    if not paths:
+        return []
+
+    def read_all():
+        return [row for path in paths for row in _read(kind, path)]
+
+    day = tier.day.name
+    return [
+        {**row, "pool_id": pool_id, tier.series.name: series}
+        for row in await asyncio.to_thread(read_all)
+        if (start is None or row[day] >= start) and (end is None or row[day] <= end)
+    ]
+
+
+async def load_user_archive(kind: str, user_id) -> List[dict]:
+    """Every archived row a user has, across pools and series (for full sync snapshots)"""
+    series_column = TIERS[kind].series.name
+    root = os.path.join(settings.ARCHIVE_DIR, str(user_id))
+
+    def read_all():
+        rows = []
+        try:
+            pools = os.listdir(root)
+        except FileNotFoundError:
+            return rows
+        for pool_id in pools:
+            directory = os.path.join(root, pool_id, kind)
+            try:
+                names = os.listdir(directory)
+            except FileNotFoundError:
+                continue
+            for name in names:
+                where = {"pool_id": UUID(pool_id), series_column: UUID(name)}
+                for path in _months(os.path.join(directory, name), None, None):
+                    rows.extend({**row, **where} for row in _read(kind, path))
+        return rows
+
+    return await asyncio.to_thread(read_all)
+
+
+async def latest_archived(kind: str, user_id, pool_id) -> Dict[str, dict]:
+    """The newest archived row of each of a pool's series, keyed by series id (as a string)"""
+    directory = _directory(user_id, pool_id, kind)
+
+    def read_latest():
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return {}
+        latest = {}
+        for name in names:
+            paths = _months(os.path.join(directory, name), None, None)
+            rows = _read(kind, paths[-1]) if paths else ()
+            if rows:
+                latest[name] = rows[-1]  # Files are sorted by day, then created_at
+        return latest
+
+    return await asyncio.to_thread(read_latest)
+
+
+def _remove_row(kind: str, path: str, row_id) -> bool:
+    if not os.path.exists(path):
+        return False
+    with _series_lock(os.path.dirname(path)):
+        rows = _read(kind, path) if os.path.exists(path) else ()
+        kept = [row for row in rows if row["id"] != row_id]
+        if len(kept) == len(rows):
+            return False
+        if kept:
+            _write(path, _encode(TIERS[kind], kept))
+        else:
+            os.remove(path)
+    return True
+
+
+async def delete_archived(kind: str, user_id, pool_id, row_id, series=None, day: Optional[date] = None) -> bool:
+    """
+    Remove one archived row by rewriting its month file; False if it isn't archived.
+    Without `series` and `day` this searches every month of the pool's archive.
+    """
+    def remove():
+        if series is not None and day is not None:
+            directory = _directory(user_id, pool_id, kind, series)
+            return _remove_row(kind, os.path.join(directory, f"{_month(day):%Y-%m}{SUFFIX}"), row_id)
+        root = _directory(user_id, pool_id, kind)
+        try:
+            names = os.listdir(root)
+        except FileNotFoundError:
+            return False
+        paths = (path for name in names for path in _months(os.path.join(root, name), None, None))
+        return any(_remove_row(kind, path, row_id) for path in paths)
+
+    return await asyncio.to_thread(remove)
+
+
+def merge_archived(archived: List[dict], hot: List[dict]) -> List[dict]:
+    """Archived and database rows as one list; a row in both (mid-archive) counts once"""
+    if not archived:
+        return hot
+    hot_ids = {row["id"] for row in hot}
+    return [row for row in archived if row["id"] not in hot_ids] + hot
+
+
+async def drop_archive(user_id, pool_id, kind: Optional[str] = None, series=None) -> None:
+    """Delete the archive of a pool (or one of its series) once its rows are deleted"""
+    await asyncio.to_thread(shutil.rmtree, _directory(user_id, pool_id, kind, series), True)
+
+
+def _in_series(tier: Tier, pool_id, series):
+    """Rows of one series; reading types are shared, so readings also need the pool"""
+    if tier.owner is tier.model:
+        return (tier.model.pool_id == pool_id) & (tier.series == series)
+    return tier.series == series
+
+
+def _merge_month(tier: Tier, path: str, rows: List[dict]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _series_lock(os.path.dirname(path)):
+        existing = list(_read(tier.kind, path)) if os.path.exists(path) else []
+        combined = merge_archived(existing, rows)
+        combined.sort(key=lambda row: (row[tier.day.name], row["created_at"]))
+        _write(path, _encode(tier, combined))
+
+
+async def _archive_month(tier: Tier, user_id, pool_id, series, month: date) -> int:
+    """Move one series' rows for one month into its archive file"""
+    async with AsyncSessionLocal() as db:
+        rows = await select_rows(
+            db,
+            select(*tier.columns)
+            .where(_in_series(tier, pool_id, series), tier.day >= month, tier.day < _next_month(month))
+        )
+    if not rows:
+        return 0
+
+    path = os.path.join(_directory(user_id, pool_id, tier.kind, series), f"{month:%Y-%m}{SUFFIX}")
+    await asyncio.to_thread(_merge_month, tier, path, rows)
+
+    ids = [row["id"] for row in rows]
+    for start in range(0, len(ids), settings.ARCHIVE_BATCH_ROWS):
+        batch = ids[start:start + settings.ARCHIVE_BATCH_ROWS]
+        async with AsyncSessionLocal() as db:
+            async with writer_lock():
+                await db.execute(delete(tier.model).where(tier.model.id.in_(batch)))
+                # Not a delete as far as sync clients are concerned
+                await db.execute(
+                    delete(SyncTombstone)
+                    .where(SyncTombstone.user_id == user_id)
+                    .where(SyncTombstone.table_name == tier.model.__tablename__)
+                    .where(SyncTombstone.row_id.in_(batch))
+                )
+                record_change(db, tier.model.__tablename__, user_id)
+                await db.commit()
+            await publish_invalidations(db)
+    return len(ids)
+
+
+async def _archive_tier(tier: Tier, cutoff: date, user_id=None) -> int:
+    """Archive every series' rows (or one user's) dated before `cutoff` (a month start)"""
+    query = (
+        select(tier.owner.user_id, tier.owner.pool_id, tier.series, func.min(tier.day))
+        .where(tier.day < cutoff)
+        .group_by(tier.owner.user_id, tier.owner.pool_id, tier.series)
+    )
+    if tier.owner is not tier.model:
+        query = query.join(tier.owner, tier.owner.id == tier.series)
+    if user_id is not None:
+        query = query.where(tier.owner.user_id == user_id)
+    async with AsyncSessionLocal() as db:
+        groups = (await db.execute(query)).all()
+
+    moved = 0
+    for user_id, pool_id, series, first in groups:
+        month = _month(first)
+        while month < cutoff:
+            moved += await _archive_month(tier, user_id, pool_id, series, month)
+            # Skip straight to the next month that has rows
+            async with AsyncSessionLocal() as db:
+                first = (await db.execute(
+                    select(func.min(tier.day))
+                    .where(_in_series(tier, pool_id, series), tier.day >= _next_month(month), tier.day < cutoff)
+                )).scalar()
+            if first is None:
+                break
+            month = _month(first)
+    return moved
+
+
+async def archive_old_rows(user_id=None) -> Dict[str, int]:
+    """Move readings and task history older than ARCHIVE_AFTER_DAYS (everyone's, or one user's) into archive files"""
+    if settings.ARCHIVE_AFTER_DAYS <= 0:
+        return {}
+    today = datetime.now(ZoneInfo(settings.TIMEZONE)).date()
+    cutoff = _month(today - timedelta(days=settings.ARCHIVE_AFTER_DAYS))
+
+    os.makedirs(settings.ARCHIVE_DIR, exist_ok=True)
+    with open(os.path.join(settings.ARCHIVE_DIR, ".lock"), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print("⚠ Archive run skipped: another process is archiving")
+            return {}
+        moved = {kind: await _archive_tier(tier, cutoff, user_id) for kind, tier in TIERS.items()}
+
+    if any(moved.values()):
+        print(f"✓ Archived rows before {cutoff}: {moved['readings']} readings, {moved['history']} task completions")
+    return moved
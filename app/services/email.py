@@ -35,15 +35,21 @@ async def send_email(
         print(f"✗ Failed to send email to {recipient}: {e}")
 
 
-def create_alert_email(low_inventory_items: list, due_tasks: list) -> str:
-    """Create HTML email body for pool alerts"""
+def create_alert_email(low_inventory_items: list, due_tasks: list, forecasts: dict = None) -> str:
+    """Create HTML email body for pool alerts (`forecasts`: item id -> ledger Forecast)"""
     html = "<html><body><h1>🏊 Pool Maintenance Alert</h1>"
     
     if low_inventory_items:
         html += "<h2>⚠️ Low Chemical Inventory</h2><ul>"
         for item in low_inventory_items:
             html += f"<li><strong>{item.name}:</strong> {item.quantity_on_hand} {item.unit} "
-            html += f"(reorder at {item.reorder_threshold})</li>"
+            html += f"(reorder at {item.reorder_threshold})"
+            days_left = forecasts[item.id].days_until_empty if forecasts and item.id in forecasts else None
+            if days_left is not None and days_left < 1:
+                html += " - runs out today"
+            elif days_left is not None:
+                html += f" - runs out in {int(days_left)} {'day' if int(days_left) == 1 else 'days'}"
+            html += "</li>"
         html += "</ul>"
     
     if due_tasks:
@@ -0,0 +1,146 @@
+"""
+Per-user change events for the SSE stream.
+
+The broker registers with the change feed, so it sees commits from this
+worker and (on PostgreSQL) from every other worker. For each change it
+loads the row once from the primary, serializes it with the route's
+response schema and fans it out to that user's open streams.
+"""
+import asyncio
+import uuid
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import select
+
+from app import changefeed
+from app.changefeed import Change
+from app.database import AsyncSessionLocal
+from app.models import (
+    MaintenanceTask, TaskCompletionHistory, ChemicalInventory, Alert, ReadingType, Reading
+)
+from app.schemas import (
+    TaskResponse, TaskCompletionHistoryResponse, InventoryResponse, AlertResponse,
+    ReadingTypeResponse, ReadingResponse
+)
+
+QUEUE_SIZE = 100  # Events buffered per stream before it is told to resync
+
+# table -> (entity name sent to clients, model, response schema)
+ENTITIES = {
+    "maintenance_tasks": ("task", MaintenanceTask, TaskResponse),
+    "task_completion_history": ("task_history", TaskCompletionHistory, TaskCompletionHistoryResponse),
+    "chemical_inventory": ("inventory", ChemicalInventory, InventoryResponse),
+    "alerts": ("alert", Alert, AlertResponse),
+    "reading_types": ("reading_type", ReadingType, ReadingTypeResponse),
+    "readings": ("reading", Reading, ReadingResponse),
+}
+
+
+class EventBroker:
+    """Fans committed changes out to per-user subscriber queues"""
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.subscribers.setdefault(str(user_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id, queue: asyncio.Queue) -> None:
+        queues = self.subscribers.get(str(user_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[str(user_id)]
+
+    def _push(self, queue: asyncio.Queue, event: str, data: dict) -> None:
+        try:
+            queue.put_nowait((event, data))
+        except asyncio.QueueFull:
+            # Slow client: drop its backlog and have it reload everything instead
+            self.dropped += queue.qsize()
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(("resync", {}))
+
+    def on_change(self, changes: Iterable[Change]) -> None:
+        changes = [c for c in changes if c.table in ENTITIES and c.id is not None]
+        if not changes or not self.subscribers:
+            return
+        try:
+            asyncio.get_running_loop().create_task(self.publish(changes))
+        except RuntimeError:
+            pass  # Committed outside the event loop (e.g. a CLI script)
+
+    def on_flush(self) -> None:
+        for queues in self.subscribers.values():
+            for queue in queues:
+                self._push(queue, "resync", {})
+
+    async def publish(self, changes: Iterable[Change]) -> None:
+        async with AsyncSessionLocal() as db:
+            for change in changes:
+                entity, model, schema = ENTITIES[change.table]
+                owner, row = await _load(db, change, model, schema)
+                owner = owner or change.user_id
+                event = {"entity": entity, "id": change.id, "op": "upsert" if row else "delete", "row": row}
+                if owner is not None:
+                    targets = self.subscribers.get(owner, ())
+                elif change.table == "reading_types":
+                    targets = [q for queues in self.subscribers.values() for q in queues]
+                else:
+                    continue
+                for queue in list(targets):
+                    self._push(queue, "change", event)
+                    self.published += 1
+
+    def stats(self) -> dict:
+        return {
+            "streams": sum(len(q) for q in self.subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+async def _load(db, change: Change, model, schema) -> tuple:
+    """Current row as (owner user_id, JSON-ready dict); row is None if it was deleted"""
+    if model is Reading:
+        result = await db.execute(
+            select(Reading, ReadingType)
+            .join(ReadingType, Reading.reading_type_id == ReadingType.id)
+            .where(Reading.id == uuid.UUID(change.id))
+        )
+        found = result.one_or_none()
+        if found is None:
+            return None, None
+        reading, reading_type = found
+        return str(reading.user_id), ReadingResponse(
+            id=reading.id,
+            pool_id=reading.pool_id,
+            reading_value=reading.reading_value,
+            reading_date=reading.reading_date,
+            notes=reading.notes,
+            reading_type_slug=reading_type.slug,
+            reading_type_name=reading_type.name,
+            unit=reading_type.unit,
+            in_range=reading.in_range,
+            created_at=reading.created_at
+        ).model_dump(mode="json")
+
+    instance = await db.get(model, uuid.UUID(change.id))
+    if instance is None:
+        return None, None
+    owner: Optional[str] = None
+    if model is TaskCompletionHistory:
+        task = await db.get(MaintenanceTask, instance.task_id)
+        owner = str(task.user_id) if task else None
+    elif hasattr(instance, "user_id"):
+        owner = str(instance.user_id)
+    return owner, schema.model_validate(instance).model_dump(mode="json")
+
+
+broker = EventBroker()
+changefeed.register(broker.on_change, broker.on_flush)
@@ -0,0 +1,173 @@
+"""
+Buffered writer for sensor samples.
+
+POST /ingest/samples parses NDJSON and hands rows to `ingest_buffer`
+without touching the database. A single background task drains the
+buffer in batches of INGEST_BATCH_ROWS, or whatever has arrived after
+INGEST_FLUSH_MS, as one multi-row INSERT (COPY on PostgreSQL). When the
+buffer holds INGEST_BUFFER_ROWS, producers wait for the writer to catch
+up, which slows down reading their request bodies; after
+INGEST_WAIT_SECONDS they get BufferFull (503). Rows are buffered per
+worker and are written on shutdown; a crash loses at most the buffer.
+"""
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app import database
+from app.config import settings
+from app.database import writer_lock
+from app.models import SensorSample
+
+COLUMNS = ("user_id", "reading_type_id", "device", "measured_at", "value")
+Row = Tuple  # Values in COLUMNS order
+
+
+class BufferFull(Exception):
+    """The writer is too far behind; retry later"""
+
+
+class SampleBuffer:
+    """Bounded in-memory queue of sample rows with one batching writer task"""
+
+    def __init__(self, capacity: int, batch_rows: int, flush_seconds: float):
+        self.capacity = capacity
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.pending: List[Row] = []
+        self._changed = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.accepted = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.refused = 0
+        self.last_flush_ms = 0.0
+
+    async def put_many(self, rows: List[Row], timeout: float) -> None:
+        """Queue rows, waiting up to `timeout` seconds for room"""
+        if not rows:
+            return
+        deadline = time.monotonic() + timeout
+        async with self._changed:
+            # A batch bigger than the whole buffer still goes in once it's empty
+            while self.pending and len(self.pending) + len(rows) > self.capacity:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.refused += len(rows)
+                    raise BufferFull()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            self.pending.extend(rows)
+            self.accepted += len(rows)
+            if len(self.pending) >= self.batch_rows:
+                self._changed.notify_all()
+
+    async def _next_batch(self) -> List[Row]:
+        async with self._changed:
+            if len(self.pending) < self.batch_rows:
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(lambda: len(self.pending) >= self.batch_rows),
+                        self.flush_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            batch = self.pending[:self.batch_rows]
+            del self.pending[:self.batch_rows]
+            self._changed.notify_all()  # Room for waiting producers
+            return batch
+
+    async def _requeue(self, batch: List[Row]) -> None:
+        async with self._changed:
+            self.pending[:0] = batch
+
+    async def _write(self, batch: List[Row]) -> None:
+        started = time.perf_counter()
+        async with writer_lock():
+            async with database.engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    import asyncpg
+
+                    raw = await conn.get_raw_connection()
+                    # COPY bypasses SQLAlchemy, so its errors arrive untranslated
+                    try:
+                        await raw.driver_connection.copy_records_to_table(
+                            SensorSample.__tablename__, records=batch, columns=COLUMNS
+                        )
+                    except asyncpg.IntegrityConstraintViolationError as e:
+                        raise IntegrityError("COPY sensor_samples", None, e) from e
+                    except (asyncpg.DataError, ValueError) as e:
+                        # ValueError: a value asyncpg couldn't encode for its column
+                        raise DataError("COPY sensor_samples", None, e) from e
+                else:
+                    await conn.execute(insert(SensorSample), [dict(zip(COLUMNS, row)) for row in batch])
+                    await conn.commit()
+        self.written += len(batch)
+        self.batches += 1
+        self.last_flush_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while not (self._stopping and not self.pending):
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            try:
+                await self._write(batch)
+                delay = 1.0
+            except (IntegrityError, DataError) as e:
+                # Bad rows (e.g. a reading type deleted meanwhile) would fail forever
+                self.dropped += len(batch)
+                print(f"⚠ Dropped {len(batch)} sensor samples: {e}")
+            except Exception as e:
+                if self._stopping:
+                    lost = len(batch) + len(self.pending)
+                    self.dropped += lost
+                    self.pending.clear()
+                    print(f"✗ Lost {lost} buffered sensor samples at shutdown: {e}")
+                    return
+                # Database unavailable: keep the rows; the full buffer pushes back on senders
+                print(f"⚠ Sensor sample write failed ({e}); retrying in {delay:.0f}s")
+                await self._requeue(batch)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    def start(self) -> None:
+        self._changed = asyncio.Condition()  # Bound to the running loop
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write whatever is still buffered, then stop the writer"""
+        if self._task is None:
+            return
+        self._stopping = True
+        await self._task
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "buffered": len(self.pending),
+            "capacity": self.capacity,
+            "accepted": self.accepted,
+            "written": self.written,
+            "batches": self.batches,
+            "refused": self.refused,
+            "dropped": self.dropped,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+ingest_buffer = SampleBuffer(
+    settings.INGEST_BUFFER_ROWS,
+    settings.INGEST_BATCH_ROWS,
+    settings.INGEST_FLUSH_MS / 1000
+)
@@ -0,0 +1,218 @@
+"""
+Background jobs backed by the `jobs` table.
+
+POST /jobs/ inserts a queued row and returns at once. Every process runs
+JOB_WORKERS worker tasks (started in lifespan next to the scheduler) that
+claim the oldest queued job with UPDATE ... WHERE id = (SELECT ... FOR
+UPDATE SKIP LOCKED), so workers in all processes share one queue and never
+claim the same job twice; on SQLite the single writer already serializes
+claims. The worker runs the handler registered for the job's kind, which
+may report progress, and stores its result or error. Running jobs refresh
+heartbeat_at; a job whose worker died is requeued once its heartbeat is
+JOB_STALE_SECONDS old, up to JOB_MAX_ATTEMPTS times. New jobs wake idle
+workers through the change feed; otherwise they poll every JOB_POLL_SECONDS.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Type
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import select, update
+
+from app import changefeed
+from app.config import settings
+from app.database import AsyncSessionLocal, writer_lock
+from app.models import Job
+
+UNFINISHED = ("queued", "running")
+
+
+class JobContext:
+    """What a handler gets: who submitted the job, its parameters, and a progress reporter"""
+
+    def __init__(self, job: Job, params: Optional[BaseModel]):
+        self.job_id = job.id
+        self.user_id = job.user_id
+        self.params = params
+
+    async def progress(self, fraction: float) -> None:
+        """Record how far along the job is (don't call it while holding writer_lock)"""
+        await _update(self.job_id, progress=min(max(fraction, 0.0), 1.0))
+
+
+class Handler(NamedTuple):
+    run: Callable[[JobContext], Awaitable[Optional[dict]]]
+    params: Optional[Type[BaseModel]] = None  # Validates the submitted params; None takes none
+
+
+HANDLERS: Dict[str, Handler] = {}
+
+
+def handler(kind: str, params: Optional[Type[BaseModel]] = None):
+    """Register `run(ctx)` as the job kind `kind`; it returns a JSON-ready result (or None)"""
+    def decorator(run):
+        HANDLERS[kind] = Handler(run, params)
+        return run
+    return decorator
+
+
+async def _update(job_id: UUID, **values) -> None:
+    async with AsyncSessionLocal() as db:
+        async with writer_lock():
+            await db.execute(update(Job).where(Job.id == job_id).values(**values))
+            await db.commit()
+
+
+async def _update_heartbeats(job_ids: List[UUID]) -> None:
+    async with AsyncSessionLocal() as db:
+        async with writer_lock():
+            await db.execute(
+                update(Job)
+                .where(Job.id.in_(job_ids), Job.status == "running")
+                .values(heartbeat_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+
+
+class JobRunner:
+    """A fixed number of worker tasks claiming queued jobs, plus a heartbeat task"""
+
+    def __init__(self, workers: int, poll_seconds: float):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.active: Dict[UUID, str] = {}  # Jobs running in this process -> kind
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self.succeeded = 0
+        self.failed = 0
+        self.recovered = 0
+
+    def notify(self, changes=()) -> None:
+        if self._wakeup is not None and (not changes or any(change.table == "jobs" for change in changes)):
+            self._wakeup.set()
+
+    async def _claim(self) -> Optional[Job]:
+        now = datetime.now(timezone.utc)
+        oldest = (
+            select(Job.id)
+            .where(Job.status == "queued")
+            .order_by(Job.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with AsyncSessionLocal() as db:
+            async with writer_lock():
+                result = await db.execute(
+                    update(Job)
+                    .where(Job.id == oldest, Job.status == "queued")
+                    .values(status="running", progress=0.0, attempts=Job.attempts + 1, started_at=now, heartbeat_at=now)
+                    .returning(Job)
+                    .execution_options(synchronize_session=False)
+                )
+                job = result.scalar_one_or_none()
+                await db.commit()
+        return job
+
+    async def _finish(self, job: Job, status: str, result=None, error: Optional[str] = None) -> None:
+        values = {"status": status, "result": result, "error": error, "finished_at": datetime.now(timezone.utc)}
+        if status == "succeeded":
+            values["progress"] = 1.0
+            self.succeeded += 1
+        else:
+            self.failed += 1
+            print(f"⚠ Job {job.kind} {job.id} failed: {error}")
+        await _update(job.id, **values)
+
+    async def _run(self, job: Job) -> None:
+        self.active[job.id] = job.kind
+        try:
+            spec = HANDLERS.get(job.kind)
+            if spec is None:
+                raise LookupError(f"Unknown job kind: {job.kind}")
+            params = spec.params.model_validate(job.params) if spec.params else None
+            result = await asyncio.wait_for(spec.run(JobContext(job, params)), settings.JOB_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            # Shutting down: put the job back for another worker, without using up an attempt
+            await asyncio.shield(_update(job.id, status="queued", attempts=Job.attempts - 1, heartbeat_at=None))
+            raise
+        except asyncio.TimeoutError:
+            await self._finish(job, "failed", error=f"Timed out after {settings.JOB_TIMEOUT_SECONDS}s")
+        except Exception as e:
+            await self._finish(job, "failed", error=f"{type(e).__name__}: {e}")
+        else:
+            await self._finish(job, "succeeded", result=result)
+        finally:
+            self.active.pop(job.id, None)
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+                if job is not None:
+                    await self._run(job)
+                    continue  # Drain the queue before sleeping again
+            except Exception as e:
+                # Database unavailable; a job left running is recovered by its heartbeat going stale
+                print(f"⚠ Job worker error: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _recover(self) -> None:
+        """Requeue (or fail, after JOB_MAX_ATTEMPTS) running jobs whose worker went away"""
+        now = datetime.now(timezone.utc)
+        stale = (Job.status == "running") & (Job.heartbeat_at < now - timedelta(seconds=settings.JOB_STALE_SECONDS))
+        async with AsyncSessionLocal() as db:
+            async with writer_lock():
+                failed = await db.execute(
+                    update(Job)
+                    .where(stale, Job.attempts >= settings.JOB_MAX_ATTEMPTS)
+                    .values(status="failed", error="Worker lost too many times", finished_at=now)
+                )
+                requeued = await db.execute(update(Job).where(stale).values(status="queued", heartbeat_at=None))
+                await db.commit()
+        if failed.rowcount or requeued.rowcount:
+            self.recovered += requeued.rowcount
+            print(f"⚠ Recovered jobs from lost workers: {requeued.rowcount} requeued, {failed.rowcount} failed")
+            self.notify()
+
+    async def _watch(self) -> None:
+        interval = settings.JOB_STALE_SECONDS / 4
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self.active:
+                    await _update_heartbeats(list(self.active))
+                await self._recover()
+            except Exception as e:
+                print(f"⚠ Job heartbeat failed: {e}")
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Event()  # Bound to the running loop
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._watch()))
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back on the queue"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers if self._tasks else 0,
+            "running": sorted(self.active.values()),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "recovered": self.recovered,
+            "kinds": sorted(HANDLERS),
+        }
+
+
+job_runner = JobRunner(settings.JOB_WORKERS, settings.JOB_POLL_SECONDS)
+changefeed.register(job_runner.notify, job_runner.notify)
@@ -0,0 +1,107 @@
+"""
+Inventory ledger queries.
+
+Triggers on chemical_inventory append every change to quantity_on_hand to
+inventory_transactions. A daily job rolls the ledger up into
+inventory_snapshots, so an item's balance at any moment is its latest
+snapshot before then plus the few ledger rows after it. Usage rates and
+depletion forecasts come from one set-based query over every item instead
+of replaying the ledger in Python.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.models import ChemicalInventory, InventoryTransaction, InventorySnapshot
+
+# Snapshots stop this far short of now, so transactions still open when one
+# is taken (PostgreSQL stamps rows with the transaction start) land after it
+SNAPSHOT_LAG = timedelta(hours=1)
+
+
+class Forecast(NamedTuple):
+    daily_usage: float  # Average consumption per day over INVENTORY_USAGE_DAYS
+    days_until_empty: Optional[float]  # None when nothing was used
+
+
+def _utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment
+
+
+def _balances_query(at: datetime, *where):
+    latest = (
+        select(InventorySnapshot.item_id, func.max(InventorySnapshot.taken_at).label("taken_at"))
+        .where(InventorySnapshot.taken_at <= at)
+        .group_by(InventorySnapshot.item_id)
+        .subquery()
+    )
+    snapshot = aliased(InventorySnapshot)
+    since_snapshot = (
+        select(func.coalesce(func.sum(InventoryTransaction.delta), 0.0))
+        .where(InventoryTransaction.item_id == ChemicalInventory.id)
+        .where(InventoryTransaction.created_at <= at)
+        .where(or_(snapshot.taken_at == None, InventoryTransaction.created_at > snapshot.taken_at))
+        .scalar_subquery()
+    )
+    return (
+        select(ChemicalInventory.id, func.coalesce(snapshot.quantity, 0.0) + since_snapshot)
+        .outerjoin(latest, latest.c.item_id == ChemicalInventory.id)
+        .outerjoin(snapshot, and_(snapshot.item_id == ChemicalInventory.id, snapshot.taken_at == latest.c.taken_at))
+        .where(*where)
+    )
+
+
+async def balances_at(db: AsyncSession, at: datetime, *where) -> Dict[UUID, float]:
+    """Each item's quantity_on_hand at `at`, for items matching `where`"""
+    result = await db.execute(_balances_query(at.astimezone(timezone.utc), *where))
+    return {item_id: quantity for item_id, quantity in result}
+
+
+async def take_snapshots(db: AsyncSession) -> int:
+    """Record every item's balance as of SNAPSHOT_LAG ago; returns the number of snapshots"""
+    at = datetime.now(timezone.utc) - SNAPSHOT_LAG
+    balances = await balances_at(db, at)
+    if balances:
+        await db.execute(
+            insert(InventorySnapshot),
+            [{"item_id": item_id, "quantity": quantity, "taken_at": at} for item_id, quantity in balances.items()]
+        )
+    return len(balances)
+
+
+async def forecast(db: AsyncSession, *where) -> Dict[UUID, Forecast]:
+    """Usage rate and days until empty for every item matching `where`, in one query"""
+    now = datetime.now(timezone.utc)
+    start = now - timedelta(days=settings.INVENTORY_USAGE_DAYS)
+    used = (
+        select(func.coalesce(func.sum(-InventoryTransaction.delta), 0.0))
+        .where(InventoryTransaction.item_id == ChemicalInventory.id)
+        .where(InventoryTransaction.delta < 0)
+        .where(InventoryTransaction.created_at >= start)
+        .scalar_subquery()
+    )
+    first_seen = (
+        select(func.min(InventoryTransaction.created_at))
+        .where(InventoryTransaction.item_id == ChemicalInventory.id)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(ChemicalInventory.id, ChemicalInventory.quantity_on_hand, used, first_seen).where(*where)
+    )
+
+    forecasts = {}
+    for item_id, quantity, used, first_seen in result:
+        if not used or first_seen is None:
+            forecasts[item_id] = Forecast(0.0, None)
+            continue
+        # Items newer than the window are averaged over the days they've existed (at least one)
+        days = max((now - max(_utc(first_seen), start)) / timedelta(days=1), 1.0)
+        rate = used / days
+        forecasts[item_id] = Forecast(round(rate, 3), round(max(quantity, 0.0) / rate, 1))
+    return forecasts
@@ -0,0 +1,55 @@
+"""
+Reading range classification.
+
+`readings.in_range` is copied from the reading type's low/high when a
+reading is written, so range reports can use a partial index on the
+out-of-range rows instead of re-checking every reading. It is NULL when
+the type has no range. When a range changes (an admin edit, or a data
+migration like 005), `reclassify_readings` fixes the affected rows with
+one set-based UPDATE.
+"""
+from typing import Optional
+
+from sqlalchemy import and_, case, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import changefeed
+from app.models import Reading, ReadingType
+
+
+def classify(value: float, low: Optional[float], high: Optional[float]) -> Optional[bool]:
+    """True within [low, high], False outside it, None when the type has no range"""
+    if low is None and high is None:
+        return None
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def in_range_expression(value, low, high):
+    """SQL version of `classify`"""
+    return case(
+        (and_(low.is_(None), high.is_(None)), None),
+        (and_(or_(low.is_(None), value >= low), or_(high.is_(None), value <= high)), True),
+        else_=False
+    )
+
+
+async def reclassify_readings(db: AsyncSession) -> int:
+    """Recompute in_range where it disagrees with the current ranges; returns rows changed"""
+    current = (
+        select(in_range_expression(Reading.reading_value, ReadingType.low, ReadingType.high))
+        .where(ReadingType.id == Reading.reading_type_id)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Reading)
+        .where(Reading.in_range.is_distinct_from(current))
+        .values(in_range=current)
+        .returning(Reading.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    users = result.scalars().all()
+    # One change per user is enough to drop their cached reports; clients pick
+    # up the rows themselves through updated_at on their next sync
+    for user_id in set(users):
+        changefeed.record_change(db, "readings", user_id)
+    return len(users)
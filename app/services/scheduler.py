@@ -1,85 +1,169 @@
-from datetime import datetime, timezone, date
+from datetime import datetime, time, timezone, timedelta
+from zoneinfo import ZoneInfo
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlalchemy import select
+from sqlalchemy import select, delete, and_, or_
 
-from app.database import AsyncSessionLocal
-from app.models import Alert, ChemicalInventory, MaintenanceTask, User
+from app.cache import publish_invalidations
+from app.config import settings
+from app.database import AsyncSessionLocal, writer_lock
+from app.models import Alert, ChemicalInventory, MaintenanceTask, User, SyncTombstone, SyncReceipt, Job
 from app.services.email import send_email, create_alert_email
+from app.services.ranges import reclassify_readings
+from app.services.ledger import forecast, take_snapshots
+from app.services.archive import archive_old_rows
+from app.services.jobs import JobContext, handler
 
 
 async def check_alerts():
-    """Check all alerts and send emails if conditions are met"""
+    """Check alerts due at this tick and send emails if conditions are met"""
     print(f"⏰ Running alert check at {datetime.now()}")
-    
+
+    # Alert times and weekdays are in the configured local timezone
+    now = datetime.now(timezone.utc)
+    local_now = now.astimezone(ZoneInfo(settings.TIMEZONE))
+    today = local_now.date()
+    day_start = datetime.combine(today, time.min, tzinfo=local_now.tzinfo).astimezone(timezone.utc)
+    weekday_bit = 1 << (local_now.isoweekday() % 7)  # 0=Sunday
+
     async with AsyncSessionLocal() as db:
-        # Get all alerts
-        result = await db.execute(select(Alert))
-        alerts = result.scalars().all()
-        
-        for alert in alerts:
-            # Get user for email
-            user_result = await db.execute(
-                select(User).where(User.id == alert.user_id)
-            )
-            user = user_result.scalar_one_or_none()
-            if not user:
-                continue
-            
-            now = datetime.now(timezone.utc)
-            should_send = False
-            
-            # Check if it's time to send based on cadence
-            if alert.cadence == "daily":
-                if not alert.last_sent or alert.last_sent.date() < now.date():
-                    should_send = True
+        # Only alerts due now: not sent today, time reached, and today is one of their days
+        result = await db.execute(
+            select(Alert, User)
+            .join(User, Alert.user_id == User.id)
+            .where(or_(Alert.last_sent == None, Alert.last_sent < day_start))
+            .where(Alert.alert_time <= local_now.time().replace(tzinfo=None))
+            .where(or_(
+                Alert.cadence == "daily",
+                and_(Alert.cadence == "weekly", Alert.weekday_mask.op("&")(weekday_bit) != 0)
+            ))
+        )
+
+        for alert, user in result.all():
+            # Check inventory
+            low_inventory = []
+            if alert.alert_on_low_inventory:
+                inv_result = await db.execute(
+                    select(ChemicalInventory)
+                    .where(ChemicalInventory.user_id == alert.user_id)
+                    .where(ChemicalInventory.is_low_stock)
+                )
+                low_inventory = inv_result.scalars().all()
             
-            elif alert.cadence == "weekly":
-                weekday = now.isoweekday() % 7  # Convert to 0=Sunday
-                if weekday in alert.days_of_week:
-                    if not alert.last_sent or alert.last_sent.date() < now.date():
-                        should_send = True
+            forecasts = {}
+            if low_inventory:
+                forecasts = await forecast(db, ChemicalInventory.id.in_([item.id for item in low_inventory]))
+
+            # Check tasks
+            due_tasks = []
+            if alert.alert_on_due_tasks:
+                tasks_result = await db.execute(
+                    select(MaintenanceTask)
+                    .where(MaintenanceTask.pool_id == alert.pool_id)
+                    .where(MaintenanceTask.next_due_date <= today)
+                )
+                due_tasks = tasks_result.scalars().all()
             
-            if should_send:
-                # Check inventory
-                low_inventory = []
-                if alert.alert_on_low_inventory:
-                    inv_result = await db.execute(
-                        select(ChemicalInventory)
-                        .where(ChemicalInventory.user_id == alert.user_id)
-                    )
-                    for item in inv_result.scalars():
-                        if item.quantity_on_hand <= item.reorder_threshold:
-                            low_inventory.append(item)
-                
-                # Check tasks
-                due_tasks = []
-                if alert.alert_on_due_tasks:
-                    today = date.today()
-                    tasks_result = await db.execute(
-                        select(MaintenanceTask)
-                        .where(MaintenanceTask.user_id == alert.user_id)
-                        .where(MaintenanceTask.next_due_date <= today)
-                    )
-                    due_tasks = tasks_result.scalars().all()
+            # Send email if there's something to report
+            if low_inventory or due_tasks:
+                email_body = create_alert_email(low_inventory, due_tasks, forecasts)
+                await send_email(
+                    recipient=user.email,
+                    subject=f"Pool Alert: {alert.name}",
+                    body=email_body
+                )
                 
-                # Send email if there's something to report
-                if low_inventory or due_tasks:
-                    email_body = create_alert_email(low_inventory, due_tasks)
-                    await send_email(
-                        recipient=user.email,
-                        subject=f"Pool Alert: {alert.name}",
-                        body=email_body
-                    )
-                    
-                    # Update last_sent
-                    alert.last_sent = now
+                # Update last_sent
+                alert.last_sent = now
+                async with writer_lock():
                     await db.commit()
-                else:
-                    print(f"  No items to report for alert '{alert.name}'")
+                await publish_invalidations(db)
+            else:
+                print(f"  No items to report for alert '{alert.name}'")
+
+
+async def prune_sync_records():
+    """Drop tombstones and offline-write receipts older than the sync retention window"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+    async with AsyncSessionLocal() as db:
+        async with writer_lock():
+            tombstones = await db.execute(delete(SyncTombstone).where(SyncTombstone.deleted_at < cutoff))
+            receipts = await db.execute(delete(SyncReceipt).where(SyncReceipt.created_at < cutoff))
+            await db.commit()
+    if tombstones.rowcount or receipts.rowcount:
+        print(f"✓ Pruned {tombstones.rowcount} sync tombstones and {receipts.rowcount} receipts")
+
+
+async def prune_jobs():
+    """Drop finished background jobs older than the retention window"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.JOB_RETENTION_DAYS)
+    async with AsyncSessionLocal() as db:
+        async with writer_lock():
+            result = await db.execute(
+                delete(Job)
+                .where(Job.status.in_(("succeeded", "failed")))
+                .where(Job.finished_at < cutoff)
+            )
+            await db.commit()
+    if result.rowcount:
+        print(f"✓ Pruned {result.rowcount} finished jobs")
+
+
+async def snapshot_inventory() -> int:
+    """Roll the inventory ledger up into per-item balance snapshots"""
+    async with AsyncSessionLocal() as db:
+        async with writer_lock():
+            count = await take_snapshots(db)
+            await db.commit()
+    print(f"✓ Snapshotted {count} inventory balances")
+    return count
+
+
+async def reclassify_ranges() -> int:
+    """Bring readings.in_range in line with the current reading type ranges"""
+    async with AsyncSessionLocal() as db:
+        async with writer_lock():
+            changed = await reclassify_readings(db)
+            await db.commit()
+        await publish_invalidations(db)
+    if changed:
+        print(f"✓ Reclassified {changed} readings against updated ranges")
+    return changed
+
+
+# The same work on demand through POST /jobs/, e.g. right after changing a range
+@handler("reclassify_ranges")
+async def reclassify_ranges_job(ctx: JobContext) -> dict:
+    return {"changed": await reclassify_ranges()}
+
+
+@handler("snapshot_inventory")
+async def snapshot_inventory_job(ctx: JobContext) -> dict:
+    return {"snapshots": await snapshot_inventory()}
+
+
+# On demand, a user archives only their own data; the daily run covers everyone
+@handler("archive")
+async def archive_job(ctx: JobContext) -> dict:
+    return await archive_old_rows(ctx.user_id)
 
 
 # Create scheduler
 scheduler = AsyncIOScheduler()
 
 # Run alert check every 5 minutes
-scheduler.add_job(check_alerts, 'interval', minutes=5, id='check_alerts')
\ No newline at end of file
+scheduler.add_job(check_alerts, 'interval', minutes=5, id='check_alerts')
+
+# Prune sync bookkeeping once a day
+scheduler.add_job(prune_sync_records, 'interval', hours=24, id='prune_sync_records')
+
+# Reclassify readings at startup (picks up ranges changed by migrations) and hourly after that
+scheduler.add_job(reclassify_ranges, 'interval', hours=1, id='reclassify_ranges', next_run_time=datetime.now())
+
+# Snapshot inventory balances once a day
+scheduler.add_job(snapshot_inventory, 'interval', hours=24, id='snapshot_inventory')
+
+# Prune finished background jobs once a day
+scheduler.add_job(prune_jobs, 'interval', hours=24, id='prune_jobs')
+
+# Move readings and task history past ARCHIVE_AFTER_DAYS to archive files once a day
+scheduler.add_job(archive_old_rows, 'interval', hours=24, id='archive_old_rows')
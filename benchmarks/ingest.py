@@ -0,0 +1,82 @@
+"""
+Benchmark sensor sample ingestion.
+
+Posts NDJSON batches to POST /ingest/samples in-process against
+DATABASE_URL from several client threads, then waits until the buffer
+has been written and reports samples per second accepted (parsing and
+buffering) and written (end to end). Samples come from devices named
+bench-*, which are deleted afterwards; use a scratch database anyway.
+
+Usage:
+    python -m benchmarks.ingest [--samples 200000] [--batch 5000] [--clients 4]
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+
+
+def build_bodies(samples: int, batch: int, slugs: list) -> list:
+    start = datetime.now(timezone.utc) - timedelta(seconds=samples)
+    lines = [
+        json.dumps({
+            "device": f"bench-{i % 16}",
+            "type": slugs[i % len(slugs)],
+            "value": 7.0 + (i % 10) / 10,
+            "ts": (start + timedelta(seconds=i)).isoformat(),
+        })
+        for i in range(samples)
+    ]
+    return ["\n".join(lines[i:i + batch]).encode() for i in range(0, samples, batch)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=5000, help="Lines per request")
+    parser.add_argument("--clients", type=int, default=4)
+    args = parser.parse_args()
+
+    settings.SCHEDULER_ENABLED = False
+    from app.main import app
+    from app.database import engine
+    from app.models import SensorSample
+    from sqlalchemy import delete
+
+    with TestClient(app) as client:
+        slugs = [t["slug"] for t in client.get("/readings/types").json()]
+        bodies = build_bodies(args.samples, args.batch, slugs)
+        before = client.get("/health/ingest").json()["written"]
+
+        def post(body):
+            response = client.post("/ingest/samples", content=body, headers={"Content-Type": "application/x-ndjson"})
+            response.raise_for_status()
+            return response.json()["accepted"]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.clients) as pool:
+            accepted = sum(pool.map(post, bodies))
+        accepted_at = time.perf_counter()
+        while client.get("/health/ingest").json()["written"] - before < accepted:
+            time.sleep(0.01)
+        written_at = time.perf_counter()
+        stats = client.get("/health/ingest").json()
+
+        async def cleanup():
+            async with engine.begin() as conn:
+                await conn.execute(delete(SensorSample).where(SensorSample.device.like("bench-%")))
+        client.portal.call(cleanup)
+
+    print(f"samples:            {accepted}")
+    print(f"accepted:           {accepted / (accepted_at - started):10.0f} samples/s")
+    print(f"written:            {accepted / (written_at - started):10.0f} samples/s")
+    print(f"batches written:    {stats['batches']} (last {stats['last_flush_ms']} ms)")
+
+
+if __name__ == "__main__":
+    main()
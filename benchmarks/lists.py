@@ -0,0 +1,163 @@
+"""
+Benchmark the list endpoints' read path: ORM instances vs column-only rows.
+
+Creates a scratch pool named bench-lists in DATABASE_URL and fills it with
+tasks, alerts and readings. Then it runs each list query both ways. The old
+way loads ORM instances and validates them through the response model. The
+new way calls the routes, which select only the needed columns and encode
+them with orjson (app.rows). It reports rows per second and the peak memory
+allocated per request. The pool and everything in it are deleted afterwards;
+use a scratch database anyway.
+
+Usage:
+    python -m benchmarks.lists [--rows 5000] [--requests 20]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from datetime import date, time as clock, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select
+
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.models import User, Pool, MaintenanceTask, Alert, ReadingType, Reading
+from app.schemas import TaskResponse, AlertResponse, ReadingChartPoint
+from app.api.routes.tasks import list_tasks
+from app.api.routes.alerts import list_alerts
+from app.api.routes.readings import list_readings
+
+POOL_NAME = "bench-lists"
+
+
+async def seed(rows: int):
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.email == settings.DEFAULT_USER_EMAIL))).scalar_one()
+        reading_type = (await db.execute(select(ReadingType).order_by(ReadingType.slug).limit(1))).scalar_one()
+    user_id, reading_type_id = user.id, reading_type.id
+    async with engine.begin() as conn:
+        await conn.execute(delete(Pool).where(Pool.user_id == user_id, Pool.name == POOL_NAME))
+        pool_id = uuid.uuid4()
+        await conn.execute(insert(Pool).values(id=pool_id, user_id=user_id, name=POOL_NAME))
+        today = date.today()
+        await conn.execute(insert(MaintenanceTask), [
+            {
+                "id": uuid.uuid4(), "user_id": user_id, "pool_id": pool_id, "name": f"Task {i}",
+                "description": "Brush walls and steps, empty skimmer baskets", "frequency_days": 7,
+                "next_due_date": today + timedelta(days=i % 30), "last_completed_date": today - timedelta(days=i % 7),
+                "last_completion_notes": "Water looked clear",
+            }
+            for i in range(rows)
+        ])
+        await conn.execute(insert(Alert), [
+            {
+                "id": uuid.uuid4(), "user_id": user_id, "pool_id": pool_id, "name": f"Alert {i}",
+                "cadence": "weekly", "weekday_mask": 0b0101010, "alert_time": clock(8, 30), "alert_on_due_tasks": True,
+            }
+            for i in range(rows)
+        ])
+        await conn.execute(insert(Reading), [
+            {
+                "id": uuid.uuid4(), "user_id": user_id, "pool_id": pool_id, "reading_type_id": reading_type_id,
+                "reading_value": 7.2 + (i % 7) / 10, "reading_date": today - timedelta(days=i % 365), "in_range": True,
+            }
+            for i in range(rows)
+        ])
+    return user, Pool(id=pool_id, user_id=user_id, name=POOL_NAME), reading_type
+
+
+def cases(user, pool, reading_type):
+    """(route, ORM path, column-only path); each returns the JSON body"""
+    tasks = TypeAdapter(List[TaskResponse])
+    alerts = TypeAdapter(List[AlertResponse])
+    points = TypeAdapter(List[ReadingChartPoint])
+    days = 366
+    cutoff = date.today() - timedelta(days=days)
+    scope = {"current_user": user, "current_pool": pool}
+
+    async def tasks_orm(db):
+        result = await db.execute(
+            select(MaintenanceTask).where(MaintenanceTask.pool_id == pool.id).order_by(MaintenanceTask.next_due_date)
+        )
+        return tasks.dump_json(tasks.validate_python(result.scalars().all(), from_attributes=True))
+
+    async def alerts_orm(db):
+        result = await db.execute(select(Alert).where(Alert.pool_id == pool.id))
+        return alerts.dump_json(alerts.validate_python(result.scalars().all(), from_attributes=True))
+
+    async def readings_orm(db):
+        result = await db.execute(
+            select(Reading)
+            .where(Reading.pool_id == pool.id, Reading.reading_type_id == reading_type.id, Reading.reading_date >= cutoff)
+            .order_by(Reading.reading_date)
+        )
+        return points.dump_json([
+            ReadingChartPoint(id=r.id, reading_date=r.reading_date.isoformat(), reading_value=float(r.reading_value))
+            for r in result.scalars().all()
+        ])
+
+    # The routes themselves, minus @cached
+    async def tasks_rows(db):
+        return (await list_tasks.__wrapped__(db=db, **scope)).body
+
+    async def alerts_rows(db):
+        return (await list_alerts.__wrapped__(db=db, **scope)).body
+
+    async def readings_rows(db):
+        return (await list_readings.__wrapped__(slug=reading_type.slug, days=days, db=db, **scope)).body
+
+    return [
+        ("/tasks/", tasks_orm, tasks_rows),
+        ("/alerts/", alerts_orm, alerts_rows),
+        ("/readings/", readings_orm, readings_rows),
+    ]
+
+
+async def measure(run, requests: int):
+    """(seconds per request, peak bytes allocated in one request)"""
+    async with AsyncSessionLocal() as db:
+        await run(db)  # Warm up the statement cache
+    started = time.perf_counter()
+    for _ in range(requests):
+        async with AsyncSessionLocal() as db:  # A fresh session per request, like get_read_db
+            await run(db)
+    elapsed = (time.perf_counter() - started) / requests
+
+    tracemalloc.start()
+    async with AsyncSessionLocal() as db:
+        await run(db)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+async def bench(rows: int, requests: int):
+    user, pool, reading_type = await seed(rows)
+    try:
+        print(f"{'route':<12} {'path':<8} {'rows/s':>10} {'ms/req':>8} {'peak MiB':>9}")
+        for route, orm, core in cases(user, pool, reading_type):
+            async with AsyncSessionLocal() as db:
+                assert await orm(db) == await core(db), f"{route}: bodies differ"
+            for label, run in (("orm", orm), ("rows", core)):
+                seconds, peak = await measure(run, requests)
+                print(f"{route:<12} {label:<8} {rows / seconds:>10.0f} {seconds * 1000:>8.2f} {peak / 2**20:>9.2f}")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(Pool).where(Pool.id == pool.id))
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=5000, help="Rows per list")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(bench(args.rows, args.requests))
+
+
+if __name__ == "__main__":
+    main()
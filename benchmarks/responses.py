@@ -0,0 +1,183 @@
+"""
+Benchmark response encoding and compression for the list endpoints.
+
+Builds the same response models that list_readings, list_tasks and
+get_task_completion_history return, serves them from throwaway apps and
+reports time per request and bytes on the wire. The setups are FastAPI
+defaults, the orjson + compression setup in app/main.py, and routes that
+return bytes already encoded by their response model (what @cached and
+GET /sync/ do). ORJSONResponse alone only replaces the last step: FastAPI
+still validates the return value against the response model and turns it
+into JSON-ready dicts and strings before orjson sees it.
+
+Usage:
+    python -m benchmarks.responses [--rows 2000] [--requests 200]
+"""
+import argparse
+import asyncio
+import time
+import timeit
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+from brotli_asgi import BrotliMiddleware
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.schemas import (
+    ReadingChartPoint, TaskResponse, PaginatedTaskCompletionHistoryResponse
+)
+
+
+def build_payloads(rows: int):
+    today = date.today()
+    user_id = uuid.uuid4()
+    pool_id = uuid.uuid4()
+    task_id = uuid.uuid4()
+    readings = [
+        {"id": uuid.uuid4(), "reading_date": (today - timedelta(days=i)).isoformat(), "reading_value": 7.2 + (i % 7) / 10}
+        for i in range(rows)
+    ]
+    tasks = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "pool_id": pool_id,
+            "name": f"Task {i}",
+            "description": "Brush walls and steps, empty skimmer baskets",
+            "frequency_days": 7,
+            "next_due_date": today + timedelta(days=i % 30),
+            "last_completed_date": today - timedelta(days=i % 7),
+            "last_completion_notes": "Water looked clear",
+        }
+        for i in range(rows)
+    ]
+    history = {
+        "items": [
+            {
+                "id": uuid.uuid4(),
+                "task_id": task_id,
+                "completed_date": today - timedelta(days=i),
+                "notes": "Backwashed filter",
+                "created_at": datetime.now(timezone.utc),
+            }
+            for i in range(min(rows, 100))
+        ],
+        "total": rows,
+        "page": 1,
+        "page_size": 100,
+        "total_pages": max(1, rows // 100),
+    }
+    return readings, tasks, history
+
+
+def build_app(payloads, optimized: bool, preserialized: bool = False) -> FastAPI:
+    readings, tasks, history = payloads
+    app = FastAPI(default_response_class=ORJSONResponse if optimized else JSONResponse)
+    if optimized:
+        app.add_middleware(
+            BrotliMiddleware,
+            quality=settings.COMPRESSION_QUALITY,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            gzip_fallback=True
+        )
+
+    def serve(model, payload):
+        if not preserialized:
+            return payload
+        adapter = TypeAdapter(model)
+        return Response(adapter.dump_json(adapter.validate_python(payload)), media_type="application/json")
+
+    @app.get("/readings/", response_model=List[ReadingChartPoint])
+    async def list_readings():
+        return serve(List[ReadingChartPoint], readings)
+
+    @app.get("/tasks/", response_model=List[TaskResponse])
+    async def list_tasks():
+        return serve(List[TaskResponse], tasks)
+
+    @app.get("/tasks/history", response_model=PaginatedTaskCompletionHistoryResponse)
+    async def get_task_completion_history():
+        return serve(PaginatedTaskCompletionHistoryResponse, history)
+
+    return app
+
+
+def run(app: FastAPI, path: str, requests: int, encoding: str):
+    client = TestClient(app)
+    headers = {"Accept-Encoding": encoding}
+    # Warm up, and measure the size actually sent on the wire
+    response = client.get(path, headers=headers)
+    wire_bytes = int(response.headers.get("content-length", len(response.content)))
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path, headers=headers)
+    elapsed = time.perf_counter() - start
+    return elapsed / requests * 1000, wire_bytes
+
+
+def encode_times(payloads):
+    """(ms through response_model + ORJSONResponse, ms pre-serialized) per route"""
+    readings, tasks, history = payloads
+    loop = asyncio.new_event_loop()
+    results = []
+    for model, payload in (
+        (List[ReadingChartPoint], readings),
+        (List[TaskResponse], tasks),
+        (PaginatedTaskCompletionHistoryResponse, history),
+    ):
+        field = create_response_field(name="response", type_=model)
+        adapter = TypeAdapter(model)
+
+        def through_fastapi():
+            content = loop.run_until_complete(serialize_response(field=field, response_content=payload, is_coroutine=True))
+            return ORJSONResponse(content).body
+
+        def preserialized():
+            return adapter.dump_json(adapter.validate_python(payload))
+
+        assert through_fastapi() == preserialized()
+        timings = [min(timeit.repeat(encode, number=20, repeat=7)) / 20 * 1000 for encode in (through_fastapi, preserialized)]
+        results.append(timings)
+    loop.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = build_payloads(args.rows)
+    baseline = build_app(payloads, optimized=False)
+    optimized = build_app(payloads, optimized=True)
+    preserialized = build_app(payloads, optimized=True, preserialized=True)
+
+    print(f"{'route':<14} {'setup':<22} {'ms/req':>8} {'bytes':>10}")
+    for path in ("/readings/", "/tasks/", "/tasks/history"):
+        for label, app, encoding in (
+            ("default json", baseline, "identity"),
+            ("orjson", optimized, "identity"),
+            ("pre-serialized", preserialized, "identity"),
+            ("orjson + gzip", optimized, "gzip"),
+            ("orjson + brotli", optimized, "br"),
+        ):
+            ms, size = run(app, path, args.requests, encoding)
+            print(f"{path:<14} {label:<22} {ms:>8.2f} {size:>10}")
+
+    # Encoding alone, without the test client's noise
+    print(f"\n{'route':<14} {'response_model + orjson':>24} {'pre-serialized':>15}")
+    for path, (through_fastapi, preserialized) in zip(("/readings/", "/tasks/", "/tasks/history"), encode_times(payloads)):
+        print(f"{path:<14} {through_fastapi:>21.2f} ms {preserialized:>12.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
 #!/bin/bash
 set -e
 
-echo "Waiting for PostgreSQL..."
-until pg_isready -h db -U ${DB_USER:-pooluser}; do
-  sleep 1
-done
+# Used by the app to report cold-start timings
+export BOOT_STARTED_AT=$(date +%s.%N)
 
-echo "Running database migrations..."
-alembic upgrade head
+echo "Waiting for PostgreSQL and checking migrations..."
+python -m app.boot
+
+echo "Building static assets..."
+python -m app.assets
 
 echo "Starting application..."
 exec gunicorn app.main:app \
@@ -11,6 +11,14 @@ let taskCompletionHistory = [];
 let currentHistoryPage = 1;
 let historyPageSize = 15;
 let historyTotalPages = 1;
+let inventoryItems = [];
+let latestReadings = [];
+let chartSlug = null;
+let chartSeries = {};  // slug -> {days: points sorted by date}, fetched once and patched live
+let liveUpdates = false;  // True while the /events stream is connected
+let outboxCount = 0;  // Writes waiting in IndexedDB for the connection to return
+let apiReachable = true;  // Last health check or replay reached the server
+let poolId = null;  // The UI works on the account's first pool (the API default)
 
 // Utility functions - $ returns ONE element, $$ returns ALL matching elements
 function $(selector) {
@@ -59,6 +67,11 @@ function getTodayDate() {
     return new Date().toISOString().split('T')[0];
 }
 
+function getLocalDate() {
+    const now = new Date();
+    return new Date(now.getTime() - now.getTimezoneOffset() * 60000).toISOString().split('T')[0];
+}
+
 function getFutureDate(days) {
     const date = new Date();
     date.setDate(date.getDate() + days);
@@ -87,7 +100,9 @@ async function api(endpoint, options = {}) {
             } catch (e) {
                 // Ignore
             }
-            throw new Error(errorMsg);
+            const error = new Error(errorMsg);
+            error.status = response.status;
+            throw error;
         }
         
         if (response.status === 204) return null;
@@ -100,8 +115,387 @@ async function api(endpoint, options = {}) {
     }
 }
 
+// Dashboard - one round trip for several sections
+async function loadDashboard(fields) {
+    const query = fields ? `?fields=${fields.join(',')}` : '';
+    return api(`/dashboard/${query}`);
+}
+
+// Offline outbox - writes are queued in IndexedDB and replayed in batches
+// through POST /sync/, so nothing typed at the pool is lost without signal
+const OUTBOX_DB = 'pool-manager';
+const OUTBOX_STORE = 'outbox';
+const OUTBOX_BATCH = 50;  // Operations per POST /sync/
+const QUEUED = { queued: true };  // mutate() result when a write is waiting offline
+
+let outboxDb = null;
+let outboxFlush = null;
+let outboxNextFlush = null;
+const outboxWaiters = {};  // op id -> resolve/reject of the mutate() call waiting on it
+
+// Which entity each operation changes, for applying its result locally
+const OPERATION_ENTITIES = {
+    'task.create': 'task', 'task.update': 'task', 'task.complete': 'task', 'task.delete': 'task',
+    'inventory.create': 'inventory', 'inventory.update': 'inventory', 'inventory.delete': 'inventory',
+    'reading.create': 'reading', 'reading.delete': 'reading'
+};
+
+function newId() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+    // crypto.randomUUID needs a secure context; plain http on the LAN doesn't have one
+    const bytes = crypto.getRandomValues(new Uint8Array(16));
+    bytes[6] = (bytes[6] & 0x0f) | 0x40;
+    bytes[8] = (bytes[8] & 0x3f) | 0x80;
+    const hex = Array.from(bytes, b => b.toString(16).padStart(2, '0')).join('');
+    return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
+
+function openOutbox() {
+    if (!outboxDb) {
+        outboxDb = new Promise(function(resolve, reject) {
+            const request = indexedDB.open(OUTBOX_DB, 1);
+            request.onupgradeneeded = () => request.result.createObjectStore(OUTBOX_STORE, { keyPath: 'seq', autoIncrement: true });
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+    }
+    return outboxDb;
+}
+
+async function outboxStore(mode, work) {
+    const db = await openOutbox();
+    return new Promise(function(resolve, reject) {
+        const tx = db.transaction(OUTBOX_STORE, mode);
+        const request = work(tx.objectStore(OUTBOX_STORE));
+        tx.oncomplete = () => resolve(request ? request.result : undefined);
+        tx.onerror = () => reject(tx.error);
+    });
+}
+
+function isOfflineError(error) {
+    // fetch() rejects without a status when the network is down; proxies answer 502-504
+    return !error.status || [502, 503, 504].includes(error.status);
+}
+
+// Queue a write and try to send it now. Resolves with the saved row (null for
+// deletes), or QUEUED when it has to wait for the connection; rejects if the
+// server refuses it (same "HTTP <status>: ..." errors as api()).
+async function mutate(op, target, data) {
+    const entry = { id: newId(), op, target: target || null, data: data || {}, queued_at: Date.now() };
+
+    if (!window.indexedDB) {
+        const response = await api('/sync/', { method: 'POST', body: JSON.stringify({ operations: [entry] }) });
+        return settleResult(entry, response.results[0]);
+    }
+
+    const done = new Promise((resolve, reject) => outboxWaiters[entry.id] = { resolve, reject });
+    await outboxStore('readwrite', store => store.add(entry));
+    await flushOutbox();
+
+    if (outboxWaiters[entry.id]) {
+        // Still queued: show it locally now, the replay will reconcile
+        delete outboxWaiters[entry.id];
+        applyOptimistic(entry);
+        return QUEUED;
+    }
+    return done;
+}
+
+function flushOutbox() {
+    if (outboxFlush) {
+        // A replay is running; chain one more so writes queued meanwhile go out too
+        if (!outboxNextFlush) {
+            outboxNextFlush = outboxFlush.then(function() {
+                outboxNextFlush = null;
+                return flushOutbox();
+            });
+        }
+        return outboxNextFlush;
+    }
+    outboxFlush = replayOutbox().finally(() => outboxFlush = null);
+    return outboxFlush;
+}
+
+async function replayOutbox() {
+    let replayedQueued = false;
+    while (true) {
+        const entries = await outboxStore('readonly', store => store.getAll(null, OUTBOX_BATCH));
+        outboxCount = entries.length;
+        if (entries.length === 0) break;
+
+        let response;
+        try {
+            response = await api('/sync/', {
+                method: 'POST',
+                body: JSON.stringify({ operations: entries.map(({ id, op, target, data }) => ({ id, op, target, data })) })
+            });
+        } catch (error) {
+            if (isOfflineError(error) || error.status >= 500 || [408, 429].includes(error.status)) {
+                apiReachable = false;
+                break;  // Keep everything queued; retried when we're back online
+            }
+            // The batch itself was refused; retrying it would block the queue forever
+            console.error('Outbox batch rejected:', error);
+            response = { results: entries.map(() => ({ status: error.status, detail: error.message })) };
+        }
+
+        // Each operation is settled (applied or refused) once the server answers
+        apiReachable = true;
+        await outboxStore('readwrite', store => entries.forEach(entry => store.delete(entry.seq)));
+        response.results.forEach(function(result, index) {
+            const entry = entries[index];
+            if (!outboxWaiters[entry.id]) replayedQueued = true;
+            settleResult(entry, result);
+        });
+    }
+
+    outboxCount = await outboxStore('readonly', store => store.count());
+    updateStatusBadge();
+
+    // Optimistic rows used temporary ids; reload the real ones
+    if (replayedQueued) resyncAll();
+}
+
+function settleResult(entry, result) {
+    const waiter = outboxWaiters[entry.id];
+    delete outboxWaiters[entry.id];
+
+    if (result.status >= 400) {
+        const error = new Error(`HTTP ${result.status}: ${result.detail || ''}`);
+        error.status = result.status;
+        if (waiter) {
+            waiter.reject(error);
+        } else {
+            showToast(`⚠ A change saved offline was rejected: ${result.detail || result.status}`, 5000);
+        }
+        return null;
+    }
+
+    const entity = OPERATION_ENTITIES[entry.op];
+    if (result.row) {
+        applyChange({ entity, op: 'upsert', id: result.row.id, row: result.row });
+    } else if (entry.op.endsWith('.delete')) {
+        applyChange({ entity, op: 'delete', id: entry.target, row: null });
+    }
+    if (entry.op === 'task.complete' && selectedTask && selectedTask.id === entry.target) {
+        loadTaskHistory(entry.target);
+    }
+    if (waiter) waiter.resolve(result.row || null);
+    return result.row || null;
+}
+
+function applyOptimistic(entry) {
+    const entity = OPERATION_ENTITIES[entry.op];
+    if (entry.op.endsWith('.delete')) {
+        applyChange({ entity, op: 'delete', id: entry.target, row: null });
+        return;
+    }
+
+    let row;
+    switch (entry.op) {
+        case 'task.complete': {
+            const task = allTasks.find(t => t.id === entry.target);
+            if (!task) return;
+            const next = new Date(`${entry.data.completed_date}T00:00:00`);
+            next.setDate(next.getDate() + task.frequency_days);
+            row = {
+                ...task,
+                last_completed_date: entry.data.completed_date,
+                last_completion_notes: entry.data.notes,
+                next_due_date: new Date(next.getTime() - next.getTimezoneOffset() * 60000).toISOString().split('T')[0]
+            };
+            break;
+        }
+        case 'task.update':
+        case 'inventory.update': {
+            const list = entity === 'task' ? allTasks : inventoryItems;
+            const current = list.find(item => item.id === entry.target);
+            if (!current) return;
+            row = { ...current, ...entry.data };
+            break;
+        }
+        case 'task.create':
+            row = { id: entry.id, ...entry.data, next_due_date: entry.data.next_due_date || getFutureDate(entry.data.frequency_days) };
+            break;
+        default:
+            row = { id: entry.id, ...entry.data };
+    }
+    applyChange({ entity, op: 'upsert', id: row.id, row });
+}
+
+function updateStatusBadge() {
+    const statusBadge = $('#statusBadge');
+    if (!statusBadge) return;
+    const online = apiReachable && navigator.onLine !== false;
+    statusBadge.className = online && outboxCount === 0 ? 'badge badge-ok' : 'badge badge-error';
+    statusBadge.textContent = (online ? '● Online' : '● Offline') + (outboxCount ? ` (${outboxCount} queued)` : '');
+}
+
+// Cached reads: the service worker answers from cache and posts the fresh copy when it differs
+function applyRefresh(url, body) {
+    const path = new URL(url).pathname;
+    if (path === '/dashboard/') {
+        if (body.tasks) {
+            renderTasks(body.tasks);
+            refreshSelectedTask();
+        }
+        if (body.inventory) renderInventory(body.inventory);
+        if (body.reading_types) readingTypes = body.reading_types;
+        if (body.latest_readings) renderQuickEntryTable(body.latest_readings);
+    } else if (path === '/tasks/') {
+        renderTasks(body);
+        refreshSelectedTask();
+    } else if (path === '/inventory/') {
+        renderInventory(body);
+    } else if (path === '/readings/series') {
+        body.series.forEach(series => setChartSeries(series.slug, CHART_DAYS, series.points));
+        if (chartSlug && currentTab === 'readings' && chartSeries[chartSlug]) {
+            renderChart(chartSlug, chartSeries[chartSlug][CHART_DAYS] || []);
+        }
+    } else if (path === '/readings/') {
+        const params = new URL(url).searchParams;
+        const slug = params.get('slug');
+        const points = setChartSeries(slug, Number(params.get('days')), body);
+        if (slug === chartSlug && currentTab === 'readings') renderChart(slug, points);
+    }
+}
+
+function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+    navigator.serviceWorker.register('./sw.js').catch(function(error) {
+        // Needs https (or localhost); the app still works, just not offline
+        console.warn('Service worker not registered:', error);
+    });
+    navigator.serviceWorker.addEventListener('message', function(e) {
+        if (e.data && e.data.type === 'api-refresh') applyRefresh(e.data.url, e.data.body);
+    });
+}
+
+// Live updates - patch local state from server-sent change events
+function connectEvents() {
+    if (!window.EventSource) return;
+
+    const source = new EventSource(`${API_BASE}/events/`);
+    let connectedBefore = false;
+
+    source.addEventListener('ready', function() {
+        // Changes made while we were disconnected were missed; reload once
+        if (connectedBefore) resyncAll();
+        connectedBefore = true;
+        liveUpdates = true;
+    });
+    source.addEventListener('change', function(e) {
+        applyChange(JSON.parse(e.data));
+    });
+    source.addEventListener('resync', function() {
+        resyncAll();
+    });
+    source.addEventListener('error', function() {
+        // EventSource reconnects on its own; fall back to fetching until it does
+        liveUpdates = false;
+    });
+}
+
+async function resyncAll() {
+    try {
+        const data = await loadDashboard(['tasks', 'inventory', 'reading_types', 'latest_readings']);
+        renderTasks(data.tasks);
+        refreshSelectedTask();
+        renderInventory(data.inventory);
+        renderReadingTypes(data.reading_types, data.latest_readings);
+        // Cached chart series may have missed changes too
+        chartSeries = {};
+        if (currentTab === 'readings') loadReadings();
+    } catch (error) {
+        console.error('Failed to resync:', error);
+    }
+}
+
+function upsertById(list, row) {
+    const index = list.findIndex(item => item.id === row.id);
+    if (index >= 0) {
+        list[index] = row;
+    } else {
+        list.push(row);
+    }
+    return list;
+}
+
+function applyChange(change) {
+    // Events cover the whole account; skip rows from the user's other pools
+    if (poolId && change.row && change.row.pool_id && change.row.pool_id !== poolId) return;
+    switch (change.entity) {
+        case 'task':
+            allTasks = change.op === 'delete'
+                ? allTasks.filter(t => t.id !== change.id)
+                : upsertById(allTasks, change.row);
+            allTasks.sort((a, b) => a.next_due_date.localeCompare(b.next_due_date));
+            renderTasks(allTasks);
+            refreshSelectedTask();
+            break;
+        case 'task_history':
+            // Only the visible page of the selected task's history needs refreshing
+            if (selectedTask && change.row && change.row.task_id === selectedTask.id &&
+                !taskCompletionHistory.some(h => h.id === change.id)) {
+                loadTaskHistory(selectedTask.id, currentHistoryPage);
+            }
+            break;
+        case 'inventory':
+            renderInventory(change.op === 'delete'
+                ? inventoryItems.filter(i => i.id !== change.id)
+                : upsertById(inventoryItems, change.row));
+            break;
+        case 'reading':
+            applyReadingChange(change);
+            break;
+        case 'reading_type':
+            loadReadingTypes();
+            break;
+    }
+}
+
+function applyReadingChange(change) {
+    const reading = change.row;
+    if (!reading) {
+        // Deletes carry no row; the latest value has to come from the server
+        loadQuickEntryTable();
+        let visible = false;
+        for (const [slug, ranges] of Object.entries(chartSeries)) {
+            for (const points of Object.values(ranges)) {
+                const index = points.findIndex(p => p.id === change.id);
+                if (index < 0) continue;
+                points.splice(index, 1);
+                if (slug === chartSlug) visible = true;
+            }
+        }
+        if (visible && currentTab === 'readings') renderChart(chartSlug, chartSeries[chartSlug][CHART_DAYS] || []);
+        return;
+    }
+
+    const slug = reading.reading_type_slug;
+    const current = latestReadings.find(r => r.reading_type_slug === slug);
+    if (!current || reading.reading_date >= current.reading_date) {
+        latestReadings = latestReadings.filter(r => r.reading_type_slug !== slug);
+        latestReadings.push({
+            reading_type_slug: slug,
+            reading_value: reading.reading_value,
+            reading_date: reading.reading_date
+        });
+        renderQuickEntryTable(latestReadings);
+    }
+
+    // Append to every cached range it falls in, so switching back is still instant
+    for (const [days, points] of Object.entries(chartSeries[slug] || {})) {
+        if (reading.reading_date < getFutureDate(-Number(days))) continue;
+        if (addChartPoint(points, toChartPoint(reading)) && slug === chartSlug &&
+            Number(days) === CHART_DAYS && currentTab === 'readings') {
+            renderChart(slug, points);
+        }
+    }
+}
+
 // Tab switching
-function switchTab(tabName) {
+function switchTab(tabName, loadData = true) {
     console.log('Switching to tab:', tabName);
     currentTab = tabName;
     
@@ -123,13 +517,15 @@ function switchTab(tabName) {
         targetBtn.classList.add('active');
     }
     
-    // Load tab data
+    if (!loadData) return;
+
+    // Load tab data (while live updates are connected, local state is current)
     switch(tabName) {
         case 'tasks':
-            loadTasks();
+            if (!liveUpdates) loadTasks();
             break;
         case 'inventory':
-            loadInventory();
+            if (!liveUpdates) loadInventory();
             break;
         case 'readings':
             // Only load readings if readingTypes are already loaded
@@ -167,32 +563,7 @@ async function loadTasks() {
     if (taskSelectContainer) taskSelectContainer.style.display = 'none';
     
     try {
-        allTasks = await api('/tasks/');
-        console.log('Loaded tasks:', allTasks.length);
-        loading.style.display = 'none';
-        
-        if (!allTasks || allTasks.length === 0) {
-            if (empty) empty.style.display = 'block';
-            return;
-        }
-        
-        // Show the select container
-        if (taskSelectContainer) taskSelectContainer.style.display = 'block';
-        
-        // Populate dropdown
-        if (taskSelect) {
-            taskSelect.innerHTML = '<option value="">Select a task...</option>' +
-                allTasks.map(task => {
-                    const dueDate = new Date(task.next_due_date);
-                    const today = new Date();
-                    today.setHours(0, 0, 0, 0);
-                    dueDate.setHours(0, 0, 0, 0);
-                    const isOverdue = dueDate < today;
-                    const indicator = isOverdue ? '⚠ ' : '';
-                    return `<option value="${task.id}">${indicator}${escapeHtml(task.name)}</option>`;
-                }).join('');
-        }
-        
+        renderTasks(await api('/tasks/'));
     } catch (error) {
         console.error('Failed to load tasks:', error);
         loading.style.display = 'none';
@@ -201,6 +572,40 @@ async function loadTasks() {
     }
 }
 
+function renderTasks(tasks) {
+    const loading = $('#tasksLoading');
+    const taskSelect = $('#taskSelect');
+    const empty = $('#tasksEmpty');
+    const taskSelectContainer = taskSelect?.parentElement?.parentElement;
+
+    allTasks = tasks;
+    if (loading) loading.style.display = 'none';
+    
+    if (!allTasks || allTasks.length === 0) {
+        if (empty) empty.style.display = 'block';
+        if (taskSelectContainer) taskSelectContainer.style.display = 'none';
+        return;
+    }
+    
+    // Show the select container
+    if (empty) empty.style.display = 'none';
+    if (taskSelectContainer) taskSelectContainer.style.display = 'block';
+    
+    // Populate dropdown
+    if (taskSelect) {
+        taskSelect.innerHTML = '<option value="">Select a task...</option>' +
+            allTasks.map(task => {
+                const dueDate = new Date(task.next_due_date);
+                const today = new Date();
+                today.setHours(0, 0, 0, 0);
+                dueDate.setHours(0, 0, 0, 0);
+                const isOverdue = dueDate < today;
+                const indicator = isOverdue ? '⚠ ' : '';
+                return `<option value="${task.id}">${indicator}${escapeHtml(task.name)}</option>`;
+            }).join('');
+    }
+}
+
 async function selectTask(taskId) {
     if (!taskId) {
         $('#taskDetailsCard').style.display = 'none';
@@ -214,30 +619,55 @@ async function selectTask(taskId) {
 
     // Reset pagination state when selecting a new task
     currentHistoryPage = 1;
-    
+    renderTaskDetails(selectedTask);
+
+    // Load completion history
+    await loadTaskHistory(taskId);
+}
+
+// Keep the selection and details in sync after the task list changes
+function refreshSelectedTask() {
+    if (!selectedTask) return;
+
+    const taskSelect = $('#taskSelect');
+    const task = allTasks.find(t => t.id === selectedTask.id);
+    if (!task) {
+        selectedTask = null;
+        if (taskSelect) taskSelect.value = '';
+        $('#taskDetailsCard').style.display = 'none';
+        $('#taskHistoryCard').style.display = 'none';
+        return;
+    }
+
+    selectedTask = task;
+    if (taskSelect) taskSelect.value = task.id;
+    renderTaskDetails(task);
+}
+
+function renderTaskDetails(task) {
     // Show task details
     const detailsCard = $('#taskDetailsCard');
     detailsCard.style.display = 'block';
     
-    $('#taskDetailName').textContent = selectedTask.name;
-    $('#taskDetailDescription').textContent = selectedTask.description || '';
-    $('#taskDetailDescription').style.display = selectedTask.description ? 'block' : 'none';
-    $('#taskDetailFrequency').textContent = `Every ${selectedTask.frequency_days} days`;
-    $('#taskDetailNextDue').textContent = formatDate(selectedTask.next_due_date);
+    $('#taskDetailName').textContent = task.name;
+    $('#taskDetailDescription').textContent = task.description || '';
+    $('#taskDetailDescription').style.display = task.description ? 'block' : 'none';
+    $('#taskDetailFrequency').textContent = `Every ${task.frequency_days} days`;
+    $('#taskDetailNextDue').textContent = formatDate(task.next_due_date);
     
-    if (selectedTask.last_completed_date) {
-        const lastDate = new Date(selectedTask.last_completed_date);
+    if (task.last_completed_date) {
+        const lastDate = new Date(task.last_completed_date);
         const today = new Date();
         const daysSince = Math.floor((today - lastDate) / (1000 * 60 * 60 * 24));
         
-        $('#taskDetailLastCompleted').textContent = formatDate(selectedTask.last_completed_date);
+        $('#taskDetailLastCompleted').textContent = formatDate(task.last_completed_date);
         $('#taskDetailDaysSince').textContent = daysSince + ' days';
         
         // Color code based on frequency
         const daysSinceEl = $('#taskDetailDaysSince');
-        if (daysSince >= selectedTask.frequency_days) {
+        if (daysSince >= task.frequency_days) {
             daysSinceEl.style.color = 'var(--danger)';
-        } else if (daysSince >= selectedTask.frequency_days * 0.8) {
+        } else if (daysSince >= task.frequency_days * 0.8) {
             daysSinceEl.style.color = 'var(--warning)';
         } else {
             daysSinceEl.style.color = 'var(--success)';
@@ -246,9 +676,6 @@ async function selectTask(taskId) {
         $('#taskDetailLastCompleted').textContent = 'Never';
         $('#taskDetailDaysSince').textContent = 'N/A';
     }
-    
-    // Load completion history
-    await loadTaskHistory(taskId);
 }
 
 async function loadTaskHistory(taskId, page = 1) {
@@ -263,6 +690,7 @@ async function loadTaskHistory(taskId, page = 1) {
         const response = await api(`/tasks/${taskId}/history?page=${page}&page_size=${historyPageSize}`);
 
         historyCard.style.display = 'block';
+        taskCompletionHistory = response.items;
         currentHistoryPage = response.page;
         historyTotalPages = response.total_pages;
 
@@ -372,17 +800,11 @@ async function submitTaskCompletion(notes) {
     if (!selectedTask) return;
     
     try {
-        const data = { notes: notes || null };
-        await api(`/tasks/${selectedTask.id}/complete`, { 
-            method: 'POST', 
-            body: JSON.stringify(data) 
-        });
-        
-        showToast('✓ Task marked as completed');
+        // Send the local date so a completion replayed tomorrow keeps today's date
+        const data = { notes: notes || null, completed_date: getLocalDate() };
+        const task = await mutate('task.complete', selectedTask.id, data);
         
-        // Reload tasks and reselect current task
-        await loadTasks();
-        await selectTask(selectedTask.id);
+        showToast(task === QUEUED ? '📴 Completion saved offline' : '✓ Task marked as completed');
         
     } catch (error) {
         console.error('Failed to complete task:', error);
@@ -418,16 +840,9 @@ async function submitTaskEdit(formData) {
     console.log('Updating task:', data);
     
     try {
-        await api(`/tasks/${selectedTask.id}`, { 
-            method: 'PUT', 
-            body: JSON.stringify(data) 
-        });
-        
-        showToast('✓ Task updated successfully');
+        const task = await mutate('task.update', selectedTask.id, data);
         
-        // Reload tasks and reselect
-        await loadTasks();
-        await selectTask(selectedTask.id);
+        showToast(task === QUEUED ? '📴 Task update saved offline' : '✓ Task updated successfully');
         
         return true;
     } catch (error) {
@@ -450,17 +865,14 @@ async function deleteTask() {
     if (!confirmDelete) return;
     
     try {
-        await api(`/tasks/${selectedTask.id}`, { method: 'DELETE' });
+        const result = await mutate('task.delete', selectedTask.id);
         
-        showToast('✓ Task deleted');
+        showToast(result === QUEUED ? '📴 Task deletion saved offline' : '✓ Task deleted');
         
-        // Close dialog and reload tasks
+        // Close dialog (the task was dropped locally by mutate)
         const dialog = $('#editTaskDialog');
         if (dialog) dialog.close();
         
-        selectedTask = null;
-        await loadTasks();
-        
     } catch (error) {
         console.error('Failed to delete task:', error);
         showToast('Failed to delete task');
@@ -485,34 +897,7 @@ async function loadInventory() {
     empty.style.display = 'none';
     
     try {
-        const items = await api('/inventory/');
-        console.log('Loaded inventory items:', items.length);
-        loading.style.display = 'none';
-        
-        if (!items || items.length === 0) {
-            empty.style.display = 'block';
-            return;
-        }
-        
-        list.style.display = 'grid';
-        list.innerHTML = items.map(item => {
-            const isLow = item.quantity_on_hand <= item.reorder_threshold;
-            const stockColor = isLow ? 'var(--danger)' : 'var(--success)';
-            const stockIcon = isLow ? '⚠' : '✓';
-            
-            return `
-                <div class="card">
-                    <h3>${escapeHtml(item.name)}</h3>
-                    <div class="card-meta">
-                        <span style="color: ${stockColor}; font-weight: 600;">
-                            ${stockIcon} ${item.quantity_on_hand} ${item.unit}
-                        </span>
-                        <span>Reorder at ${item.reorder_threshold}</span>
-                    </div>
-                    ${isLow ? '<p style="color: var(--danger); margin-top: 0.5rem;">Stock is low!</p>' : ''}
-                </div>
-            `;
-        }).join('');
+        renderInventory(await api('/inventory/'));
     } catch (error) {
         loading.style.display = 'none';
         showToast('Failed to load inventory');
@@ -520,86 +905,136 @@ async function loadInventory() {
     }
 }
 
+function renderInventory(items) {
+    const loading = $('#inventoryLoading');
+    const list = $('#inventoryList');
+    const empty = $('#inventoryEmpty');
+    if (!loading || !list || !empty) return;
+
+    inventoryItems = items;
+    loading.style.display = 'none';
+    
+    if (!items || items.length === 0) {
+        empty.style.display = 'block';
+        list.style.display = 'none';
+        return;
+    }
+    
+    empty.style.display = 'none';
+    list.style.display = 'grid';
+    list.innerHTML = items.map(item => {
+        const isLow = item.quantity_on_hand <= item.reorder_threshold;
+        const stockColor = isLow ? 'var(--danger)' : 'var(--success)';
+        const stockIcon = isLow ? '⚠' : '✓';
+        
+        return `
+            <div class="card">
+                <h3>${escapeHtml(item.name)}</h3>
+                <div class="card-meta">
+                    <span style="color: ${stockColor}; font-weight: 600;">
+                        ${stockIcon} ${item.quantity_on_hand} ${item.unit}
+                    </span>
+                    <span>Reorder at ${item.reorder_threshold}</span>
+                </div>
+                ${isLow ? '<p style="color: var(--danger); margin-top: 0.5rem;">Stock is low!</p>' : ''}
+            </div>
+        `;
+    }).join('');
+}
+
 // Readings
 async function loadReadingTypes() {
     try {
-        readingTypes = await api('/readings/types');
-
-        // Populate chart dropdown
-        const chartSelect = $('#chartReadingType');
-        if (chartSelect) {
-            chartSelect.innerHTML = '<option value="">Select type...</option>' +
-                readingTypes.map(type =>
-                    `<option value="${type.slug}">${type.name}</option>`
-                ).join('');
-
-            if (readingTypes.length > 0) {
-                chartSelect.value = readingTypes[0].slug;
-            }
-        }
-
-        // Populate reading entry table
-        await loadQuickEntryTable();
-
+        const data = await loadDashboard(['reading_types', 'latest_readings']);
+        renderReadingTypes(data.reading_types, data.latest_readings);
     } catch (error) {
         showToast('Failed to load reading types');
         console.error(error);
     }
 }
 
+function renderReadingTypes(types, latestReadings) {
+    readingTypes = types;
+
+    // Populate chart dropdown
+    const chartSelect = $('#chartReadingType');
+    if (chartSelect) {
+        chartSelect.innerHTML = '<option value="">Select type...</option>' +
+            readingTypes.map(type =>
+                `<option value="${type.slug}">${type.name}</option>`
+            ).join('');
+
+        if (readingTypes.length > 0) {
+            chartSelect.value = readingTypes[0].slug;
+        }
+    }
+
+    // Populate reading entry table
+    renderQuickEntryTable(latestReadings);
+}
+
 async function loadQuickEntryTable() {
+    try {
+        const data = await loadDashboard(['latest_readings']);
+        renderQuickEntryTable(data.latest_readings);
+    } catch (error) {
+        console.error('Failed to load latest readings:', error);
+    }
+}
+
+function renderQuickEntryTable(readings) {
     const tableBody = $('#quickReadingTableBody');
     if (!tableBody || !readingTypes) return;
 
-    // Get last 7 days of readings for each type
-    const today = getTodayDate();
-    const rows = [];
+    latestReadings = readings || [];
 
-    for (const type of readingTypes) {
-        try {
-            const readings = await api(`/readings/?slug=${type.slug}&days=7`);
-            const lastReading = readings.length > 0 ? readings[readings.length - 1] : null;
-            const lastValue = lastReading ? lastReading.reading_value : '-';
-            const lastDate = lastReading ? formatDate(lastReading.reading_date) : '-';
-
-            // Determine target range display
-            let targetRange = '-';
-            if (type.low !== null && type.high !== null) {
-                targetRange = `${type.low}-${type.high} ${type.unit || ''}`;
-            } else if (type.unit) {
-                targetRange = type.unit;
-            }
+    // Keep anything already typed when re-rendering after a change event
+    const typed = {};
+    $$('.quick-reading-input').forEach(input => typed[input.dataset.slug] = input.value);
 
-            rows.push(`
-                <tr style="border-bottom: 1px solid var(--border);">
-                    <td style="padding: 0.75rem 0.5rem;">
-                        <strong>${escapeHtml(type.name)}</strong>
-                        ${type.unit ? `<span style="color: var(--text-muted); font-size: 0.875rem;"> (${type.unit})</span>` : ''}
-                    </td>
-                    <td style="padding: 0.75rem 0.5rem; color: var(--text-muted); font-size: 0.875rem;">
-                        ${targetRange}
-                    </td>
-                    <td style="padding: 0.75rem 0.5rem;">
-                        <input
-                            type="number"
-                            step="0.01"
-                            class="quick-reading-input"
-                            data-slug="${type.slug}"
-                            placeholder="--"
-                            style="width: 100%; max-width: 120px; padding: 0.5rem; background: var(--bg-secondary); border: 1px solid var(--border); border-radius: 4px; color: var(--text); font-size: 0.875rem;"
-                        />
-                    </td>
-                    <td style="padding: 0.75rem 0.5rem; color: var(--text-muted); font-size: 0.875rem;">
-                        ${lastValue} ${lastDate !== '-' ? `<span style="color: var(--text-muted);"> (${lastDate})</span>` : ''}
-                    </td>
-                </tr>
-            `);
-        } catch (error) {
-            console.error(`Failed to load readings for ${type.slug}:`, error);
+    // Latest reading per type, keyed by slug
+    const latestBySlug = {};
+    latestReadings.forEach(r => latestBySlug[r.reading_type_slug] = r);
+
+    tableBody.innerHTML = readingTypes.map(type => {
+        const lastReading = latestBySlug[type.slug] || null;
+        const lastValue = lastReading ? lastReading.reading_value : '-';
+        const lastDate = lastReading ? formatDate(lastReading.reading_date) : '-';
+
+        // Determine target range display
+        let targetRange = '-';
+        if (type.low !== null && type.high !== null) {
+            targetRange = `${type.low}-${type.high} ${type.unit || ''}`;
+        } else if (type.unit) {
+            targetRange = type.unit;
         }
-    }
 
-    tableBody.innerHTML = rows.join('');
+        return `
+            <tr style="border-bottom: 1px solid var(--border);">
+                <td style="padding: 0.75rem 0.5rem;">
+                    <strong>${escapeHtml(type.name)}</strong>
+                    ${type.unit ? `<span style="color: var(--text-muted); font-size: 0.875rem;"> (${type.unit})</span>` : ''}
+                </td>
+                <td style="padding: 0.75rem 0.5rem; color: var(--text-muted); font-size: 0.875rem;">
+                    ${targetRange}
+                </td>
+                <td style="padding: 0.75rem 0.5rem;">
+                    <input
+                        type="number"
+                        step="0.01"
+                        class="quick-reading-input"
+                        data-slug="${type.slug}"
+                        value="${escapeHtml(typed[type.slug] || '')}"
+                        placeholder="--"
+                        style="width: 100%; max-width: 120px; padding: 0.5rem; background: var(--bg-secondary); border: 1px solid var(--border); border-radius: 4px; color: var(--text); font-size: 0.875rem;"
+                    />
+                </td>
+                <td style="padding: 0.75rem 0.5rem; color: var(--text-muted); font-size: 0.875rem;">
+                    ${lastValue} ${lastDate !== '-' ? `<span style="color: var(--text-muted);"> (${lastDate})</span>` : ''}
+                </td>
+            </tr>
+        `;
+    }).join('');
 }
 
 async function submitQuickReadings(date) {
@@ -623,39 +1058,56 @@ async function submitQuickReadings(date) {
         return false;
     }
 
-    // Submit all readings
-    let successCount = 0;
-    let errorCount = 0;
+    // Clear inputs first so the table can be patched as each reading is saved
+    inputs.forEach(input => input.value = '');
 
-    for (const reading of readings) {
-        try {
-            await api('/readings/', {
-                method: 'POST',
-                body: JSON.stringify(reading)
-            });
-            successCount++;
-        } catch (error) {
-            console.error('Failed to save reading:', reading, error);
-            errorCount++;
-        }
-    }
+    // Queued together, so they go out in one POST /sync/ batch
+    const results = await Promise.allSettled(readings.map(reading => mutate('reading.create', null, reading)));
+    const queuedCount = results.filter(r => r.status === 'fulfilled' && r.value === QUEUED).length;
+    const errorCount = results.filter(r => r.status === 'rejected').length;
+    const successCount = results.length - queuedCount - errorCount;
+    results.forEach(function(result, index) {
+        if (result.status === 'rejected') console.error('Failed to save reading:', readings[index], result.reason);
+    });
 
     if (errorCount > 0) {
         showToast(`⚠ Saved ${successCount} readings, ${errorCount} failed`);
+    } else if (queuedCount > 0) {
+        showToast(`📴 ${queuedCount} readings saved offline; they'll sync when you're back online`);
     } else {
         showToast(`✓ Saved ${successCount} readings`);
     }
 
-    // Clear inputs and reload table
-    inputs.forEach(input => input.value = '');
-    await loadQuickEntryTable();
+    return true;
+}
 
-    // Reload chart if a type is selected
-    const chartSelect = $('#chartReadingType');
-    if (chartSelect && chartSelect.value) {
-        await loadReadings();
-    }
+// Charts - one Chart.js instance, updated in place; series cached per slug/range
+const CHART_DAYS = 90;
+const CHART_POINT_LIMIT = 200;  // Above this, markers are hidden and the line is decimated
+const CHART_SERIES_LIMIT = 20;  // Slugs per /readings/series request
 
+function toChartPoint(reading) {
+    // Dates become UTC day timestamps on a linear axis (decimation needs numeric x values)
+    const [year, month, day] = reading.reading_date.split('-').map(Number);
+    return { x: Date.UTC(year, month - 1, day), y: reading.reading_value, id: reading.id };
+}
+
+function formatChartDate(value) {
+    return new Date(value).toLocaleDateString('en-US', { month: 'short', day: 'numeric', timeZone: 'UTC' });
+}
+
+function setChartSeries(slug, days, readings) {
+    chartSeries[slug] = chartSeries[slug] || {};
+    chartSeries[slug][days] = readings.map(toChartPoint);
+    return chartSeries[slug][days];
+}
+
+function addChartPoint(points, point) {
+    // The API response and the change event for a new reading both land here
+    if (point.id && points.some(p => p.id === point.id)) return false;
+    let index = points.length;
+    while (index > 0 && points[index - 1].x > point.x) index--;
+    points.splice(index, 0, point);
     return true;
 }
 
@@ -666,130 +1118,141 @@ async function loadReadings() {
     const slug = select.value;
     if (!slug) return;
 
+    const cached = (chartSeries[slug] || {})[CHART_DAYS];
+    if (cached) {
+        renderChart(slug, cached);
+        // While live updates are connected the cached series is current
+        if (liveUpdates) return;
+    }
+
     try {
-        const readings = await api(`/readings/?slug=${slug}&days=90`);
-        renderChart(slug, readings);
+        // One request fills every type's series, so switching types is instant
+        const slugs = [slug, ...readingTypes.map(t => t.slug).filter(s => s !== slug)].slice(0, CHART_SERIES_LIMIT);
+        const data = await api(`/readings/series?slugs=${slugs.join(',')}&start=${getFutureDate(-CHART_DAYS)}`);
+        data.series.forEach(series => setChartSeries(series.slug, CHART_DAYS, series.points));
+        if (select.value === slug) renderChart(slug, chartSeries[slug][CHART_DAYS]);
     } catch (error) {
         console.error('Failed to load readings:', error);
-        showToast('Failed to load readings');
+        if (!cached) showToast('Failed to load readings');
     }
 }
 
-function renderChart(slug, readings) {
-    const canvas = $('#readingChart');
-    if (!canvas) return;
-
-    const ctx = canvas.getContext('2d');
-    const typeInfo = readingTypes.find(t => t.slug === slug) || {};
-
-    if (currentChart) {
-        currentChart.destroy();
-    }
-
-    if (readings.length === 0) {
-        ctx.clearRect(0, 0, canvas.width, canvas.height);
+// Draws the placeholder when the selected type has no readings
+const chartEmptyState = {
+    id: 'emptyState',
+    afterDraw(chart) {
+        if (chart.data.datasets[0].data.length > 0) return;
+        const { ctx, width, height } = chart;
+        ctx.save();
         ctx.fillStyle = '#a3acc2';
         ctx.font = '14px sans-serif';
         ctx.textAlign = 'center';
-        ctx.fillText('No readings yet for this type', canvas.width / 2, canvas.height / 2);
-        return;
-    }
-
-    // Build datasets array - start with the main reading line
-    const datasets = [{
-        label: `${typeInfo.name || slug} ${typeInfo.unit ? '(' + typeInfo.unit + ')' : ''}`,
-        data: readings.map(r => r.reading_value),
-        borderColor: '#4f8cff',
-        backgroundColor: 'rgba(79, 140, 255, 0.1)',
-        tension: 0.3,
-        fill: true,
-        pointRadius: 4,
-        pointHoverRadius: 6,
-        order: 1
-    }];
-
-    // Add target range lines if they exist
-    if (typeInfo.low !== null && typeInfo.low !== undefined) {
-        datasets.push({
-            label: `Min (${typeInfo.low})`,
-            data: readings.map(() => typeInfo.low),
-            borderColor: 'rgba(255, 193, 7, 0.6)',
-            borderWidth: 2,
-            borderDash: [5, 5],
-            fill: false,
-            pointRadius: 0,
-            pointHoverRadius: 0,
-            order: 2
-        });
-    }
-
-    if (typeInfo.high !== null && typeInfo.high !== undefined) {
-        datasets.push({
-            label: `Max (${typeInfo.high})`,
-            data: readings.map(() => typeInfo.high),
-            borderColor: 'rgba(255, 193, 7, 0.6)',
-            borderWidth: 2,
-            borderDash: [5, 5],
-            fill: false,
-            pointRadius: 0,
-            pointHoverRadius: 0,
-            order: 2
-        });
+        ctx.fillText('No readings yet for this type', width / 2, height / 2);
+        ctx.restore();
     }
+};
+
+function rangeDataset(label, value, points) {
+    // Two points span the whole series; no need for one per reading
+    return {
+        label: `${label} (${value})`,
+        data: [{ x: points[0].x, y: value }, { x: points[points.length - 1].x, y: value }],
+        borderColor: 'rgba(255, 193, 7, 0.6)',
+        borderWidth: 2,
+        borderDash: [5, 5],
+        fill: false,
+        pointRadius: 0,
+        pointHoverRadius: 0,
+        order: 2
+    };
+}
 
-    currentChart = new Chart(ctx, {
+function createChart(canvas) {
+    const axis = {
+        ticks: { color: '#a3acc2', font: { size: 11 } },
+        grid: { color: 'rgba(255, 255, 255, 0.06)' }
+    };
+    return new Chart(canvas.getContext('2d'), {
         type: 'line',
         data: {
-            labels: readings.map(r => {
-                const date = new Date(r.reading_date);
-                return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' });
-            }),
-            datasets: datasets
+            datasets: [{
+                label: '',
+                data: [],
+                borderColor: '#4f8cff',
+                backgroundColor: 'rgba(79, 140, 255, 0.1)',
+                fill: true,
+                order: 1
+            }]
         },
         options: {
             responsive: true,
             maintainAspectRatio: false,
+            // Points are already {x, y} numbers sorted by x, which decimation requires
+            parsing: false,
+            normalized: true,
             plugins: {
+                decimation: { enabled: true, algorithm: 'lttb' },
                 legend: {
                     labels: {
                         color: '#e5ecff',
                         font: { size: 12 }
                     }
+                },
+                tooltip: {
+                    callbacks: { title: items => formatChartDate(items[0].parsed.x) }
                 }
             },
             scales: {
-                x: {
-                    ticks: {
-                        color: '#a3acc2',
-                        font: { size: 11 }
-                    },
-                    grid: { color: 'rgba(255, 255, 255, 0.06)' }
-                },
-                y: {
-                    ticks: {
-                        color: '#a3acc2',
-                        font: { size: 11 }
-                    },
-                    grid: { color: 'rgba(255, 255, 255, 0.06)' }
-                }
+                x: { ...axis, type: 'linear', ticks: { ...axis.ticks, maxTicksLimit: 8, callback: formatChartDate } },
+                y: axis
             }
-        }
+        },
+        plugins: [chartEmptyState]
     });
 }
 
+function renderChart(slug, points) {
+    const canvas = $('#readingChart');
+    if (!canvas) return;
+
+    const typeInfo = readingTypes.find(t => t.slug === slug) || {};
+    const switched = slug !== chartSlug;
+    chartSlug = slug;
+
+    if (!currentChart) currentChart = createChart(canvas);
+
+    const line = currentChart.data.datasets[0];
+    const dense = points.length > CHART_POINT_LIMIT;
+    line.label = `${typeInfo.name || slug} ${typeInfo.unit ? '(' + typeInfo.unit + ')' : ''}`;
+    line.data = points;
+    line.tension = dense ? 0 : 0.3;
+    line.pointRadius = dense ? 0 : 4;
+    line.pointHoverRadius = dense ? 3 : 6;
+
+    // Target range lines
+    const datasets = [line];
+    if (points.length > 0) {
+        if (typeInfo.low !== null && typeInfo.low !== undefined) datasets.push(rangeDataset('Min', typeInfo.low, points));
+        if (typeInfo.high !== null && typeInfo.high !== undefined) datasets.push(rangeDataset('Max', typeInfo.high, points));
+    }
+    currentChart.data.datasets = datasets;
+    currentChart.options.scales.x.display = points.length > 0;
+    currentChart.options.scales.y.display = points.length > 0;
+
+    // Switching series redraws immediately; new points on the same series animate in
+    currentChart.update(switched ? 'none' : undefined);
+}
+
 // Health check
 async function checkHealth() {
     const apiStatus = $('#apiStatus');
     const dbStatus = $('#dbStatus');
-    const statusBadge = $('#statusBadge');
     
     try {
         await api('/health');
         if (apiStatus) apiStatus.textContent = 'Connected';
-        if (statusBadge) {
-            statusBadge.className = 'badge badge-ok';
-            statusBadge.textContent = '● Online';
-        }
+        apiReachable = true;
+        updateStatusBadge();
         
         const readyStatus = await api('/readyz');
         if (dbStatus) {
@@ -798,10 +1261,8 @@ async function checkHealth() {
     } catch (error) {
         if (apiStatus) apiStatus.textContent = 'Disconnected';
         if (dbStatus) dbStatus.textContent = 'Unknown';
-        if (statusBadge) {
-            statusBadge.className = 'badge badge-error';
-            statusBadge.textContent = '● Offline';
-        }
+        apiReachable = false;
+        updateStatusBadge();
         console.error('Health check failed:', error);
     }
 }
@@ -960,12 +1421,15 @@ document.addEventListener('DOMContentLoaded', function() {
             console.log('Creating task:', data);
             
             try {
-                const newTask = await api('/tasks/', { method: 'POST', body: JSON.stringify(data) });
+                const newTask = await mutate('task.create', null, data);
                 console.log('Task created:', newTask);
-                showToast('✓ Task created successfully');
                 if (taskDialog) taskDialog.close();
                 if (taskForm) taskForm.reset();
-                await loadTasks();
+                if (newTask === QUEUED) {
+                    showToast('📴 Task saved offline');
+                    return;
+                }
+                showToast('✓ Task created successfully');
                 
                 // Auto-select the newly created task
                 if (newTask && newTask.id) {
@@ -1030,11 +1494,10 @@ document.addEventListener('DOMContentLoaded', function() {
             };
             
             try {
-                await api('/inventory/', { method: 'POST', body: JSON.stringify(data) });
-                showToast('✓ Inventory item added');
+                const item = await mutate('inventory.create', null, data);
+                showToast(item === QUEUED ? '📴 Inventory item saved offline' : '✓ Inventory item added');
                 if (inventoryDialog) inventoryDialog.close();
                 if (inventoryForm) inventoryForm.reset();
-                loadInventory();
             } catch (error) {
                 showToast('Failed to add item');
                 console.error(error);
@@ -1072,18 +1535,39 @@ document.addEventListener('DOMContentLoaded', function() {
     }
     
     // Initialize
+    registerServiceWorker();
+
     console.log('Checking health...');
     checkHealth();
+
+    // Replay writes queued while offline (now, and whenever the connection returns)
+    window.addEventListener('online', function() {
+        updateStatusBadge();
+        flushOutbox();
+    });
+    window.addEventListener('offline', updateStatusBadge);
+    if (window.indexedDB) flushOutbox();
     
-    console.log('Loading reading types...');
-    loadReadingTypes().then(function() {
-        console.log('Reading types loaded');
+    // One long-lived stream instead of refetching lists after every change
+    api('/pools/').then(function(pools) {
+        if (pools.length) poolId = pools[0].id;
+    }).catch(function(error) {
+        console.error('Failed to load pools:', error);
+    });
+    connectEvents();
+
+    switchTab('tasks', false);
+    loadDashboard(['tasks', 'inventory', 'reading_types', 'latest_readings']).then(function(data) {
+        renderTasks(data.tasks);
+        renderInventory(data.inventory);
+        renderReadingTypes(data.reading_types, data.latest_readings);
         if (currentTab === 'readings') {
-            console.log('Loading readings for current tab');
             loadReadings();
         }
+    }).catch(function(error) {
+        console.error('Failed to load dashboard:', error);
+        showToast('Failed to load dashboard');
+        loadTasks();
+        loadReadingTypes();
     });
-
-    console.log('Switching to tasks tab...');
-    switchTab('tasks');
 });
\ No newline at end of file
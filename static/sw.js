@@ -0,0 +1,104 @@
+// Service worker - offline app shell and stale-while-revalidate API reads
+const SHELL_CACHE = 'pool-shell-v1';
+const API_CACHE = 'pool-api-v1';
+const CHART_JS = 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js';
+
+// Shell files when serving raw sources (a build lists its fingerprinted names in manifest.json)
+const SOURCE_SHELL = ['./index.html', './js/app.js', './css/styles.css', './pool-icon.png'];
+
+// Read routes served from cache first; writes, /events/ and health checks always hit the network
+const API_PREFIXES = ['/dashboard/', '/tasks/', '/inventory/', '/readings/', '/alerts/'];
+
+async function shellUrls() {
+    try {
+        const response = await fetch('./manifest.json', { cache: 'no-cache' });
+        if (response.ok) {
+            const manifest = await response.json();
+            return ['./index.html', ...Object.values(manifest).map(path => `./${path}`), CHART_JS];
+        }
+    } catch (error) {
+        // Offline, or no build; fall through to the source names
+    }
+    return [...SOURCE_SHELL, CHART_JS];
+}
+
+self.addEventListener('install', function(event) {
+    event.waitUntil(
+        shellUrls()
+            .then(urls => caches.open(SHELL_CACHE).then(cache => cache.addAll(urls)))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', function(event) {
+    event.waitUntil((async function() {
+        const keep = [SHELL_CACHE, API_CACHE];
+        for (const name of await caches.keys()) {
+            if (!keep.includes(name)) await caches.delete(name);
+        }
+
+        // Drop fingerprinted files from previous builds
+        const current = new Set((await shellUrls()).map(url => new URL(url, self.location).href));
+        const shell = await caches.open(SHELL_CACHE);
+        for (const request of await shell.keys()) {
+            const url = new URL(request.url);
+            url.search = '';
+            if (!current.has(url.href)) await shell.delete(request);
+        }
+
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', function(event) {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    const scope = new URL(self.registration.scope);
+    if (url.origin === self.location.origin && API_PREFIXES.some(prefix => url.pathname.startsWith(prefix))) {
+        event.respondWith(staleWhileRevalidate(event, API_CACHE, true));
+    } else if (url.href === CHART_JS ||
+               (url.origin === self.location.origin && url.pathname.startsWith(scope.pathname))) {
+        event.respondWith(staleWhileRevalidate(event, SHELL_CACHE, false));
+    }
+});
+
+async function staleWhileRevalidate(event, cacheName, isApi) {
+    const request = event.request;
+    const cache = await caches.open(cacheName);
+    // Shell lookups ignore ?v= cache busters in index.html
+    const cached = await cache.match(request, { ignoreSearch: !isApi });
+
+    const network = fetch(request).then(async function(response) {
+        if (response.ok) {
+            if (isApi && cached) await notifyIfChanged(request.url, cached.clone(), response.clone());
+            await cache.put(request, response.clone());
+        }
+        return response;
+    });
+
+    if (cached) {
+        // Answer from cache now; refresh it in the background
+        event.waitUntil(network.catch(() => null));
+        return cached;
+    }
+    return network.catch(function() {
+        if (!isApi) return Response.error();
+        return new Response(JSON.stringify({ detail: 'Offline and not cached' }), {
+            status: 503,
+            headers: { 'Content-Type': 'application/json' }
+        });
+    });
+}
+
+async function notifyIfChanged(url, cached, fresh) {
+    const [before, after] = await Promise.all([cached.text(), fresh.text()]);
+    if (before === after) return;
+
+    // The page rendered the stale copy; hand it the fresh one
+    const body = JSON.parse(after);
+    for (const client of await self.clients.matchAll({ type: 'window' })) {
+        client.postMessage({ type: 'api-refresh', url, body });
+    }
+}
@@ -0,0 +1,69 @@
+"""Admission control: weighted concurrency limit and client keys"""
+import asyncio
+
+from app.admission import ConcurrencyLimiter, admission
+
+
+async def test_dashboard_counts_every_session():
+    assert admission.weights["/dashboard/"] == 8
+
+
+async def test_weighted_requests_share_the_connections():
+    limiter = ConcurrencyLimiter(limit=8, queue_size=10, timeout=1)
+    assert await limiter.acquire(8) is None
+    light = asyncio.create_task(limiter.acquire(1))
+    await asyncio.sleep(0)
+    assert (limiter.queued, limiter.in_use) == (1, 8)
+
+    limiter.release(8)
+    assert await light is None
+    assert (limiter.in_flight, limiter.in_use, limiter.queued) == (1, 1, 0)
+
+
+async def test_waiters_are_admitted_in_order():
+    limiter = ConcurrencyLimiter(limit=8, queue_size=10, timeout=1)
+    assert await limiter.acquire(4) is None
+    heavy = asyncio.create_task(limiter.acquire(8))
+    await asyncio.sleep(0)
+    # Would fit, but must not overtake the heavy request
+    light = asyncio.create_task(limiter.acquire(1))
+    await asyncio.sleep(0)
+    assert not light.done()
+
+    limiter.release(4)
+    assert await heavy is None
+    await asyncio.sleep(0)
+    assert not light.done()
+    limiter.release(8)
+    assert await light is None
+
+
+async def test_full_queue_sheds_and_slow_waits_time_out():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, timeout=0.05)
+    assert await limiter.acquire() is None
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert await limiter.acquire() == "shed"
+    assert await waiting == "timed_out"
+    assert (limiter.queued, limiter.in_use) == (0, 1)
+
+    limiter.release()
+    assert await limiter.acquire() is None
+
+
+def test_client_key_reads_forwarded_for_from_trusted_proxies(monkeypatch):
+    from app import admission as module
+
+    def scope(peer, forwarded=None):
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return {"client": (peer, 1234), "headers": headers}
+
+    assert module.client_key(scope("10.0.0.2", "203.0.113.7")) == "10.0.0.2"
+
+    monkeypatch.setattr(module, "TRUSTED_PROXIES", module._networks("10.0.0.0/8, 127.0.0.1"))
+    assert module.client_key(scope("10.0.0.2", "203.0.113.7")) == "203.0.113.7"
+    # Hops a client wrote itself are ignored; the proxies' own hops are skipped
+    assert module.client_key(scope("10.0.0.2", "1.2.3.4, 203.0.113.7, 10.0.0.5")) == "203.0.113.7"
+    assert module.client_key(scope("10.0.0.2")) == "10.0.0.2"
+    # An untrusted peer can't pick its own bucket
+    assert module.client_key(scope("198.51.100.1", "203.0.113.7")) == "198.51.100.1"
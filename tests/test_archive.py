@@ -0,0 +1,99 @@
+"""Archived readings and task history"""
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Job, Pool, Reading, ReadingType, User
+from app.services.jobs import HANDLERS, JobContext
+
+OLD = (date.today() - timedelta(days=400)).isoformat()
+
+
+@pytest.fixture(autouse=True)
+def archive_after(monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_AFTER_DAYS", 30)
+
+
+async def run_archive_job(user_id) -> dict:
+    return await HANDLERS["archive"].run(JobContext(Job(id=uuid.uuid4(), user_id=user_id), None))
+
+
+async def test_archive_job_only_moves_the_submitters_rows(client):
+    old = (await client.post("/readings/", json={"reading_value": 7.4, "reading_date": OLD, "reading_type_slug": "ph"})).json()
+    async with AsyncSessionLocal() as db:
+        me = await db.scalar(select(User.id))
+        other = User(email="other@example.com", hashed_password="-")
+        db.add(other)
+        await db.flush()
+        pool = Pool(user_id=other.id, name="Other pool")
+        db.add(pool)
+        await db.flush()
+        ph = await db.scalar(select(ReadingType.id).where(ReadingType.slug == "ph"))
+        db.add(Reading(user_id=other.id, pool_id=pool.id, reading_type_id=ph, reading_value=7.0, reading_date=date.fromisoformat(OLD)))
+        await db.commit()
+        other_id = other.id
+
+    assert await run_archive_job(me) == {"readings": 1, "history": 0}
+
+    async with AsyncSessionLocal() as db:
+        remaining = (await db.execute(select(Reading.user_id))).scalars().all()
+    assert remaining == [other_id]
+    # Still served, from the archive
+    points = (await client.get("/readings/", params={"slug": "ph", "days": 500})).json()
+    assert [p["id"] for p in points] == [old["id"]]
+
+
+async def test_dashboard_latest_readings_include_archived_types(client):
+    for slug, value, day in (("fc", 3.0, OLD), ("ph", 7.1, OLD), ("ph", 7.5, date.today().isoformat())):
+        await client.post("/readings/", json={"reading_value": value, "reading_date": day, "reading_type_slug": slug})
+    async with AsyncSessionLocal() as db:
+        me = await db.scalar(select(User.id))
+    assert await run_archive_job(me) == {"readings": 2, "history": 0}
+
+    latest = (await client.get("/dashboard/", params={"fields": "latest_readings"})).json()["latest_readings"]
+    assert sorted((r["reading_type_slug"], r["reading_value"], r["reading_date"]) for r in latest) == [
+        ("fc", 3.0, OLD), ("ph", 7.5, date.today().isoformat())
+    ]
+
+
+async def test_delete_archived_reading(client):
+    old = (await client.post("/readings/", json={"reading_value": 7.1, "reading_date": OLD, "reading_type_slug": "ph"})).json()
+    kept = (await client.post("/readings/", json={"reading_value": 7.3, "reading_date": OLD, "reading_type_slug": "ph"})).json()
+    token = (await client.get("/sync/")).json()["token"]
+    async with AsyncSessionLocal() as db:
+        me = await db.scalar(select(User.id))
+    assert await run_archive_job(me) == {"readings": 2, "history": 0}
+
+    assert (await client.delete(f"/readings/{old['id']}")).status_code == 204
+    assert (await client.delete(f"/readings/{old['id']}")).status_code == 404
+
+    points = (await client.get("/readings/", params={"slug": "ph", "days": 500})).json()
+    assert [p["id"] for p in points] == [kept["id"]]
+    deleted = (await client.get("/sync/", params={"since": token})).json()["deleted"]
+    assert deleted == [{"entity": "reading", "id": old["id"]}]
+
+    # The last row of a month takes its file with it
+    assert (await client.delete(f"/readings/{kept['id']}")).status_code == 204
+    assert (await client.get("/readings/", params={"slug": "ph", "days": 500})).json() == []
+
+
+async def test_full_sync_includes_archived_rows(client):
+    task = (await client.post("/tasks/", json={"name": "Check pump", "frequency_days": 7})).json()
+    await client.post(f"/tasks/{task['id']}/complete", json={"completed_date": OLD})
+    await client.post(f"/tasks/{task['id']}/complete", json={})
+    for value, day in ((7.1, OLD), (7.5, date.today().isoformat())):
+        await client.post("/readings/", json={"reading_value": value, "reading_date": day, "reading_type_slug": "ph"})
+    before = (await client.get("/sync/")).json()
+
+    async with AsyncSessionLocal() as db:
+        me = await db.scalar(select(User.id))
+    assert await run_archive_job(me) == {"readings": 1, "history": 1}
+
+    after = (await client.get("/sync/")).json()
+    assert after["full"] is True
+    for field in ("tasks", "task_history", "readings"):
+        assert sorted(after[field], key=lambda row: row["id"]) == sorted(before[field], key=lambda row: row["id"])
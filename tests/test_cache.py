@@ -0,0 +1,75 @@
+"""Response cache: fills, invalidation and replica reads"""
+import asyncio
+
+import httpx
+
+from app.cache import ResponseCache
+from app.main import app
+
+
+async def test_concurrent_misses_share_one_fill():
+    cache = ResponseCache(max_entries=10, ttl=60)
+    calls = 0
+    release = asyncio.Event()
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return b"[]"
+
+    callers = [asyncio.create_task(cache.fill("key", ["tasks"], compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert calls == 1
+    assert sorted(coalesced for _, coalesced in results) == [False, True, True, True, True]
+    assert {body for body, _ in results} == {b"[]"}
+    assert (cache.coalesced, cache.inflight) == (4, {})
+    assert await cache.get("key") == b"[]"
+
+
+async def test_flight_detached_on_invalidation():
+    cache = ResponseCache(max_entries=10, ttl=60)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def stale():
+        started.set()
+        await release.wait()
+        return b"stale"
+
+    async def fresh():
+        return b"fresh"
+
+    leader = asyncio.create_task(cache.fill("key", ["tasks"], stale))
+    await started.wait()
+    cache.invalidate_local(["tasks"])
+
+    # Callers after the write don't join the detached flight
+    assert await asyncio.wait_for(cache.fill("key", ["tasks"], fresh), 1) == (b"fresh", False)
+    release.set()
+    assert await leader == (b"stale", False)
+    # ...and its result doesn't overwrite the fresh entry
+    assert await cache.get("key") == b"fresh"
+
+
+async def test_replica_fill_not_stored_after_write(client, replica):
+    # A client that has never written reads from the (lagging) replica
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as reader:
+        response = await client.post("/tasks/", json={"name": "Check pump", "frequency_days": 7})
+        assert response.status_code == 201
+        assert "pm_primary_until" in client.cookies
+
+        stale = await reader.get("/tasks/")
+        assert (stale.headers["X-Cache"], stale.json()) == ("miss", [])
+
+        # The writer is pinned to the primary and must not be served the replica's fill
+        fresh = await client.get("/tasks/")
+        assert fresh.headers["X-Cache"] == "miss"
+        assert [t["name"] for t in fresh.json()] == ["Check pump"]
+
+        # Replica fills of untouched data are still cached
+        assert (await reader.get("/inventory/")).headers["X-Cache"] == "miss"
+        assert (await reader.get("/inventory/")).headers["X-Cache"] == "hit"
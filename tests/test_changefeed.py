@@ -0,0 +1,100 @@
+"""Cache invalidation through the change feed, within and across workers"""
+import asyncio
+import json
+from datetime import date
+
+import asyncpg
+import pytest
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from app import changefeed
+from app.changefeed import CHANNEL, ChangeListener
+from app.database import AsyncSessionLocal
+from app.models import MaintenanceTask, Pool, User
+
+
+async def add_task(name: str) -> None:
+    """Write outside any request, as a job or another route's session would"""
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(select(User.id))
+        pool_id = await db.scalar(select(Pool.id).where(Pool.user_id == user_id))
+        db.add(MaintenanceTask(user_id=user_id, pool_id=pool_id, name=name, frequency_days=7, next_due_date=date.today()))
+        await db.commit()
+
+
+async def test_commit_in_another_session_invalidates(client):
+    assert (await client.get("/tasks/")).headers["X-Cache"] == "miss"
+    assert (await client.get("/tasks/")).headers["X-Cache"] == "hit"
+
+    await add_task("Check pump")
+
+    response = await client.get("/tasks/")
+    assert response.headers["X-Cache"] == "miss"
+    assert [t["name"] for t in response.json()] == ["Check pump"]
+
+
+async def test_rollback_keeps_cache(client):
+    await client.get("/tasks/")
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(select(User.id))
+        pool_id = await db.scalar(select(Pool.id))
+        db.add(MaintenanceTask(user_id=user_id, pool_id=pool_id, name="Never", frequency_days=7, next_due_date=date.today()))
+        await db.flush()
+        await db.rollback()
+    assert (await client.get("/tasks/")).headers["X-Cache"] == "hit"
+
+
+def _dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def test_commit_notifies_other_workers(db_url):
+    name, url = db_url
+    if name != "postgresql":
+        pytest.skip("LISTEN/NOTIFY is PostgreSQL only")
+    received = asyncio.Queue()
+    connection = await asyncpg.connect(_dsn(url))
+    try:
+        await connection.add_listener(CHANNEL, lambda *args: received.put_nowait(json.loads(args[3])))
+        await add_task("Check pump")
+        message = await asyncio.wait_for(received.get(), 5)
+    finally:
+        await connection.close()
+
+    assert message["origin"] == changefeed.ORIGIN
+    assert "maintenance_tasks" in [table for table, _, _ in message["changes"]]
+
+
+async def test_listener_applies_other_workers_changes(client, db_url):
+    name, url = db_url
+    if name != "postgresql":
+        pytest.skip("LISTEN/NOTIFY is PostgreSQL only")
+    listener = ChangeListener(url)
+    listener.start()
+    connection = await asyncpg.connect(_dsn(url))
+    try:
+        for _ in range(100):
+            if listener.connected:
+                break
+            await asyncio.sleep(0.05)
+        assert listener.connected
+
+        await client.get("/tasks/")
+        assert (await client.get("/tasks/")).headers["X-Cache"] == "hit"
+
+        async with AsyncSessionLocal() as db:
+            user_id = await db.scalar(select(User.id))
+        # Another worker's change, for this user's tasks
+        payload = json.dumps({"origin": "other-worker", "changes": [["maintenance_tasks", str(user_id), None]]})
+        await connection.execute("SELECT pg_notify($1, $2)", CHANNEL, payload)
+        for _ in range(100):
+            if listener.received:
+                break
+            await asyncio.sleep(0.05)
+
+        assert listener.received == 1
+        assert (await client.get("/tasks/")).headers["X-Cache"] == "miss"
+    finally:
+        await connection.close()
+        await listener.stop()
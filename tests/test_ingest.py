@@ -0,0 +1,41 @@
+"""Buffered sensor sample writer"""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models import ReadingType, SensorSample, User
+from app.services.ingest import SampleBuffer
+
+
+async def _wait_for(condition, timeout=5.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+
+async def test_poison_batch_is_dropped(db_url):
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(select(User.id))
+        ph = await db.scalar(select(ReadingType.id).where(ReadingType.slug == "ph"))
+    now = datetime.now(timezone.utc)
+
+    buffer = SampleBuffer(capacity=100, batch_rows=10, flush_seconds=0.01)
+    buffer.start()
+    try:
+        # An unknown reading type fails the foreign key on every retry
+        await buffer.put_many([(user_id, uuid.uuid4(), "probe-1", now, 7.0)], timeout=1)
+        await _wait_for(lambda: buffer.dropped == 1)
+
+        await buffer.put_many([(user_id, ph, "probe-1", now, 7.4)], timeout=1)
+        await _wait_for(lambda: buffer.written == 1)
+    finally:
+        await buffer.stop()
+
+    assert buffer.pending == []
+    async with AsyncSessionLocal() as db:
+        assert (await db.execute(select(SensorSample.value))).scalars().all() == [7.4]
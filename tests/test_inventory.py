@@ -0,0 +1,24 @@
+"""Concurrent inventory adjustments"""
+import asyncio
+
+
+async def test_concurrent_adjustments_all_apply(client):
+    item = (await client.post("/inventory/", json={
+        "name": "Chlorine tabs", "quantity_on_hand": 10, "unit": "lb", "reorder_threshold": 2
+    })).json()
+    path = f"/inventory/{item['id']}/adjust"
+
+    responses = await asyncio.gather(*(client.post(path, json={"delta": delta}) for delta in [3, -1] * 10))
+    assert [r.status_code for r in responses] == [200] * 20
+    assert (await client.get(f"/inventory/{item['id']}")).json()["quantity_on_hand"] == 30
+
+
+async def test_concurrent_withdrawals_never_go_negative(client):
+    item = (await client.post("/inventory/", json={
+        "name": "Shock", "quantity_on_hand": 5, "unit": "bag", "reorder_threshold": 1
+    })).json()
+    path = f"/inventory/{item['id']}/adjust"
+
+    responses = await asyncio.gather(*(client.post(path, json={"delta": -1}) for _ in range(8)))
+    assert sorted(r.status_code for r in responses) == [200] * 5 + [409] * 3
+    assert (await client.get(f"/inventory/{item['id']}")).json()["quantity_on_hand"] == 0
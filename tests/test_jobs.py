@@ -0,0 +1,22 @@
+"""Job queue claims"""
+import asyncio
+
+from app.services.jobs import JobRunner
+
+
+async def test_workers_never_claim_the_same_job(client):
+    queued = set()
+    for _ in range(8):
+        response = await client.post("/jobs/", json={"kind": "export"})
+        assert response.status_code == 202, response.text
+        queued.add(response.json()["id"])
+
+    # Two processes' runners racing for more jobs than there are
+    runners = [JobRunner(1, 0.05), JobRunner(1, 0.05)]
+    jobs = await asyncio.gather(*(runner._claim() for _ in range(6) for runner in runners))
+
+    claimed = [str(job.id) for job in jobs if job is not None]
+    assert sorted(claimed) == sorted(queued)
+    assert all(job.status == "running" and job.attempts == 1 for job in jobs if job is not None)
+    statuses = {j["id"]: j["status"] for j in (await client.get("/jobs/")).json()}
+    assert set(statuses.values()) == {"running"}
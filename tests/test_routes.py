@@ -0,0 +1,245 @@
+"""Every router, end to end, on each backend"""
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.ingest import ingest_buffer
+from app.services.jobs import JobRunner
+
+TODAY = date.today().isoformat()
+
+
+async def create_task(client, name="Check pump", **params):
+    response = await client.post("/tasks/", params=params, json={"name": name, "frequency_days": 7})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def create_item(client, name="Chlorine tabs", quantity=10):
+    response = await client.post("/inventory/", json={
+        "name": name, "quantity_on_hand": quantity, "unit": "lb", "reorder_threshold": 2
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def create_reading(client, value=7.4, slug="ph", day=TODAY, **params):
+    response = await client.post("/readings/", params=params, json={
+        "reading_value": value, "reading_date": day, "reading_type_slug": slug
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def test_health(client):
+    assert (await client.get("/health")).json() == {"status": "ok"}
+    assert (await client.get("/readyz")).json() == {"status": "ready"}
+    for path in ("/health/cache", "/health/ingest", "/health/jobs", "/health/admission"):
+        assert (await client.get(path)).status_code == 200
+
+
+async def test_pools(client):
+    pools = (await client.get("/pools/")).json()
+    assert len(pools) == 1
+
+    response = await client.post("/pools/", json={"name": "Spa"})
+    assert response.status_code == 201
+    spa = response.json()
+    assert (await client.post("/pools/", json={"name": "Spa"})).status_code == 400
+
+    response = await client.put(f"/pools/{spa['id']}", json={"name": "Hot tub"})
+    assert response.json()["name"] == "Hot tub"
+    assert {p["id"]: p["name"] for p in (await client.get("/pools/")).json()}[spa["id"]] == "Hot tub"
+
+    # Rows in the deleted pool go with it; the default pool is untouched
+    await create_task(client, "Drain", pool_id=spa["id"])
+    await create_task(client, "Skim", pool_id=pools[0]["id"])
+    assert (await client.delete(f"/pools/{spa['id']}")).status_code == 204
+    tasks = (await client.get("/tasks/", params={"pool_id": pools[0]["id"]})).json()
+    assert [t["name"] for t in tasks] == ["Skim"]
+    assert (await client.delete(f"/pools/{pools[0]['id']}")).status_code == 400
+
+
+async def test_tasks(client):
+    task = await create_task(client)
+    assert (await client.get(f"/tasks/{task['id']}")).json()["name"] == "Check pump"
+
+    response = await client.put(f"/tasks/{task['id']}", json={
+        "name": "Check pump", "frequency_days": 14, "next_due_date": TODAY
+    })
+    assert response.json()["frequency_days"] == 14
+
+    response = await client.post(f"/tasks/{task['id']}/complete", json={"notes": "Fine"})
+    assert response.status_code == 200
+    assert response.json()["last_completed_date"] is not None
+
+    history = (await client.get(f"/tasks/{task['id']}/history")).json()
+    assert history["total"] == 1
+    assert history["items"][0]["notes"] == "Fine"
+
+    assert [t["id"] for t in (await client.get("/tasks/")).json()] == [task["id"]]
+    assert (await client.delete(f"/tasks/{task['id']}")).status_code == 204
+    assert (await client.get(f"/tasks/{task['id']}")).status_code == 404
+
+
+async def test_inventory(client):
+    item = await create_item(client)
+    path = f"/inventory/{item['id']}"
+    assert (await client.get(path)).json()["quantity_on_hand"] == 10
+
+    response = await client.post(f"{path}/adjust", json={"delta": -3})
+    assert response.json()["quantity_on_hand"] == 7
+    assert (await client.post(f"{path}/adjust", json={"delta": -8})).status_code == 409
+
+    response = await client.put(path, json={
+        "name": "Chlorine tabs", "quantity_on_hand": 7, "unit": "lb", "reorder_threshold": 8
+    })
+    assert response.json()["reorder_threshold"] == 8
+    assert (await client.get(f"{path}/balance")).json()["quantity_on_hand"] == 7
+
+    forecast = (await client.get("/inventory/forecast")).json()
+    assert [row["id"] for row in forecast] == [item["id"]]
+
+    response = await client.put("/inventory/bulk", json={"items": [
+        {"name": "Chlorine tabs", "quantity_on_hand": 20, "unit": "lb", "reorder_threshold": 2},
+        {"name": "Shock", "quantity_on_hand": 4, "unit": "bag", "reorder_threshold": 1},
+    ]})
+    assert response.status_code == 200, response.text
+    items = {row["name"]: row for row in (await client.get("/inventory/")).json()}
+    assert items["Chlorine tabs"]["id"] == item["id"]
+    assert items["Chlorine tabs"]["quantity_on_hand"] == 20
+    assert items["Shock"]["quantity_on_hand"] == 4
+
+    assert (await client.delete(path)).status_code == 204
+    assert (await client.get(path)).status_code == 404
+
+
+async def test_alerts(client):
+    response = await client.post("/alerts/", json={
+        "name": "Morning", "cadence": "weekly", "alert_time": "08:00:00", "days_of_week": [1, 4]
+    })
+    assert response.status_code == 201, response.text
+    alert = response.json()
+    assert [a["id"] for a in (await client.get("/alerts/")).json()] == [alert["id"]]
+    assert (await client.delete(f"/alerts/{alert['id']}")).status_code == 204
+    assert (await client.get("/alerts/")).json() == []
+
+
+async def test_readings(client):
+    response = await client.post("/readings/types", json={"slug": "orp", "name": "ORP", "unit": "mV", "low": 650, "high": 750})
+    assert response.status_code == 201, response.text
+    assert "orp" in [t["slug"] for t in (await client.get("/readings/types")).json()]
+
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    low = await create_reading(client, 6.9, day=yesterday)
+    good = await create_reading(client, 7.4)
+    assert (low["in_range"], good["in_range"]) == (False, True)
+
+    points = (await client.get("/readings/", params={"slug": "ph"})).json()
+    assert [p["id"] for p in points] == [low["id"], good["id"]]
+
+    series = (await client.get("/readings/series", params={"slugs": "ph,orp"})).json()
+    assert {s["slug"]: len(s["points"]) for s in series["series"]} == {"ph": 2, "orp": 0}
+
+    report = (await client.get("/readings/report", params={"slugs": "ph"})).json()
+    assert (report["types"][0]["violations"], report["types"][0]["below"]) == (1, 1)
+    assert [r["id"] for r in report["latest"]] == [low["id"]]
+
+    assert (await client.post("/readings/", json={"reading_value": 1, "reading_date": TODAY, "reading_type_slug": "nope"})).status_code == 400
+    assert (await client.delete(f"/readings/{low['id']}")).status_code == 204
+    assert (await client.delete(f"/readings/{low['id']}")).status_code == 404
+
+
+async def test_dashboard(client):
+    await create_task(client)
+    await create_item(client, quantity=1)
+    await create_reading(client, 7.5)
+
+    response = await client.get("/dashboard/")
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "miss"
+    body = response.json()
+    assert len(body["tasks"]) == 1
+    assert [i["name"] for i in body["low_inventory"]] == ["Chlorine tabs"]
+    assert [(r["reading_type_slug"], r["reading_value"]) for r in body["latest_readings"]] == [("ph", 7.5)]
+    assert body["alerts"]["total"] == 0
+
+    assert (await client.get("/dashboard/")).headers["X-Cache"] == "hit"
+    sections = (await client.get("/dashboard/", params={"fields": "alerts"})).json()
+    assert list(sections) == ["alerts"]
+
+
+async def test_events(client):
+    from app.api.routes.events import stream_events
+    from app.dependencies import get_current_user
+    from app.database import AsyncSessionLocal
+
+    # The stream never ends, so read its first event from the route directly
+    async with AsyncSessionLocal() as db:
+        user = await get_current_user(db=db)
+    response = await stream_events(current_user=user)
+    assert response.media_type == "text/event-stream"
+    first = await response.body_iterator.__anext__()
+    assert b"event: ready" in first
+    await response.body_iterator.aclose()
+
+
+async def test_sync(client):
+    full = (await client.get("/sync/")).json()
+    assert full["full"] is True
+
+    task = await create_task(client)
+    response = await client.post("/sync/", json={"operations": [
+        {"id": "00000000-0000-4000-8000-000000000001", "op": "task.complete", "target": task["id"], "data": {"notes": "Offline"}},
+        {"id": "00000000-0000-4000-8000-000000000002", "op": "reading.create", "data": {"reading_value": 7.2, "reading_date": TODAY, "reading_type_slug": "ph"}},
+    ]})
+    assert [r["status"] for r in response.json()["results"]] == [200, 201]
+
+    delta = (await client.get("/sync/", params={"since": full["token"]})).json()
+    assert delta["full"] is False
+    assert [t["id"] for t in delta["tasks"]] == [task["id"]]
+    assert len(delta["task_history"]) == 1
+    assert len(delta["readings"]) == 1
+
+
+async def test_ingest(client):
+    ingest_buffer.start()
+    try:
+        body = (
+            b'{"device": "probe-1", "type": "ph", "value": 7.3, "ts": "2024-06-01T12:00:00Z"}\n'
+            b'{"device": "probe-1", "type": "nope", "value": 1, "ts": "2024-06-01T12:00:00Z"}\n'
+        )
+        response = await client.post("/ingest/samples", content=body)
+        assert response.status_code == 202
+        assert (response.json()["accepted"], response.json()["rejected"]) == (1, 1)
+    finally:
+        await ingest_buffer.stop()
+
+    samples = (await client.get("/ingest/samples", params={
+        "slug": "ph", "start": "2024-06-01T00:00:00Z", "end": "2024-06-02T00:00:00Z"
+    })).json()
+    assert [(s["device"], s["value"]) for s in samples] == [("probe-1", 7.3)]
+
+
+async def test_jobs(client):
+    await create_task(client)
+    response = await client.post("/jobs/", json={"kind": "export"})
+    assert response.status_code == 202, response.text
+    job = response.json()
+    assert (await client.post("/jobs/", json={"kind": "nope"})).status_code == 400
+
+    runner = JobRunner(1, 0.05)
+    runner.start()
+    try:
+        for _ in range(100):
+            job = (await client.get(f"/jobs/{job['id']}")).json()
+            if job["status"] in ("succeeded", "failed"):
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await runner.stop()
+
+    assert job["status"] == "succeeded", job["error"]
+    assert len(job["result"]["tasks"]) == 1
+    assert [j["id"] for j in (await client.get("/jobs/")).json()] == [job["id"]]
@@ -0,0 +1,54 @@
+"""Delta sync and its tombstones"""
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models import SyncTombstone, User
+
+
+async def test_pool_delete_tombstones_history_for_its_owner(client):
+    spa = (await client.post("/pools/", json={"name": "Spa"})).json()
+    task = (await client.post("/tasks/", params={"pool_id": spa["id"]}, json={"name": "Drain", "frequency_days": 90})).json()
+    for notes in ("First", "Second"):
+        await client.post(f"/tasks/{task['id']}/complete", params={"pool_id": spa["id"]}, json={"notes": notes})
+    history = (await client.get(f"/tasks/{task['id']}/history", params={"pool_id": spa["id"]})).json()["items"]
+    token = (await client.get("/sync/")).json()["token"]
+
+    assert (await client.delete(f"/pools/{spa['id']}")).status_code == 204
+
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(select(User.id))
+        tombstones = (await db.execute(
+            select(SyncTombstone.row_id, SyncTombstone.user_id)
+            .where(SyncTombstone.table_name == "task_completion_history")
+        )).all()
+    assert sorted(str(row_id) for row_id, _ in tombstones) == sorted(h["id"] for h in history)
+    assert {owner for _, owner in tombstones} == {user_id}
+
+    deleted = (await client.get("/sync/", params={"since": token})).json()["deleted"]
+    assert sorted(d["id"] for d in deleted if d["entity"] == "task_history") == sorted(h["id"] for h in history)
+    assert [d["id"] for d in deleted if d["entity"] == "task"] == [task["id"]]
+
+
+async def test_delta_sync_returns_tombstones_for_deletes(client):
+    task = (await client.post("/tasks/", json={"name": "Check pump", "frequency_days": 7})).json()
+    item = (await client.post("/inventory/", json={
+        "name": "Shock", "quantity_on_hand": 4, "unit": "bag", "reorder_threshold": 1
+    })).json()
+    alert = (await client.post("/alerts/", json={
+        "name": "Morning", "cadence": "weekly", "alert_time": "08:00:00", "days_of_week": [1]
+    })).json()
+    reading = (await client.post("/readings/", json={
+        "reading_value": 7.4, "reading_date": "2024-06-01", "reading_type_slug": "ph"
+    })).json()
+    token = (await client.get("/sync/")).json()["token"]
+
+    for path in (f"/tasks/{task['id']}", f"/inventory/{item['id']}", f"/alerts/{alert['id']}", f"/readings/{reading['id']}"):
+        assert (await client.delete(path)).status_code == 204
+
+    delta = (await client.get("/sync/", params={"since": token})).json()
+    assert delta["full"] is False
+    assert sorted((d["entity"], d["id"]) for d in delta["deleted"]) == sorted([
+        ("alert", alert["id"]), ("inventory", item["id"]), ("reading", reading["id"]), ("task", task["id"]),
+    ])
+    for field in ("tasks", "inventory", "alerts", "readings"):
+        assert delta.get(field, []) == []